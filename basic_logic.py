@@ -17,6 +17,12 @@ if __name__ == "__main__":
     simplified_text = text.replace("very long and complex for no reason", "complicated")
     print(f"Simplified text: {simplified_text}")
 
+    # Example: Local readability scoring (Flesch-Kincaid etc.) now lives in text_metrics.py
+    from moengage_doc_analysis.text_metrics import compute_text_metrics
+    for label, sample in (("Original", text), ("Simplified", simplified_text)):
+        metrics = compute_text_metrics(sample)
+        print(f"{label}: Flesch reading ease {metrics['flesch_reading_ease']}, grade {metrics['flesch_kincaid_grade']}")
+
     # Example: Basic LLM interaction test (ensure LLM_API_KEY is loaded in .env)
     # To run this part, uncomment the following lines and ensure you have 'openai' installed
     # load_dotenv()
@@ -0,0 +1,81 @@
+# moengage-doc-analysis/benchmarks/bench_extraction.py
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moengage_doc_analysis.extraction import EXTRACTION_BACKENDS, extract_main_text
+from corpus import DEFAULT_CORPUS_DIR, load_corpus
+
+# Markup the two parsers represent differently, checked for identical output alongside the corpus
+EDGE_CASE_PAGES = [
+    ("cdata-inline", "<html><body><article><p>A<![CDATA[x]]>B</p></article></body></html>"),
+    ("cdata-block", "<html><body><article><p>A</p><![CDATA[x y]]><p>B</p></article></body></html>"),
+    ("cdata-pre", "<html><body><article><pre>one<![CDATA[\ntwo]]>\nthree</pre></article></body></html>"),
+    ("comments-and-pi", "<html><body><article><p>A <!-- hidden --> B<?php echo 1 ?></p><![CDATA[]]>"
+                        "</article></body></html>"),
+]
+
+def check_equivalence(pages, reference: str, candidate: str) -> list:
+    """
+    Returns the names of pages where `candidate` does not produce byte-identical text to `reference`.
+    """
+    mismatches = []
+    for name, html in pages:
+        with contextlib.redirect_stdout(io.StringIO()): # Silence per-page fallback warnings
+            expected = extract_main_text(html, name, reference)
+            actual = extract_main_text(html, name, candidate)
+        if expected.encode("utf-8") != actual.encode("utf-8"):
+            mismatches.append(name)
+    return mismatches
+
+def time_backend(pages, backend: str, repeat: int) -> float:
+    """
+    Returns the best-of-`repeat` wall time in seconds to extract every page once.
+    """
+    best = float("inf")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for name, html in pages:
+                extract_main_text(html, name, backend)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare extraction backends for speed and identical output.")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR,
+                        help="Directory of saved .html pages (synthetic pages are used if empty)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--reference", default="bs4")
+    parser.add_argument("--backends", nargs="+", default=list(EXTRACTION_BACKENDS))
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus_dir)
+    total_kib = sum(len(html.encode("utf-8")) for _, html in pages) / 1024
+    print(f"Corpus: {len(pages)} pages, {total_kib:.0f} KiB")
+
+    reference_seconds = None
+    failed = False
+    for backend in args.backends:
+        try:
+            extract_main_text(pages[0][1], pages[0][0], backend)
+        except ImportError as e:
+            print(f"{backend:>6}: skipped ({e})")
+            continue
+        if backend != args.reference:
+            mismatches = check_equivalence(pages + EDGE_CASE_PAGES, args.reference, backend)
+            if mismatches:
+                failed = True
+                print(f"{backend}: output differs from {args.reference} on {len(mismatches)} pages: {', '.join(mismatches[:5])}")
+        seconds = time_backend(pages, backend, args.repeat)
+        if backend == args.reference:
+            reference_seconds = seconds
+        speedup = f", {reference_seconds / seconds:.1f}x vs {args.reference}" if reference_seconds else ""
+        print(f"{backend:>6}: {seconds * 1000:8.1f} ms total, {len(pages) / seconds:8.1f} pages/s{speedup}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,47 @@
+# moengage-doc-analysis/benchmarks/bench_pipeline.py
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moengage_doc_analysis.scraper import fetch_articles, fetch_articles_pipelined
+from corpus import DEFAULT_CORPUS_DIR, load_corpus
+from page_server import PageServer
+
+def run_once(fetch, urls) -> tuple:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = list(fetch(urls))
+    return time.perf_counter() - start, sum(1 for record in records if record["content"])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure scrape throughput as parse workers are added.")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--pages", type=int, default=400, help="Pages to fetch (the corpus is repeated as needed)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub server latency per request in seconds")
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    parser.add_argument("--backend", default="bs4")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir)
+    pages = [(f"{i}-{corpus[i % len(corpus)][0]}", corpus[i % len(corpus)][1]) for i in range(args.pages)]
+    print(f"{len(pages)} pages, {args.latency * 1000:.0f} ms stub latency, backend={args.backend}, "
+          f"{os.cpu_count()} CPUs")
+
+    with PageServer(pages, latency_seconds=args.latency) as server:
+        # Per-host limit is lifted: the stub is a single host standing in for a whole crawl
+        common = dict(max_concurrency=args.max_concurrency, per_host_limit=args.max_concurrency, backend=args.backend)
+        seconds, ok = run_once(lambda urls: fetch_articles(urls, **common), server.urls)
+        print(f"  threads only         : {ok / seconds:8.1f} articles/s")
+        workers = 1
+        while workers <= args.max_workers:
+            seconds, ok = run_once(lambda urls: fetch_articles_pipelined(urls, parse_workers=workers, **common),
+                                   server.urls)
+            print(f"  {workers:2d} parse process(es) : {ok / seconds:8.1f} articles/s")
+            workers *= 2
@@ -0,0 +1,192 @@
+# moengage-doc-analysis/benchmarks/bench_suite.py
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import DEFAULT_CORPUS_DIR, load_corpus
+from fake_llm import FakeLLMServer
+from page_server import PageServer
+
+SCENARIOS = ("fetch", "parse", "analyze", "e2e")
+DEFAULT_BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+# Metrics compared against a baseline, and whether higher is better
+COMPARED_METRICS = {"articles_per_second": True, "p50_ms": False, "p95_ms": False,
+                    "cpu_seconds": False, "peak_rss_mib": False}
+
+def build_pages(corpus_dir: str, count: int) -> list:
+    """
+    `count` (name, html) pages, repeating the corpus as needed. Deterministic, so the parent
+    process (serving them) and the scenario process (parsing them) agree on the list.
+    """
+    corpus = load_corpus(corpus_dir)
+    return [(f"{i}-{corpus[i % len(corpus)][0]}", corpus[i % len(corpus)][1]) for i in range(count)]
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024 # Bytes on macOS, KiB on Linux
+
+def run_scenario(name: str, args) -> dict:
+    """
+    Runs one scenario in this process and returns its measurements. Setup that is not part
+    of the measured work (building the corpus, pre-extracting text) happens before the clocks start.
+    """
+    from moengage_doc_analysis.scraper import create_session, fetch_article_content
+    from moengage_doc_analysis.extraction import extract_main_text
+
+    pages = build_pages(args.corpus_dir, args.pages)
+    urls = [f"{args.page_base_url}/hc/en-us/articles/{page_name}" for page_name, _ in pages]
+    if name in ("analyze", "e2e"):
+        from moengage_doc_analysis import analysis
+        from openai import OpenAI
+        llm_client = OpenAI(api_key="benchmark", base_url=args.llm_base_url, max_retries=0)
+
+    def analyze(content):
+        report = analysis.analyze_content_with_llm(content, llm_client, analysis.LLM_MODEL, max_retries=args.max_retries)
+        return not analysis.is_fallback_report(report)
+
+    if name == "fetch":
+        session = create_session(args.max_concurrency, args.max_concurrency)
+        task, items, workers = (lambda url: bool(fetch_article_content(url, session, backend=args.backend))), \
+            urls, args.max_concurrency
+    elif name == "parse":
+        task, items, workers = (lambda page: bool(extract_main_text(page[1], page[0], args.backend))), pages, 1
+    elif name == "analyze":
+        with contextlib.redirect_stdout(io.StringIO()):
+            contents = [extract_main_text(html, page_name, args.backend) for page_name, html in pages]
+        task, items, workers = analyze, contents, args.max_in_flight
+    else:
+        session = create_session(args.max_concurrency, args.max_concurrency)
+        task, items, workers = (lambda url: analyze(fetch_article_content(url, session, backend=args.backend))), \
+            urls, args.max_in_flight
+
+    latencies = []
+
+    def timed(item):
+        start = time.perf_counter()
+        succeeded = task(item)
+        latencies.append(time.perf_counter() - start)
+        return succeeded
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        succeeded = sum(executor.map(timed, items))
+    seconds = time.perf_counter() - start
+    return {
+        "scenario": name,
+        "articles": len(items),
+        "succeeded": succeeded,
+        "seconds": round(seconds, 3),
+        "articles_per_second": round(len(items) / seconds, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "cpu_seconds": round(time.process_time() - cpu_start, 3),
+        "peak_rss_mib": round(peak_rss_mib(), 1),
+    }
+
+def run_in_subprocess(name: str, args, page_base_url: str, llm_base_url: str) -> dict:
+    # A fresh process per scenario keeps peak RSS and CPU time from leaking between scenarios,
+    # and the stub servers run here in the parent so their work is not counted
+    command = [sys.executable, os.path.abspath(__file__), "--child", name, "--page-base-url", page_base_url,
+               "--llm-base-url", llm_base_url, "--corpus-dir", args.corpus_dir, "--pages", str(args.pages),
+               "--max-concurrency", str(args.max_concurrency), "--max-in-flight", str(args.max_in_flight),
+               "--max-retries", str(args.max_retries), "--backend", args.backend]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare(results: list, baseline: dict):
+    baseline_results = {result["scenario"]: result for result in baseline["results"]}
+    print(f"\nCompared with baseline '{baseline['name']}' ({baseline['created']}):")
+    for result in results:
+        previous = baseline_results.get(result["scenario"])
+        if previous is None:
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if not previous.get(metric):
+                continue
+            change = (result[metric] - previous[metric]) / previous[metric]
+            better = (change > 0) == higher_is_better
+            changes.append(f"{metric} {change:+.1%}{'' if abs(change) < 0.05 else (' better' if better else ' WORSE')}")
+        print(f"  {result['scenario']:>8}: {', '.join(changes)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark fetch, parse, analyze and end-to-end throughput "
+                                                 "against a local page server and a fake LLM endpoint.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--pages", type=int, default=200, help="Articles per scenario (the corpus is repeated as needed)")
+    parser.add_argument("--page-latency", type=float, default=0.05, help="Page server latency per request in seconds")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM latency per request in seconds")
+    parser.add_argument("--llm-latency-per-1k-tokens", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Share of fake LLM requests failing with a 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="Share of fake LLM answers with a JSON defect (repaired or re-asked)")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Concurrent page downloads")
+    parser.add_argument("--max-in-flight", type=int, default=8, help="Concurrent LLM requests")
+    parser.add_argument("--max-retries", type=int, default=5)
+    parser.add_argument("--backend", default="bs4")
+    parser.add_argument("--baseline-dir", default=DEFAULT_BASELINE_DIR)
+    parser.add_argument("--save-baseline", metavar="NAME", help="Save the results as a named baseline")
+    parser.add_argument("--compare", metavar="NAME", help="Compare the results with a saved baseline")
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--page-base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--llm-base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(args.child, args)))
+        sys.exit(0)
+
+    pages = build_pages(args.corpus_dir, args.pages)
+    print(f"{len(pages)} articles, page latency {args.page_latency * 1000:.0f} ms, LLM latency "
+          f"{args.llm_latency * 1000:.0f} ms, LLM error rate {args.error_rate:.0%}, {os.cpu_count()} CPUs")
+    results = []
+    with PageServer(pages, latency_seconds=args.page_latency) as page_server, \
+            FakeLLMServer(args.llm_latency, args.error_rate, args.llm_latency_per_1k_tokens,
+                              malformed_rate=args.malformed_rate) as llm_server:
+        for name in args.scenarios:
+            llm_before = dict(llm_server.stats)
+            result = run_in_subprocess(name, args, page_server.base_url, llm_server.base_url)
+            if name in ("analyze", "e2e"):
+                result["llm"] = {key: value - llm_before[key] for key, value in llm_server.stats.items()}
+            results.append(result)
+            llm = result.get("llm")
+            llm_note = f", {llm['requests']} LLM requests ({llm['errors']} 429s, {llm['malformed']} malformed), " \
+                       f"{llm['prompt_tokens'] + llm['completion_tokens']} tokens" if llm else ""
+            print(f"  {name:>8}: {result['articles_per_second']:8.1f} articles/s, p50 {result['p50_ms']:.0f} ms, "
+                  f"p95 {result['p95_ms']:.0f} ms, CPU {result['cpu_seconds']:.2f} s, peak RSS "
+                  f"{result['peak_rss_mib']:.0f} MiB, {result['succeeded']}/{result['articles']} ok{llm_note}")
+
+    if args.compare:
+        with open(os.path.join(args.baseline_dir, f"{args.compare}.json"), 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+    if args.save_baseline:
+        os.makedirs(args.baseline_dir, exist_ok=True)
+        path = os.path.join(args.baseline_dir, f"{args.save_baseline}.json")
+        baseline = {"name": args.save_baseline, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                                "cpus": os.cpu_count()},
+                    "settings": {key: value for key, value in vars(args).items()
+                                 if key not in ("child", "page_base_url", "llm_base_url", "save_baseline", "compare")},
+                    "results": results}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {path}")
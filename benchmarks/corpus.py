@@ -0,0 +1,113 @@
+# moengage-doc-analysis/benchmarks/corpus.py
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+
+import requests
+
+DEFAULT_CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+_WORDS = ("campaign segment user attribute push email flow journey analytics dashboard event "
+          "conversion goal audience personalize template creative delivery schedule trigger "
+          "engagement retention cohort report filter export integration partner SDK").split()
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 22))]
+    return " ".join(words).capitalize() + "."
+
+def synthetic_page(index: int, seed: int = 0) -> str:
+    """
+    Builds a help-center style article page: Zendesk-like chrome (head scripts, header, nav,
+    breadcrumbs, sidebar, footer) around an <article> with headings, lists, tables and inline markup.
+    """
+    rng = random.Random(seed * 100003 + index)
+    sections = []
+    for section in range(rng.randint(3, 8)):
+        paragraphs = "".join(
+            f"<p>{_sentence(rng)} <strong>{rng.choice(_WORDS)}</strong> {_sentence(rng)}&nbsp;"
+            f"<a href=\"/hc/en-us/articles/{rng.randint(1, 10**9)}\">{rng.choice(_WORDS)}</a></p>\n"
+            for _ in range(rng.randint(1, 4))
+        )
+        items = "".join(f"<li>{_sentence(rng)}</li>" for _ in range(rng.randint(2, 6)))
+        sections.append(
+            f"<h2 id=\"h_{section}\">{_sentence(rng)[:-1]}</h2>\n{paragraphs}"
+            f"<ul>{items}</ul>\n<!-- section {section} -->\n"
+            f"<table><tr><th>Field</th><th>Description</th></tr>"
+            f"<tr><td>{rng.choice(_WORDS)}</td><td>{_sentence(rng)}</td></tr></table>\n"
+        )
+    return f"""<!DOCTYPE html>
+<html lang="en-US">
+<head>
+  <meta charset="utf-8">
+  <title>Article {index}</title>
+  <script>window.HelpCenter = {{"account": {{"id": {index}}}}};</script>
+  <style>.article-body p {{ margin: 0 0 1em; }}</style>
+</head>
+<body class="article-page">
+  <header class="header"><nav class="user-nav"><a href="/hc/en-us">Help Center</a> <a href="/hc/en-us/requests/new">Submit a request</a></nav></header>
+  <main role="main">
+    <div class="container-divider"></div>
+    <nav class="sub-nav"><ol class="breadcrumbs"><li><a href="/hc/en-us">MoEngage</a></li><li>Analytics</li></ol></nav>
+    <article id="main-content" class="article">
+      <header class="article-header"><h1 title="Article {index}">{_sentence(rng)[:-1]}</h1></header>
+      <section class="article-info">
+        <div class="article-body">
+{"".join(sections)}
+        <pre><code>{{"user_id": "{rng.randint(1, 10**6)}"}}</code></pre>
+        </div>
+      </section>
+      <aside class="article-relatives"><h3>Related articles</h3><ul><li><a href="#">{_sentence(rng)}</a></li></ul></aside>
+      <footer><div class="article-votes">Was this article helpful?</div></footer>
+    </article>
+  </main>
+  <footer class="footer"><p>&copy; MoEngage</p><script>trackPageView();</script></footer>
+</body>
+</html>
+"""
+
+def load_corpus(corpus_dir: str = DEFAULT_CORPUS_DIR, synthetic_count: int = 50) -> list:
+    """
+    Returns (name, html) pairs for every saved .html page in `corpus_dir`. When no pages have
+    been saved yet, `synthetic_count` generated pages are returned instead.
+    """
+    pages = []
+    if os.path.isdir(corpus_dir):
+        for name in sorted(os.listdir(corpus_dir)):
+            if name.endswith(".html"):
+                with open(os.path.join(corpus_dir, name), 'r', encoding='utf-8') as f:
+                    pages.append((name, f.read()))
+    if not pages:
+        pages = [(f"synthetic-{i}.html", synthetic_page(i)) for i in range(synthetic_count)]
+    return pages
+
+def save_pages(urls, corpus_dir: str = DEFAULT_CORPUS_DIR) -> int:
+    """
+    Downloads live pages into the corpus so benchmarks and equivalence checks run on real markup.
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    saved = 0
+    with requests.Session() as session:
+        for url in urls:
+            try:
+                response = session.get(url, timeout=10)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching URL {url}: {e}")
+                continue
+            name = url.rstrip("/").rsplit("/", 1)[-1][:80] or hashlib.sha256(url.encode()).hexdigest()[:16]
+            with open(os.path.join(corpus_dir, f"{name}.html"), 'w', encoding='utf-8') as f:
+                f.write(response.text)
+            saved += 1
+    return saved
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save live help-center pages into the benchmark corpus.")
+    parser.add_argument("urls", nargs="+", help="Article URLs to download")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR)
+    args = parser.parse_args()
+    count = save_pages(args.urls, args.corpus_dir)
+    print(f"Saved {count} of {len(args.urls)} pages to {args.corpus_dir}")
+    sys.exit(0 if count == len(args.urls) else 1)
@@ -0,0 +1,203 @@
+# moengage-doc-analysis/benchmarks/fake_llm.py
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from moengage_doc_analysis.chunking import count_tokens
+
+CRITERIA = ("readability_for_marketer", "structure_and_flow", "completeness_and_examples", "style_guidelines")
+# Defects injected into a share `malformed_rate` of answers, mimicking real model output
+DEFECTS = ("code_fence", "trailing_comma", "raw_newline", "missing_criterion", "truncated")
+_ONLY_CRITERIA = re.compile(r"Return only these keys[^:]*: ([a-z_, ]+)\.")
+STREAM_PIECE_CHARACTERS = 24 # Size of the content deltas in a streamed answer
+
+def fake_report(prompt_tokens: int, criteria: tuple = CRITERIA) -> dict:
+    """
+    A well-formed report for `criteria`; longer prompts get a few more suggestions, so
+    completion tokens grow with the article like a real model's answer.
+    """
+    suggestions = max(1, min(5, prompt_tokens // 800))
+    return {criterion: {"assessment": f"Fake assessment of {criterion.replace('_', ' ')}.",
+                        "suggestions": [f"Fake suggestion {i + 1} for {criterion}." for i in range(suggestions)]}
+            for criterion in criteria}
+
+def apply_defect(report: dict, defect: str) -> str:
+    """
+    The report serialized with one kind of defect.
+    """
+    if defect == "missing_criterion":
+        return json.dumps({key: value for key, value in report.items() if key != list(report)[-1]})
+    text = json.dumps(report, indent=2)
+    if defect == "code_fence":
+        return f"```json\n{text}\n```"
+    if defect == "trailing_comma":
+        return text.replace('"\n    ]', '",\n    ]')
+    if defect == "raw_newline":
+        return text.replace(". ", ".\n").replace("Fake assessment of", "Fake assessment\nof")
+    return text[:int(len(text) * 0.8)] # truncated
+
+class FakeLLMServer:
+    """
+    Local OpenAI-compatible `/v1/chat/completions` stub for benchmarks. Every request waits
+    `latency_seconds` (plus `latency_per_1k_tokens` per thousand prompt tokens), and a share
+    `error_rate` of requests fails with a 429 carrying Retry-After. A share `malformed_rate` of
+    answers carries one of DEFECTS. `stream: true` is answered with server-sent events.
+    Responses report token usage; a system message seen before counts as cached prompt tokens,
+    like a provider prefix cache. Totals are kept in `stats`. Use as a context manager; point
+    `base_url` at it.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0, error_rate: float = 0.0, latency_per_1k_tokens: float = 0.0,
+                 retry_after_seconds: float = 0.1, seed: int = 0, host: str = "127.0.0.1", port: int = 0,
+                 malformed_rate: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.latency_per_1k_tokens = latency_per_1k_tokens
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.stats = {"requests": 0, "errors": 0, "malformed": 0, "prompt_tokens": 0, "cached_tokens": 0,
+                      "completion_tokens": 0}
+        self._seen_prefixes = set()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict, headers: dict = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self, payload: dict, include_usage: bool):
+                # No Content-Length: the event stream ends when the connection closes
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for chunk in server.stream_chunks(payload, include_usage):
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                status, payload, headers = server.complete(request)
+                if status == 200 and request.get("stream"):
+                    self._send_stream(payload, bool((request.get("stream_options") or {}).get("include_usage")))
+                else:
+                    self._send_json(status, payload, headers)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self._httpd.server_address[1]}/v1"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def complete(self, request: dict) -> tuple:
+        """
+        Answers one chat completion request; returns `(status, payload, headers)`.
+        """
+        messages = request.get("messages") or []
+        model = request.get("model", "fake-model")
+        prompt_tokens = sum(count_tokens(message.get("content") or "", model) for message in messages)
+        system = next((message.get("content") or "" for message in messages if message.get("role") == "system"), "")
+        with self._lock:
+            self.stats["requests"] += 1
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.stats["errors"] += 1
+            defect = self._rng.choice(DEFECTS) if not failed and self._rng.random() < self.malformed_rate else None
+            if defect:
+                self.stats["malformed"] += 1
+        time.sleep(self.latency_seconds + self.latency_per_1k_tokens * prompt_tokens / 1000)
+        if failed:
+            return 429, {"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_error"}}, \
+                {"retry-after": str(self.retry_after_seconds)}
+
+        # A re-ask for some criteria only gets those back
+        only = _ONLY_CRITERIA.search(messages[-1].get("content") or "") if messages else None
+        criteria = tuple(name.strip() for name in only.group(1).split(",")) if only else CRITERIA
+        report = fake_report(prompt_tokens, criteria)
+        content = apply_defect(report, defect) if defect else json.dumps(report)
+        completion_tokens = count_tokens(content, model)
+        with self._lock:
+            cached_tokens = count_tokens(system, model) if system in self._seen_prefixes else 0
+            self._seen_prefixes.add(system)
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["cached_tokens"] += cached_tokens
+            self.stats["completion_tokens"] += completion_tokens
+        return 200, {
+            "id": f"chatcmpl-fake-{self.stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens,
+                      "prompt_tokens_details": {"cached_tokens": cached_tokens}},
+        }, {}
+
+    @staticmethod
+    def stream_chunks(payload: dict, include_usage: bool):
+        """
+        `chat.completion.chunk` objects delivering a completed response's content in small pieces.
+        """
+        content = payload["choices"][0]["message"]["content"]
+        base = {"id": payload["id"], "object": "chat.completion.chunk", "created": payload["created"],
+                "model": payload["model"]}
+        yield {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+        for start in range(0, len(content), STREAM_PIECE_CHARACTERS):
+            yield {**base, "choices": [{"index": 0, "delta": {"content": content[start:start + STREAM_PIECE_CHARACTERS]},
+                                        "finish_reason": None}]}
+        yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        if include_usage:
+            yield {**base, "choices": [], "usage": payload["usage"]}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible endpoint for local testing.")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per request")
+    parser.add_argument("--latency-per-1k-tokens", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of answers with a JSON defect")
+    args = parser.parse_args()
+
+    with FakeLLMServer(args.latency, args.error_rate, args.latency_per_1k_tokens, port=args.port,
+                       malformed_rate=args.malformed_rate) as server:
+        print(f"Fake LLM listening on {server.base_url} (set LLM_BASE_URL to this)")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            print(json.dumps(server.stats))
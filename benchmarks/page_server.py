@@ -0,0 +1,131 @@
+# moengage-doc-analysis/benchmarks/page_server.py
+
+import gzip
+import hashlib
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CONTENT_TYPES = {".xml": "application/xml", ".gz": "application/gzip"}
+
+class PageServer:
+    """
+    Local HTTP stub serving a corpus of saved pages at /hc/en-us/articles/<name>, with an
+    optional fixed latency per request to mimic a remote help center. Responses carry an
+    ETag so conditional re-fetches get a 304. Use as a context manager; `urls` lists every page.
+    `serve_help_center` adds sitemaps and category/section listing pages for crawler tests, and
+    paths in `failing_paths` are answered with a 503. `request_spans` holds the (start, end)
+    monotonic times of every request, for checking how many were served at once.
+    """
+
+    def __init__(self, pages, latency_seconds: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.pages = {f"/hc/en-us/articles/{name}": html.encode("utf-8") for name, html in pages}
+        self.latency_seconds = latency_seconds
+        self.requests_served = 0
+        self.requested_paths = []
+        self.failing_paths = set()
+        self.request_spans = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, like a real help center
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                started = time.monotonic()
+                try:
+                    self._respond()
+                finally:
+                    with server._lock:
+                        server.request_spans.append((started, time.monotonic()))
+
+            def _respond(self):
+                path = self.path.split("?", 1)[0]
+                if path not in server.pages:
+                    # Like Zendesk, an article is also served under any slug after its id
+                    path = re.sub(r"(/articles/\d+)-[^/]*$", r"\1", path)
+                with server._lock:
+                    server.requests_served += 1
+                    server.requested_paths.append(path)
+                if server.latency_seconds:
+                    time.sleep(server.latency_seconds)
+                body = server.pages.get(path)
+                if body is None or path in server.failing_paths:
+                    self.send_response(404 if body is None else 503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", next((content_type for suffix, content_type in CONTENT_TYPES.items()
+                                                       if path.endswith(suffix)), "text/html; charset=utf-8"))
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://{host}:{self._httpd.server_address[1]}"
+        self.urls = [self.base_url + path for path in self.pages]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def serve_help_center(self, lastmods: dict = None, articles_per_section: int = 3) -> str:
+        """
+        Lays out the served articles (whose names must start with a numeric id) as a Zendesk-style
+        help center: a home page linking one category, section pages linking the articles (with
+        slugs, tracking parameters and fragments, as real listings have), and a sitemap index at
+        /sitemap.xml pointing to a plain and a gzipped sitemap. `lastmods` maps an article path to
+        its lastmod date. Call again after changing articles or lastmods. Returns the home page URL.
+        """
+        lastmods = lastmods or {}
+        articles = sorted(path for path in self.pages if "/articles/" in path)
+        sections = [articles[start:start + articles_per_section]
+                    for start in range(0, len(articles), articles_per_section)]
+
+        def html(title: str, links: list) -> bytes:
+            items = "".join(f'<li><a href="{href}">{text}</a></li>' for href, text in links)
+            return f"<html><head><title>{title}</title></head><body><h1>{title}</h1><ul>{items}</ul></body></html>" \
+                .encode("utf-8")
+
+        def urlset(paths: list) -> bytes:
+            entries = "".join(f"<url><loc>{self.base_url}{path}</loc>"
+                              + (f"<lastmod>{lastmods[path]}</lastmod>" if path in lastmods else "") + "</url>"
+                              for path in paths)
+            return (f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    f"{entries}</urlset>").encode("utf-8")
+
+        self.pages["/hc/en-us"] = html("Help Center", [("/hc/en-us/categories/1", "Guides")])
+        self.pages["/hc/en-us/categories/1"] = html(
+            "Guides", [(f"/hc/en-us/sections/{number}", f"Section {number}") for number in range(1, len(sections) + 1)])
+        for number, paths in enumerate(sections, start=1):
+            self.pages[f"/hc/en-us/sections/{number}"] = html(
+                f"Section {number}",
+                [("/hc/en-us/categories/1", "Back to Guides")]
+                + [(f"{path}-Some-Title?utm_source=listing#top", path.rsplit("/", 1)[1]) for path in paths])
+        half = len(articles) // 2
+        self.pages["/sitemap-1.xml"] = urlset(articles[:half])
+        self.pages["/sitemap-2.xml.gz"] = gzip.compress(urlset(articles[half:]))
+        self.pages["/sitemap.xml"] = (
+            '<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<sitemap><loc>{self.base_url}/sitemap-1.xml</loc></sitemap>"
+            f"<sitemap><loc>{self.base_url}/sitemap-2.xml.gz</loc></sitemap></sitemapindex>").encode("utf-8")
+        return f"{self.base_url}/hc/en-us"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,21 @@
+# moengage-doc-analysis/crawler.py
+
+# Kept so `python crawler.py ...` and `from crawler import ...` still work; the code lives in
+# moengage_doc_analysis/crawler.py
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv() # The package modules read their configuration from the environment when imported
+
+from moengage_doc_analysis import cli
+from moengage_doc_analysis.crawler import (DEFAULT_FRONTIER_PATH, DEFAULT_DELAY_SECONDS, DEFAULT_MAX_CONCURRENCY,
+                                           DEFAULT_MAX_ATTEMPTS, normalize_url, Frontier, PolitenessScheduler,
+                                           discover_from_sitemap, discover_from_listings, crawl)
+
+__all__ = ["DEFAULT_FRONTIER_PATH", "DEFAULT_DELAY_SECONDS", "DEFAULT_MAX_CONCURRENCY", "DEFAULT_MAX_ATTEMPTS",
+           "normalize_url", "Frontier", "PolitenessScheduler", "discover_from_sitemap", "discover_from_listings",
+           "crawl"]
+
+if __name__ == "__main__":
+    cli.main(["crawl", *sys.argv[1:]])
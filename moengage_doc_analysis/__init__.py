@@ -0,0 +1,9 @@
+# moengage-doc-analysis/moengage_doc_analysis/__init__.py
+
+"""
+Scrapes MoEngage help-center articles and analyzes them with an LLM.
+
+Importing the package has no side effects: submodules are imported on demand, heavy
+dependencies (OpenAI SDK, BeautifulSoup, lxml, tiktoken) only when first used, and the LLM
+client is created by `analysis.get_llm_client()` on first use. Run `python -m moengage_doc_analysis`.
+"""
@@ -0,0 +1,5 @@
+# moengage-doc-analysis/moengage_doc_analysis/__main__.py
+
+from .cli import main
+
+main()
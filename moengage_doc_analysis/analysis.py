@@ -0,0 +1,890 @@
+# moengage-doc-analysis/moengage_doc_analysis/analysis.py
+
+from __future__ import annotations # Annotations name OpenAI without importing the SDK
+
+import argparse
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING
+
+from .llm_cache import LLMResultCache, DEFAULT_CACHE_PATH, content_hash
+from .jsonl_stream import iter_jsonl, JsonlWriter
+from .run_journal import RunJournal, DEFAULT_JOURNAL_FILE
+from .rate_limiter import RateLimiter, call_with_retries, DEFAULT_MAX_RETRIES
+from .chunking import count_tokens, chunk_text, merge_reports, split_into_sections, group_sections
+from .text_metrics import compute_text_metrics, failed_thresholds, iter_with_metrics, load_thresholds, CorpusMetrics
+from .near_duplicates import NearDuplicateIndex, DEFAULT_INDEX_PATH, DEFAULT_THRESHOLD
+from .section_store import SectionStore, DEFAULT_STORE_PATH
+from .report_store import ReportStore, DEFAULT_REPORT_STORE_PATH
+from .instrumentation import metrics, profile_call
+from .prompts import build_messages, TokenUsage, LATEST_PROMPT_VERSION
+from .routing import TierStats, validate_report, suggestion_count, direct_route_reason, load_prices, \
+    DEFAULT_ROUTING_THRESHOLDS, CRITERIA
+from .structured_output import ReportParser, parse_report_text
+from .batch_client import (OpenAIBatchClient, InlineBatchClient, write_batch_file, wait_for_batch, result_contents,
+                          save_batch_state, load_batch_state, clear_batch_state, DEFAULT_BATCH_FILE,
+                          DEFAULT_POLL_INTERVAL_SECONDS)
+
+if TYPE_CHECKING:
+    from openai import OpenAI # Annotations only; the SDK is imported when the client is first created
+
+# --- Configuration ---
+# Read from the environment at import time; the command-line entry point loads .env before importing this module
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o") # Default to a capable model, adjust if using others
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7")) # Adjust for creativity vs. consistency
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") # Optional: any OpenAI-compatible endpoint, e.g. a local fake server
+
+# Concurrency and rate-limit budgets for the analysis loop (0 disables a budget)
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "1"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", str(DEFAULT_MAX_RETRIES)))
+
+# Answers are streamed and parsed criterion by criterion; criteria missing or invalid in the
+# answer are re-requested on their own up to LLM_REASK_ATTEMPTS times
+LLM_STREAM = os.getenv("LLM_STREAM", "1") != "0"
+LLM_REASK_ATTEMPTS = int(os.getenv("LLM_REASK_ATTEMPTS", "1"))
+
+# Articles longer than this many tokens are split into chunks that are analyzed in parallel
+LLM_MAX_CONTENT_TOKENS = int(os.getenv("LLM_MAX_CONTENT_TOKENS", "6000"))
+LLM_CHUNK_CONCURRENCY = int(os.getenv("LLM_CHUNK_CONCURRENCY", "4"))
+# Target size of the section groups analyzed separately in --incremental mode
+LLM_SECTION_GROUP_TOKENS = int(os.getenv("LLM_SECTION_GROUP_TOKENS", "1500"))
+
+# Cheaper model used for articles whose local metrics already look good (--prefilter cheap),
+# and as the first tier of --routing
+LLM_CHEAP_MODEL = os.getenv("LLM_CHEAP_MODEL", "gpt-4o-mini")
+LLM_PRICES_FILE = os.getenv("LLM_PRICES_FILE") # Optional JSON overriding routing.DEFAULT_PRICES
+
+# Both stages exchange newline-delimited JSON so records stream through with constant memory
+DEFAULT_INPUT_FILE = "extracted_articles.jsonl"
+DEFAULT_REPORTS_FILE = "moengage_documentation_analysis_reports_output.jsonl"
+
+# Prompt template version (see prompts.py); cached reports from other versions are not reused
+PROMPT_VERSION = os.getenv("LLM_PROMPT_VERSION", LATEST_PROMPT_VERSION)
+
+# --- LLM client, created on first use ---
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+def get_llm_client() -> OpenAI:
+    """
+    Returns the shared LLM client, creating it on first use, so importing this module needs
+    neither an API key nor the OpenAI SDK. Raises ValueError if LLM_API_KEY is not set.
+    """
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            api_key = os.getenv("LLM_API_KEY")
+            if not api_key:
+                raise ValueError("LLM_API_KEY environment variable not set. Please create a .env file.")
+            # Adjust client initialization based on your chosen LLM provider
+            from openai import OpenAI # Or from google.generativeai import configure, GenerativeModel etc.
+            _llm_client = OpenAI(api_key=api_key, base_url=LLM_BASE_URL)
+            print(f"LLM Client initialized with model: {LLM_MODEL}")
+        return _llm_client
+
+# Provider-reported token usage of this run, including prompt tokens served from the prefix cache
+token_usage = TokenUsage()
+
+
+# --- Helper Function: Fallback report used when analysis is not possible ---
+FALLBACK_MESSAGES = ("LLM client not initialized.", "JSON decode error.", "Error during analysis.")
+
+def fallback_report(message: str) -> dict:
+    """
+    Builds a report with the same four criteria as a real analysis, each carrying `message`.
+    Fallback reports describe a failure and must never be cached.
+    """
+    return {
+        "readability_for_marketer": {"assessment": message, "suggestions": []},
+        "structure_and_flow": {"assessment": message, "suggestions": []},
+        "completeness_and_examples": {"assessment": message, "suggestions": []},
+        "style_guidelines": {"assessment": message, "suggestions": []}
+    }
+
+def is_fallback_report(report: dict) -> bool:
+    """
+    True if `report` is an error placeholder from `fallback_report` rather than a real analysis.
+    """
+    return any(isinstance(value, dict) and value.get("assessment") in FALLBACK_MESSAGES and not value.get("suggestions")
+               for value in report.values())
+
+
+# --- Helper Function: Rough token estimate for rate limiting ---
+ANSWER_TOKENS = 600 # Typical size of the JSON answer
+
+@functools.lru_cache(maxsize=None)
+def prompt_overhead_tokens(llm_model_name: str) -> int:
+    """
+    Tokens of the instructions and output schema plus the expected answer, counted once per model.
+    """
+    template = "\n".join(message["content"] for message in build_messages("", PROMPT_VERSION))
+    return count_tokens(template, llm_model_name) + ANSWER_TOKENS
+
+def estimate_tokens(content: str, llm_model_name: str = LLM_MODEL) -> int:
+    """
+    Token estimate for one analysis request, used to budget tokens-per-minute.
+    """
+    return count_tokens(content, llm_model_name) + prompt_overhead_tokens(llm_model_name)
+
+
+# --- Helper Function: Build the chat completion request for one article ---
+def build_analysis_request(content: str, llm_model_name: str, temperature: float = LLM_TEMPERATURE,
+                           only_criteria: list = None) -> dict:
+    """
+    Keyword arguments for `chat.completions.create` analyzing `content` with the PROMPT_VERSION
+    template, optionally for `only_criteria`. The same body is used for synchronous calls and
+    for the lines of a batch file.
+    """
+    return {
+        "model": llm_model_name,
+        "messages": build_messages(content, PROMPT_VERSION, only_criteria),
+        "response_format": {"type": "json_object"}, # Crucial for getting JSON output
+        "temperature": temperature
+    }
+
+# --- Helper Function: Send one request and parse the answer criterion by criterion ---
+def request_criteria(request: dict, llm_client: OpenAI, parser: ReportParser, limiter: RateLimiter = None,
+                     max_retries: int = 0, estimated_tokens: int = 0, usage: TokenUsage = None):
+    """
+    Sends `request` and feeds the answer into `parser`. With LLM_STREAM the answer is streamed,
+    so each criterion is parsed and validated as soon as it is complete, and a connection lost
+    mid-answer keeps the criteria already received. Errors before the answer starts are raised.
+    """
+    def record_usage(response_usage):
+        token_usage.record(response_usage)
+        if usage is not None:
+            usage.record(response_usage)
+        if limiter and response_usage is not None:
+            limiter.settle(estimated_tokens, response_usage.total_tokens)
+
+    if not LLM_STREAM:
+        with metrics.timer("llm_wait"):
+            response = call_with_retries(lambda: llm_client.chat.completions.create(**request),
+                                         max_retries=max_retries, limiter=limiter, estimated_tokens=estimated_tokens)
+        record_usage(response.usage)
+        with metrics.timer("json_decode"):
+            parser.feed(response.choices[0].message.content or "")
+        return
+    with metrics.timer("llm_wait"): # Includes parsing, which overlaps with the streamed answer
+        stream = call_with_retries(
+            lambda: llm_client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True}),
+            max_retries=max_retries, limiter=limiter, estimated_tokens=estimated_tokens)
+        try:
+            for chunk in stream:
+                if chunk.usage:
+                    record_usage(chunk.usage) # Sent in a final chunk without choices
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parser.feed(chunk.choices[0].delta.content)
+        except Exception as e:
+            metrics.add("llm_stream_errors")
+            print(f"LLM stream interrupted ({e.__class__.__name__}: {e}); keeping {len(parser.criteria)} "
+                  f"complete criteria.")
+
+# --- Helper Function: Analyze Content with LLM ---
+def analyze_content_with_llm(content: str, llm_client: OpenAI, llm_model_name: str,
+                             cache: LLMResultCache = None, temperature: float = LLM_TEMPERATURE,
+                             limiter: RateLimiter = None, max_retries: int = 0,
+                             max_content_tokens: int = LLM_MAX_CONTENT_TOKENS, usage: TokenUsage = None) -> dict:
+    """
+    Analyzes the content using an LLM based on provided criteria.
+    The LLM prompt is carefully crafted to elicit structured, actionable suggestions.
+    With a `cache`, byte-identical (after whitespace normalization) content analyzed with the
+    same model, prompt version and temperature is answered from the cache without an API call.
+    A `limiter` throttles the call to the configured budgets, and 429/5xx errors are retried
+    with backoff up to `max_retries` times. Content over `max_content_tokens` is analyzed
+    in chunks (see `analyze_long_content_with_llm`). Token usage is added to `token_usage` and,
+    if given, to `usage` as well.
+    The answer is parsed criterion by criterion (see structured_output.py): common JSON defects are
+    repaired, and criteria still missing or invalid are re-requested on their own instead of
+    discarding the whole answer. Only complete reports are cached.
+    """
+    if cache:
+        cached_report = cache.get(content, llm_model_name, PROMPT_VERSION, temperature)
+        if cached_report is not None:
+            metrics.add("llm_cache_hits")
+            return cached_report
+        metrics.add("llm_cache_misses")
+
+    if not llm_client:
+        return fallback_report("LLM client not initialized.")
+
+    if count_tokens(content, llm_model_name) > max_content_tokens:
+        return analyze_long_content_with_llm(content, llm_client, llm_model_name, cache=cache, temperature=temperature,
+                                             limiter=limiter, max_retries=max_retries,
+                                             max_content_tokens=max_content_tokens, usage=usage)
+
+    report = {}
+    try:
+        # Adjust the API call based on your chosen LLM (OpenAI, Gemini, Anthropic, etc.)
+        # This example uses OpenAI's chat completions API
+        missing = list(CRITERIA)
+        for attempt in range(LLM_REASK_ATTEMPTS + 1):
+            with metrics.timer("prompt_build"):
+                request = build_analysis_request(content, llm_model_name, temperature,
+                                                 only_criteria=missing if attempt else None)
+            if attempt:
+                metrics.add("llm_reasks")
+                print(f"Re-requesting {len(missing)} missing criteria ({', '.join(missing)}).")
+            parser = ReportParser()
+            request_criteria(request, llm_client, parser, limiter=limiter, max_retries=max_retries,
+                             estimated_tokens=estimate_tokens(content, llm_model_name), usage=usage)
+            metrics.add("llm_repaired_members", parser.repaired)
+            report.update((criterion, value) for criterion, value in parser.criteria.items() if criterion in missing)
+            missing = [criterion for criterion in CRITERIA if criterion not in report]
+            if not missing:
+                break
+            print(f"LLM answer is missing or has invalid criteria {missing}: {'; '.join(parser.problems) or 'not sent'}")
+            print(f"LLM Raw Output: {parser.text[:2000]}")
+    except Exception as e:
+        print(f"Error during LLM analysis: {e}")
+        if not report:
+            return fallback_report("Error during analysis.")
+        missing = [criterion for criterion in CRITERIA if criterion not in report]
+
+    if missing:
+        # Keep the criteria that did arrive; the placeholders mark the article as failed so it is retried
+        metrics.add("llm_partial_reports")
+        placeholders = fallback_report("JSON decode error.")
+        return {criterion: report.get(criterion) or placeholders[criterion] for criterion in CRITERIA}
+    report = {criterion: report[criterion] for criterion in CRITERIA}
+    if cache:
+        cache.put(content, llm_model_name, PROMPT_VERSION, temperature, report)
+    return report
+
+# --- Helper Function: Map-reduce analysis for long articles ---
+def analyze_long_content_with_llm(content: str, llm_client: OpenAI, llm_model_name: str,
+                                  cache: LLMResultCache = None, temperature: float = LLM_TEMPERATURE,
+                                  limiter: RateLimiter = None, max_retries: int = 0,
+                                  max_content_tokens: int = LLM_MAX_CONTENT_TOKENS, usage: TokenUsage = None) -> dict:
+    """
+    Splits content that exceeds the token budget on heading/paragraph boundaries, analyzes the
+    chunks in parallel and merges the per-criterion results into a single report. If any chunk
+    fails, the whole article gets a fallback report so it is retried later; the chunks that did
+    succeed are already cached and will not be paid for again.
+    """
+    chunks = chunk_text(content, max_content_tokens, llm_model_name)
+    print(f"Article exceeds {max_content_tokens} tokens; analyzing it in {len(chunks)} chunks.")
+    with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), LLM_CHUNK_CONCURRENCY))) as executor:
+        chunk_reports = list(executor.map(
+            lambda chunk: analyze_content_with_llm(chunk, llm_client, llm_model_name, cache=cache,
+                                                   temperature=temperature, limiter=limiter, max_retries=max_retries,
+                                                   max_content_tokens=max_content_tokens, usage=usage),
+            chunks))
+    if any(is_fallback_report(report) for report in chunk_reports):
+        return fallback_report("Error during analysis.")
+    report = merge_reports(chunk_reports)
+    if cache:
+        cache.put(content, llm_model_name, PROMPT_VERSION, temperature, report)
+    return report
+
+# --- Helper Function: Incremental section-level analysis ---
+def analyze_content_incrementally(url: str, content: str, llm_client: OpenAI, llm_model_name: str,
+                                  store: SectionStore, cache: LLMResultCache = None,
+                                  temperature: float = LLM_TEMPERATURE, limiter: RateLimiter = None,
+                                  max_retries: int = 0) -> dict:
+    """
+    Splits the article into heading-delimited sections (packed into groups of about
+    LLM_SECTION_GROUP_TOKENS), sends only groups whose hash has no stored result to the LLM,
+    and merges every group's result back into one report. When one paragraph of a long
+    article changes, only the group containing it is re-analyzed.
+    """
+    groups = group_sections(split_into_sections(content), LLM_SECTION_GROUP_TOKENS, llm_model_name)
+    group_hashes = [content_hash(group) for group in groups]
+    group_reports = [store.get_report(group_hash, llm_model_name, PROMPT_VERSION) for group_hash in group_hashes]
+    missing = [position for position, report in enumerate(group_reports) if report is None]
+
+    if missing:
+        previous = set(store.previous_hashes(url))
+        changed = sum(1 for position in missing if group_hashes[position] not in previous)
+        print(f"{url}: {len(missing)} of {len(groups)} sections need analysis ({changed} changed since the last run).")
+        with ThreadPoolExecutor(max_workers=max(1, min(len(missing), LLM_CHUNK_CONCURRENCY))) as executor:
+            fresh_reports = list(executor.map(
+                lambda position: analyze_content_with_llm(groups[position], llm_client, llm_model_name, cache=cache,
+                                                          temperature=temperature, limiter=limiter,
+                                                          max_retries=max_retries),
+                missing))
+        if any(is_fallback_report(report) for report in fresh_reports):
+            return fallback_report("Error during analysis.")
+        for position, report in zip(missing, fresh_reports):
+            store.put_report(group_hashes[position], llm_model_name, PROMPT_VERSION, report)
+            group_reports[position] = report
+
+    reused = [position for position in range(len(groups)) if position not in missing]
+    store.record_usage(len(reused), len(missing), sum(count_tokens(groups[position], llm_model_name) for position in reused))
+    store.replace_sections(url, group_hashes)
+    return merge_reports(group_reports)
+
+
+# --- Helper Function: Cheap-first tiered routing ---
+def analyze_content_tiered(content: str, llm_client: OpenAI, cheap_model_name: str, large_model_name: str,
+                           tier_stats: TierStats, text_metrics: dict = None, thresholds: dict = None,
+                           cache: LLMResultCache = None, temperature: float = LLM_TEMPERATURE,
+                           limiter: RateLimiter = None, max_retries: int = 0) -> tuple:
+    """
+    Analyzes `content` with `cheap_model_name` first and escalates to `large_model_name` when the
+    cheap answer fails (error or schema validation) or has fewer than `min_cheap_suggestions`
+    suggestions. Articles that are too long or complex for the cheap tier (see
+    routing.direct_route_reason) go straight to the large model. Latency, tokens and escalation
+    reasons are recorded in `tier_stats`. Returns `(report, model used, escalation reason or None)`.
+    """
+    thresholds = {**DEFAULT_ROUTING_THRESHOLDS, **(thresholds or {})}
+    options = dict(cache=cache, temperature=temperature, limiter=limiter, max_retries=max_retries)
+
+    def run_tier(tier: str, llm_model_name: str) -> dict:
+        start = time.perf_counter()
+        report = analyze_content_with_llm(content, llm_client, llm_model_name,
+                                          usage=tier_stats.tier_usage(tier, llm_model_name), **options)
+        tier_stats.record_call(tier, time.perf_counter() - start)
+        return report
+
+    reason = direct_route_reason(content, text_metrics or compute_text_metrics(content), cheap_model_name, thresholds)
+    if reason:
+        tier_stats.record_direct(reason)
+        return run_tier("large", large_model_name), large_model_name, reason
+
+    report = run_tier("cheap", cheap_model_name)
+    if is_fallback_report(report):
+        reason = "error"
+    elif validate_report(report):
+        reason = "schema"
+    elif suggestion_count(report) < thresholds["min_cheap_suggestions"]:
+        reason = "empty_suggestions"
+    else:
+        return report, cheap_model_name, None
+    tier_stats.record_escalation(reason)
+    return run_tier("large", large_model_name), large_model_name, reason
+
+
+# --- Helper Function: Report built from local metrics only ---
+def local_metrics_report(text_metrics: dict) -> dict:
+    """
+    Report in the usual four-criterion shape for an article that passed every local metric
+    threshold and was therefore not sent to the LLM.
+    """
+    return {
+        "readability_for_marketer": {
+            "assessment": f"Readable (Flesch reading ease {text_metrics['flesch_reading_ease']}, "
+                          f"grade {text_metrics['flesch_kincaid_grade']}); passed local readability checks.",
+            "suggestions": []
+        },
+        "structure_and_flow": {
+            "assessment": f"{text_metrics['heading_count']} headings, {text_metrics['list_item_count']} list "
+                          f"items, {text_metrics['avg_paragraph_words']} words per paragraph on average; passed local "
+                          f"structure checks.",
+            "suggestions": []
+        },
+        "completeness_and_examples": {
+            "assessment": "Not assessed: local metrics cannot judge completeness.",
+            "suggestions": []
+        },
+        "style_guidelines": {
+            "assessment": f"{text_metrics['avg_sentence_words']} words per sentence, "
+                          f"{text_metrics['passive_voice_count']} passive sentences; passed local style checks.",
+            "suggestions": []
+        }
+    }
+
+
+# --- Helper Function: Build the final report for one article ---
+def analyze_article(article_data: dict, llm_client: OpenAI, llm_model_name: str,
+                    cache: LLMResultCache = None, limiter: RateLimiter = None, max_retries: int = 0,
+                    prefilter: str = "off", thresholds: dict = None, section_store: SectionStore = None,
+                    tier_stats: TierStats = None, routing_thresholds: dict = None) -> dict:
+    """
+    Produces the final report record for one scraped article, fetching the content live
+    when the scraper did not provide it.
+    With `prefilter` set to "skip" or "cheap", articles whose local metrics pass `thresholds`
+    get a metrics-only report or are analyzed with LLM_CHEAP_MODEL instead of `llm_model_name`.
+    With a `section_store`, only changed sections are re-analyzed (see `analyze_content_incrementally`).
+    With `tier_stats`, LLM_CHEAP_MODEL answers first and `llm_model_name` is only used on escalation
+    (see `analyze_content_tiered`).
+    """
+    url = article_data["url"]
+    content = article_data.get("content")
+
+    if not content:
+        print(f"Content not available for {url}. Attempting live fetch using scraper.py...")
+        from .scraper import fetch_article_content # Deferred: only needed when the input lacks content
+        content = fetch_article_content(url) # Using the imported function from scraper.py
+        if not content:
+            print(f"Skipping analysis for {url} due to missing content.")
+            return {"url": url, "error": "Content not available for analysis."}
+
+    text_metrics = article_data.get("metrics")
+    if prefilter != "off" and text_metrics is None:
+        text_metrics = compute_text_metrics(content) # Live-fetched content was not part of a metrics batch
+    if prefilter != "off" and not failed_thresholds(text_metrics, thresholds):
+        if prefilter == "skip":
+            print(f"\n--- {url} passes local metric thresholds; skipping LLM analysis ---")
+            llm_model_name = "local-metrics"
+        else:
+            llm_model_name = LLM_CHEAP_MODEL
+
+    print(f"\n--- Starting analysis for: {url} ---")
+    escalation_reason = None
+    if llm_model_name == "local-metrics":
+        report_data = local_metrics_report(text_metrics)
+    elif tier_stats and llm_client:
+        report_data, llm_model_name, escalation_reason = analyze_content_tiered(
+            content, llm_client, LLM_CHEAP_MODEL, llm_model_name, tier_stats, text_metrics=text_metrics,
+            thresholds=routing_thresholds, cache=cache, limiter=limiter, max_retries=max_retries)
+    elif section_store and llm_client:
+        report_data = analyze_content_incrementally(url, content, llm_client, llm_model_name, section_store, cache=cache,
+                                                    limiter=limiter, max_retries=max_retries)
+    else:
+        report_data = analyze_content_with_llm(content, llm_client, llm_model_name, cache=cache,
+                                               limiter=limiter, max_retries=max_retries)
+    final_report = {"url": url, "content_hash": content_hash(content), "analyzed_with": llm_model_name}
+    if escalation_reason:
+        final_report["escalation_reason"] = escalation_reason
+    if text_metrics is not None:
+        final_report["metrics"] = text_metrics
+    final_report.update(report_data) # Merge the LLM's output directly
+    return final_report
+
+def analyze_articles_concurrently(articles, llm_client: OpenAI, llm_model_name: str,
+                                  max_in_flight: int = LLM_MAX_IN_FLIGHT, max_retries: int = LLM_MAX_RETRIES,
+                                  **article_options):
+    """
+    Analyzes articles with up to `max_in_flight` LLM requests running at once and yields
+    each final report as soon as it completes. `articles` may be any iterable; it is consumed
+    lazily so no more than `max_in_flight` articles are held in memory at a time.
+    `article_options` (cache, limiter, prefilter, thresholds, section_store, tier_stats, routing_thresholds)
+    are passed on to `analyze_article`.
+    """
+    max_in_flight = max(1, max_in_flight)
+    if llm_client and max_retries:
+        # Retries and Retry-After are handled by call_with_retries so they count against the limiter
+        llm_client = llm_client.with_options(max_retries=0)
+
+    article_iter = iter(articles)
+    running = set()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        def submit_next() -> bool:
+            article_data = next(article_iter, None)
+            if article_data is None:
+                return False
+            running.add(executor.submit(analyze_article, article_data, llm_client, llm_model_name,
+                                        max_retries=max_retries, **article_options))
+            return True
+
+        while len(running) < max_in_flight and submit_next():
+            pass
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.discard(future)
+                yield future.result()
+                submit_next()
+
+# --- Helper Function: Reuse one analysis per near-duplicate cluster ---
+def duplicate_report(article_data: dict, representative_report: dict, similarity: float) -> dict:
+    """
+    Adapts a cluster representative's report for one of its near-duplicates: the criteria are
+    reused as-is, and the record says which article they were taken from and how similar it is.
+    """
+    final_report = dict(representative_report)
+    final_report["url"] = article_data["url"]
+    final_report["content_hash"] = content_hash(article_data["content"])
+    final_report["duplicate_of"] = representative_report["url"]
+    final_report["similarity"] = round(similarity, 3)
+    final_report.pop("metrics", None) # Metrics describe the representative's text, not this one
+    if article_data.get("metrics") is not None:
+        final_report["metrics"] = article_data["metrics"]
+    return final_report
+
+def analyze_articles_deduplicated(articles, llm_client: OpenAI, llm_model_name: str,
+                                  index: NearDuplicateIndex, **analysis_options):
+    """
+    Like `analyze_articles_concurrently`, but only one representative per near-duplicate cluster
+    is analyzed. Other members reuse the representative's report: immediately if it is already
+    stored in the index, otherwise as soon as the representative finishes in this run. Members
+    whose representative fails or is not part of this run are analyzed on their own at the end.
+    """
+    waiting = defaultdict(list) # representative url -> [(article, similarity)]
+    ready = deque()
+
+    def representatives():
+        for article_data in articles:
+            url, content = article_data["url"], article_data.get("content")
+            if not content:
+                yield article_data # Nothing to compare yet; analyze_article fetches it live
+                continue
+            representative_url, similarity = index.add(url, content, content_hash(content))
+            if representative_url == url:
+                yield article_data
+                continue
+            stored_report = index.get_report(representative_url)
+            if stored_report is not None:
+                print(f"{url} is a near-duplicate of {representative_url} ({similarity:.0%}); reusing its report.")
+                ready.append(duplicate_report(article_data, stored_report, similarity))
+            else:
+                waiting[representative_url].append((article_data, similarity))
+
+    for final_report in analyze_articles_concurrently(representatives(), llm_client, llm_model_name,
+                                                      **analysis_options):
+        yield final_report
+        url = final_report["url"]
+        succeeded = "error" not in final_report and not is_fallback_report(final_report)
+        if succeeded and final_report.get("content_hash"):
+            index.store_report(url, final_report["content_hash"], final_report)
+            for article_data, similarity in waiting.pop(url, []):
+                ready.append(duplicate_report(article_data, final_report, similarity))
+        while ready:
+            yield ready.popleft()
+    while ready:
+        yield ready.popleft()
+
+    # Representatives that failed or were not in this run: analyze their members individually
+    leftovers = [article_data for members in waiting.values() for article_data, _ in members]
+    if leftovers:
+        print(f"Analyzing {len(leftovers)} near-duplicates individually (no representative report available).")
+        yield from analyze_articles_concurrently(leftovers, llm_client, llm_model_name, **analysis_options)
+
+# --- Helper Function: Bulk analysis through a batch endpoint ---
+def analyze_articles_in_batch(articles, batch_client, llm_model_name: str, batch_file: str = DEFAULT_BATCH_FILE,
+                              cache: LLMResultCache = None, temperature: float = LLM_TEMPERATURE,
+                              poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS, prefilter: str = "off",
+                              thresholds: dict = None, max_content_tokens: int = LLM_MAX_CONTENT_TOKENS):
+    """
+    Analyzes all articles in one offline batch instead of one synchronous request each.
+    Cached and prefilter-skipped articles are reported right away; every other article (or each
+    chunk of a long one) becomes one line of `batch_file`, which is submitted through
+    `batch_client` (see batch_client.py) and polled until done. The answers are then mapped back
+    to their URLs and yielded in the usual report format. Criteria missing from an answer are
+    re-requested on their own in a follow-up batch, up to LLM_REASK_ATTEMPTS times.
+    The submitted batch id is remembered next to `batch_file` with each article's URL and content
+    hash, so an interrupted run picks up the same batch instead of submitting a new one; the
+    content itself is read from `articles` again.
+    """
+    def load_content(article_data: dict) -> str:
+        content = article_data.get("content")
+        if not content:
+            from .scraper import fetch_article_content # Deferred: only needed when the input lacks content
+            content = fetch_article_content(article_data["url"])
+        return content
+
+    def request_chunks(content: str) -> list:
+        if count_tokens(content, llm_model_name) > max_content_tokens:
+            return chunk_text(content, max_content_tokens, llm_model_name)
+        return [content]
+
+    batch_articles = [] # State entries with the content and metrics of this run attached
+    state = load_batch_state(batch_file)
+    if state is not None:
+        print(f"Resuming batch {state['batch_id']} ({len(state['articles'])} articles) from a previous run.")
+        inputs = {entry["url"]: None for entry in state["articles"]}
+        for article_data in articles:
+            if article_data["url"] in inputs:
+                inputs[article_data["url"]] = article_data
+        for entry in state["articles"]:
+            article_data = inputs[entry["url"]]
+            content = load_content(article_data) if article_data else None
+            if not content or content_hash(content) != entry["content_hash"]:
+                # The answers are for text this run no longer has; the error retries it in the next run
+                print(f"Content of {entry['url']} changed since the batch was submitted; dropping its answer.")
+                yield {"url": entry["url"], "error": "Content changed since the batch was submitted."}
+                continue
+            batch_articles.append({**entry, "content": content, "metrics": article_data.get("metrics")})
+        state["articles"] = [{key: entry[key] for key in ("url", "content_hash", "custom_ids")}
+                             for entry in batch_articles]
+    else:
+        requests = []
+        for article_data in articles:
+            url = article_data["url"]
+            content = load_content(article_data)
+            if not content:
+                print(f"Skipping analysis for {url} due to missing content.")
+                yield {"url": url, "error": "Content not available for analysis."}
+                continue
+            if prefilter == "skip" and not failed_thresholds(article_data.get("metrics") or
+                                                             compute_text_metrics(content), thresholds):
+                # Nothing to send: analyze_article builds the metrics-only report without the LLM
+                yield analyze_article({**article_data, "content": content}, None, llm_model_name,
+                                      prefilter=prefilter, thresholds=thresholds)
+                continue
+            cached_report = cache.get(content, llm_model_name, PROMPT_VERSION, temperature) if cache else None
+            if cached_report is not None:
+                yield {"url": url, "content_hash": content_hash(content), "analyzed_with": llm_model_name,
+                       **({"metrics": article_data["metrics"]} if article_data.get("metrics") is not None else {}),
+                       **cached_report}
+                continue
+            chunks = request_chunks(content)
+            custom_ids = [f"{len(batch_articles)}-{position}" for position in range(len(chunks))]
+            requests.extend((custom_id, build_analysis_request(chunk, llm_model_name, temperature))
+                            for custom_id, chunk in zip(custom_ids, chunks))
+            batch_articles.append({"url": url, "content_hash": content_hash(content), "custom_ids": custom_ids,
+                                   "content": content, "metrics": article_data.get("metrics")})
+        if not batch_articles:
+            return
+        print(f"Writing {len(requests)} requests for {len(batch_articles)} articles to {batch_file}.")
+        write_batch_file(batch_file, requests)
+        state = {"batch_id": batch_client.submit(batch_file),
+                 "articles": [{key: entry[key] for key in ("url", "content_hash", "custom_ids")}
+                              for entry in batch_articles]}
+        save_batch_state(batch_file, state)
+
+    chunks = {} # custom id -> the text it asked about
+    for entry in batch_articles:
+        chunks.update(zip(entry["custom_ids"], request_chunks(entry["content"])))
+    # Criteria received so far per custom id; saved with each follow-up batch so a resume keeps them
+    received = state.setdefault("received", {})
+    while True:
+        status = wait_for_batch(batch_client, state["batch_id"], poll_interval)
+        if status == "completed":
+            for custom_id, text in result_contents(batch_client.results(state["batch_id"]), token_usage).items():
+                parser = parse_report_text(text) # Repairs common JSON defects
+                metrics.add("llm_repaired_members", parser.repaired)
+                answered = received.setdefault(custom_id, {})
+                answered.update((criterion, value) for criterion, value in parser.criteria.items()
+                                if criterion not in answered)
+        missing = {custom_id: [criterion for criterion in CRITERIA if criterion not in received.get(custom_id, {})]
+                   for custom_id in chunks}
+        missing = {custom_id: criteria for custom_id, criteria in missing.items() if criteria}
+        if not missing or status != "completed" or state.get("reasks", 0) >= LLM_REASK_ATTEMPTS:
+            break
+        # Same re-ask as analyze_content_with_llm, one follow-up batch for all incomplete answers
+        state["reasks"] = state.get("reasks", 0) + 1
+        metrics.add("llm_reasks", len(missing))
+        print(f"Re-requesting missing criteria for {len(missing)} batch requests.")
+        write_batch_file(batch_file, [
+            (custom_id, build_analysis_request(chunks[custom_id], llm_model_name, temperature,
+                                               only_criteria=criteria if custom_id in received else None))
+            for custom_id, criteria in missing.items()])
+        state["batch_id"] = batch_client.submit(batch_file)
+        save_batch_state(batch_file, state)
+
+    for entry in batch_articles:
+        chunk_reports = []
+        for custom_id in entry["custom_ids"]:
+            answered = received.get(custom_id)
+            if not answered:
+                chunk_reports.append(fallback_report("Error during analysis."))
+            elif custom_id in missing:
+                print(f"Incomplete LLM answer for {entry['url']}: missing {', '.join(missing[custom_id])}")
+                metrics.add("llm_partial_reports")
+                placeholders = fallback_report("JSON decode error.")
+                chunk_reports.append({criterion: answered.get(criterion) or placeholders[criterion]
+                                      for criterion in CRITERIA})
+            else:
+                chunk_reports.append({criterion: answered[criterion] for criterion in CRITERIA})
+        failed = [report for report in chunk_reports if is_fallback_report(report)]
+        if failed:
+            report_data = failed[0]
+        else:
+            report_data = chunk_reports[0] if len(chunk_reports) == 1 else merge_reports(chunk_reports)
+            if cache:
+                cache.put(entry["content"], llm_model_name, PROMPT_VERSION, temperature, report_data)
+        final_report = {"url": entry["url"], "content_hash": entry["content_hash"], "analyzed_with": llm_model_name}
+        if entry["metrics"] is not None:
+            final_report["metrics"] = entry["metrics"]
+        final_report.update(report_data)
+        yield final_report
+    clear_batch_state(batch_file) # Failed articles are journaled as such and go into the next batch
+
+def main(argv: list = None):
+    """
+    Command-line entry point (`python -m moengage_doc_analysis analyze`).
+    """
+    parser = argparse.ArgumentParser(description="Analyze scraped MoEngage documentation articles with an LLM.")
+    parser.add_argument("-i", "--input", default=DEFAULT_INPUT_FILE,
+                        help="Scraper output (.jsonl, legacy .json list, or '-' for stdin)")
+    parser.add_argument("-o", "--output", default=DEFAULT_REPORTS_FILE,
+                        help="Newline-delimited JSON file the reports are streamed to")
+    parser.add_argument("--follow", action="store_true",
+                        help="Tail the input file while scraper.py is still writing it")
+    parser.add_argument("--journal", default=DEFAULT_JOURNAL_FILE,
+                        help="Run journal used to resume an interrupted run")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the journal and existing reports and analyze everything again")
+    parser.add_argument("--report-store", default=os.getenv("REPORT_STORE_PATH", DEFAULT_REPORT_STORE_PATH),
+                        help="SQLite store every report is also appended to, for queries across runs "
+                             "(see `python -m moengage_doc_analysis reports`)")
+    parser.add_argument("--run-id", help="Run id the reports are stored under (default: a new one; "
+                                         "reuse it to resume a run)")
+    parser.add_argument("--prefilter", choices=("off", "skip", "cheap"), default="off",
+                        help="Compute local readability/structure metrics first; articles passing the thresholds "
+                             "skip the LLM ('skip') or use LLM_CHEAP_MODEL ('cheap')")
+    parser.add_argument("--thresholds", help="JSON file overriding text_metrics.DEFAULT_THRESHOLDS")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Analyze articles section by section and only re-send sections that changed")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Analyze one representative per near-duplicate cluster and reuse its report")
+    parser.add_argument("--dedup-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated Jaccard similarity above which articles are near-duplicates")
+    parser.add_argument("--routing", action="store_true",
+                        help="Try LLM_CHEAP_MODEL first and escalate to LLM_MODEL on invalid output, missing "
+                             "suggestions, or articles too long/complex for the cheap model")
+    parser.add_argument("--routing-thresholds", help="JSON file overriding routing.DEFAULT_ROUTING_THRESHOLDS")
+    parser.add_argument("--routing-stats", metavar="FILE",
+                        help="Write per-tier latency, tokens, cost and escalation counts as JSON at the end")
+    parser.add_argument("--batch", action="store_true",
+                        help="Bulk mode: submit all articles as one offline batch and poll for the results")
+    parser.add_argument("--batch-file", default=DEFAULT_BATCH_FILE, help="Batch request file written in --batch mode")
+    parser.add_argument("--batch-client", choices=("openai", "inline"), default="openai",
+                        help="'openai' uses the provider's Batch API; 'inline' runs the batch file through "
+                             "chat completions (endpoints without a batch API, local fakes)")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL_SECONDS,
+                        help="Seconds between batch status checks")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Write per-stage timers and counters at the end (.prom for Prometheus text, else JSON)")
+    parser.add_argument("--profile", metavar="URL",
+                        help="Profile the analysis of this one article (taken from the input, else fetched) and exit")
+    parser.add_argument("--profiler", choices=("cprofile", "pyinstrument"), default="cprofile")
+    parser.add_argument("--profile-output", help="cProfile stats file or pyinstrument HTML file to save")
+    args = parser.parse_args(argv)
+    if args.batch and (args.incremental or args.dedup or args.prefilter == "cheap"):
+        # A batch runs one model over independent requests; these modes need per-article decisions mid-run
+        parser.error("--batch cannot be combined with --incremental, --dedup or --prefilter cheap")
+    if args.routing and (args.batch or args.incremental or args.prefilter == "cheap"):
+        # Routing decides per article after seeing the cheap answer; --prefilter cheap is the metrics-only alternative
+        parser.error("--routing cannot be combined with --batch, --incremental or --prefilter cheap")
+    thresholds = None
+    if args.thresholds:
+        try:
+            thresholds = load_thresholds(args.thresholds)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    print("--- Analysis Script: Documentation Analyzer Agent (Task 1) ---")
+    llm_client = get_llm_client() # Raises if LLM_API_KEY is missing
+
+    # Option 1: Load pre-extracted content from scraper.py (recommended for iterative testing)
+    extracted_data_file = args.input
+
+    if extracted_data_file.endswith(".json") and os.path.exists(extracted_data_file):
+        # Older scraper runs wrote a single JSON list
+        with open(extracted_data_file, 'r', encoding='utf-8') as f:
+            articles_to_analyze = json.load(f)
+        print(f"Loaded {len(articles_to_analyze)} articles from {extracted_data_file}.")
+    elif extracted_data_file == "-" or os.path.exists(extracted_data_file) or args.follow:
+        # Records are read one line at a time and analyzed as they arrive
+        if args.follow and not os.path.exists(extracted_data_file):
+            open(extracted_data_file, 'a').close() # Start tailing before the scraper creates it
+        articles_to_analyze = iter_jsonl(extracted_data_file, follow=args.follow)
+        print(f"Streaming articles from {'stdin' if extracted_data_file == '-' else extracted_data_file}.")
+    else:
+        print(f"'{extracted_data_file}' not found. Please run 'scraper.py' first or define URLs directly.")
+        # Fallback: Define URLs directly if scraper output is not available
+        articles_to_analyze = [
+            {"url": "https://partners.moengage.com/hc/en-us/articles/9643917325460-Create-creatives", "content": None},
+            {"url": "https://help.moengage.com/hc/en-us/articles/28194279371668-How-to-Analyze-OTT-Content-Performance", "content": None},
+        ]
+        # In a real scenario, you'd ensure scraper.py is run first or implement live fetching here.
+
+    # Unchanged articles are answered from the local result cache instead of the API
+    llm_result_cache = LLMResultCache(os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+
+    # Keep several requests in flight while respecting the provider's RPM / TPM budgets
+    limiter = RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+    print(f"Analyzing with up to {LLM_MAX_IN_FLIGHT} concurrent LLM requests.")
+
+    if args.profile:
+        article_data = next((article for article in articles_to_analyze if article["url"] == args.profile),
+                            {"url": args.profile, "content": None})
+        final_report = profile_call(analyze_article, article_data, llm_client, LLM_MODEL, cache=llm_result_cache,
+                                    limiter=limiter, max_retries=LLM_MAX_RETRIES,
+                                    profiler=args.profiler, output=args.profile_output)
+        print(json.dumps(final_report, indent=4))
+        return
+    if args.metrics:
+        metrics.enable()
+
+    # Completed URLs are journaled with their content hash, so a restarted run only redoes
+    # failed or changed articles and appends to the existing reports instead of starting over
+    if args.restart:
+        for path in (args.journal, args.output):
+            if os.path.exists(path):
+                os.remove(path)
+    journal = RunJournal(args.journal)
+    articles_to_analyze = journal.pending(articles_to_analyze)
+    # Reports are also kept per run in an indexed store, so later queries need not load the JSONL files
+    report_store = ReportStore(args.report_store)
+    run_id = report_store.start_run(args.run_id, f"{LLM_MODEL}, prompt {PROMPT_VERSION}")
+    print(f"Run id: {run_id} (reports stored in {args.report_store})")
+
+    # Local metrics are computed over the stream and attached to every record;
+    # their distribution over the run is summarized at the end for comparison with the thresholds
+    corpus_metrics = CorpusMetrics()
+    if args.prefilter != "off":
+        articles_to_analyze = iter_with_metrics(articles_to_analyze, corpus=corpus_metrics)
+
+    # Each report is appended atomically as soon as it completes instead of being buffered until the end
+    with JsonlWriter(args.output, append=True, durable=True) as writer:
+        analysis_options = dict(cache=llm_result_cache, limiter=limiter, prefilter=args.prefilter, thresholds=thresholds)
+        if args.incremental:
+            # Per-section hashes and results persist between nightly runs
+            section_store = SectionStore(os.getenv("SECTION_STORE_PATH", DEFAULT_STORE_PATH))
+            analysis_options["section_store"] = section_store
+        if args.routing:
+            tier_stats = TierStats(load_prices(LLM_PRICES_FILE))
+            analysis_options["tier_stats"] = tier_stats
+            if args.routing_thresholds:
+                with open(args.routing_thresholds, 'r', encoding='utf-8') as f:
+                    analysis_options["routing_thresholds"] = json.load(f)
+        if args.batch:
+            if args.batch_client == "openai":
+                batch_client = OpenAIBatchClient(llm_client)
+            else:
+                batch_client = InlineBatchClient(llm_client.with_options(max_retries=0), LLM_MAX_IN_FLIGHT,
+                                                 limiter, LLM_MAX_RETRIES)
+            reports = analyze_articles_in_batch(articles_to_analyze, batch_client, LLM_MODEL, args.batch_file,
+                                                cache=llm_result_cache, poll_interval=args.poll_interval,
+                                                prefilter=args.prefilter, thresholds=thresholds)
+        elif args.dedup:
+            # The MinHash/LSH index persists across runs and is updated as new articles arrive
+            dedup_index = NearDuplicateIndex(os.getenv("DEDUP_INDEX_PATH", DEFAULT_INDEX_PATH), args.dedup_threshold)
+            reports = analyze_articles_deduplicated(articles_to_analyze, llm_client, LLM_MODEL, dedup_index,
+                                                    **analysis_options)
+        else:
+            reports = analyze_articles_concurrently(articles_to_analyze, llm_client, LLM_MODEL, **analysis_options)
+        for final_report in reports:
+            url = final_report["url"]
+            writer.write(final_report)
+            succeeded = "error" not in final_report and not is_fallback_report(final_report)
+            metrics.add("articles_analyzed" if succeeded else "articles_failed")
+            journal.record(url, final_report.get("content_hash"), succeeded)
+            report_store.add(final_report, run_id, succeeded)
+            if "error" in final_report:
+                continue
+            print(f"\n--- Analysis Report for {url} ---")
+            print(json.dumps(final_report, indent=4))
+            print("-" * (len(url) + 25))
+
+    journal.close()
+    report_store.close()
+    if args.dedup:
+        clusters = dedup_index.cluster_sizes()
+        print(f"Near-duplicate index: {len(clusters)} clusters covering {sum(clusters.values())} articles")
+        dedup_index.close()
+    print(f"\n{writer.count} analysis reports appended to {args.output} "
+          f"({journal.skipped} articles skipped as already analyzed)")
+
+    if args.incremental:
+        print(section_store.summary())
+        section_store.evict()
+        section_store.close()
+    if corpus_metrics.article_count:
+        print(corpus_metrics.summary_text())
+    if args.routing:
+        print(tier_stats.summary())
+        if args.routing_stats:
+            tier_stats.write(args.routing_stats)
+            print(f"Routing statistics written to {args.routing_stats}")
+    print(token_usage.summary())
+    llm_result_cache.evict()
+    print(llm_result_cache.summary())
+    llm_result_cache.close()
+    if args.metrics:
+        metrics.write(args.metrics)
+        print(f"Run metrics written to {args.metrics}")
+
+if __name__ == "__main__":
+    main()
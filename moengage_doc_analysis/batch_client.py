@@ -0,0 +1,150 @@
+# moengage-doc-analysis/moengage_doc_analysis/batch_client.py
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .jsonl_stream import iter_jsonl, JsonlWriter
+from .rate_limiter import RateLimiter, call_with_retries
+
+# --- Batch defaults ---
+DEFAULT_BATCH_FILE = "analysis_batch_requests.jsonl"
+DEFAULT_POLL_INTERVAL_SECONDS = 60.0
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# A batch client needs three methods, so a local fake can stand in for the provider:
+#   submit(batch_file) -> batch_id     uploads the request file and starts the batch
+#   status(batch_id) -> str            one of the provider's statuses, see TERMINAL_STATUSES
+#   results(batch_id) -> iterable      output lines: {"custom_id", "response": {"status_code", "body"}, "error"}
+
+class OpenAIBatchClient:
+    """
+    Submits batch files through the OpenAI Batch API (files + batches endpoints), which
+    completes within `completion_window` at a lower price than synchronous requests.
+    """
+
+    def __init__(self, llm_client, completion_window: str = "24h"):
+        self.llm_client = llm_client
+        self.completion_window = completion_window
+
+    def submit(self, batch_file: str) -> str:
+        with open(batch_file, 'rb') as f:
+            uploaded = self.llm_client.files.create(file=f, purpose="batch")
+        batch = self.llm_client.batches.create(input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT,
+                                               completion_window=self.completion_window)
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.llm_client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str):
+        batch = self.llm_client.batches.retrieve(batch_id)
+        # Failed requests are listed in a separate error file with the same line format
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.llm_client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    yield json.loads(line)
+
+class InlineBatchClient:
+    """
+    Runs a batch file's requests right away through `chat.completions` and writes the answers
+    in the Batch API output format next to the request file. For OpenAI-compatible endpoints
+    without a batch API, and for testing bulk mode against a local fake server.
+    """
+
+    def __init__(self, llm_client, max_in_flight: int = 1, limiter: RateLimiter = None, max_retries: int = 0):
+        self.llm_client = llm_client
+        self.max_in_flight = max(1, max_in_flight)
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    def _run(self, line: dict) -> dict:
+        try:
+            response = call_with_retries(lambda: self.llm_client.chat.completions.create(**line["body"]),
+                                         max_retries=self.max_retries, limiter=self.limiter)
+            if self.limiter and response.usage is not None:
+                self.limiter.settle(0, response.usage.total_tokens) # No estimate was charged up front
+            return {"custom_id": line["custom_id"], "response": {"status_code": 200, "body": response.model_dump()},
+                    "error": None}
+        except Exception as e:
+            return {"custom_id": line["custom_id"], "response": None, "error": {"message": str(e)}}
+
+    def submit(self, batch_file: str) -> str:
+        output_file = f"{os.path.splitext(batch_file)[0]}.output.jsonl"
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor, JsonlWriter(output_file) as writer:
+            for result in executor.map(self._run, iter_jsonl(batch_file)):
+                writer.write(result)
+        return output_file
+
+    def status(self, batch_id: str) -> str:
+        return "completed" if os.path.exists(batch_id) else "expired"
+
+    def results(self, batch_id: str):
+        return iter_jsonl(batch_id)
+
+def write_batch_file(path: str, requests) -> int:
+    """
+    Writes `(custom_id, body)` pairs as Batch API request lines and returns how many were written.
+    """
+    with JsonlWriter(path) as writer:
+        for custom_id, body in requests:
+            writer.write({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body})
+        return writer.count
+
+def wait_for_batch(batch_client, batch_id: str, poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS) -> str:
+    """
+    Polls the batch until it reaches a terminal status and returns that status.
+    """
+    last_status = None
+    while True:
+        status = batch_client.status(batch_id)
+        if status != last_status:
+            print(f"Batch {batch_id}: {status}")
+            last_status = status
+        if status in TERMINAL_STATUSES:
+            return status
+        time.sleep(poll_interval)
+
+def result_contents(results, usage=None) -> dict:
+    """
+    Maps each custom_id to the message content of its successful response. Requests that
+    errored or returned a non-200 status are left out. With `usage` (e.g. a prompts.TokenUsage),
+    each response's token usage is recorded too.
+    """
+    contents = {}
+    for line in results:
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            print(f"Batch request {line.get('custom_id')} failed: {line.get('error') or response.get('status_code')}")
+            continue
+        if usage is not None:
+            usage.record(response["body"].get("usage"))
+        contents[line["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+    return contents
+
+def state_path(batch_file: str) -> str:
+    return f"{os.path.splitext(batch_file)[0]}.state.json"
+
+def save_batch_state(batch_file: str, state: dict):
+    """
+    Remembers a submitted batch (its id and which articles it covers) so an interrupted run
+    resumes polling instead of paying for the batch again.
+    """
+    temporary = state_path(batch_file) + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(temporary, state_path(batch_file))
+
+def load_batch_state(batch_file: str) -> dict:
+    if not os.path.exists(state_path(batch_file)):
+        return None
+    with open(state_path(batch_file), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def clear_batch_state(batch_file: str):
+    if os.path.exists(state_path(batch_file)):
+        os.remove(state_path(batch_file))
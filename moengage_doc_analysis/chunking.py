@@ -0,0 +1,161 @@
+# moengage-doc-analysis/moengage_doc_analysis/chunking.py
+
+import functools
+import hashlib
+import re
+
+# Used when tiktoken is not installed: roughly 4 characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+@functools.lru_cache(maxsize=None)
+def _get_encoder(model: str):
+    try:
+        import tiktoken # Optional dependency for exact counts
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    Counts tokens with the model's tokenizer when tiktoken is available, else estimates them.
+    """
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+    return len(encoder.encode(text, disallowed_special=()))
+
+HEADING_MARKER = re.compile(r'^#{1,6} ')
+
+def is_heading_line(line: str) -> bool:
+    """
+    Whether a line of extracted text is a heading: marked with "#" by extraction, or (for text
+    extracted without markers) a short line of at most 12 words that does not end like a sentence.
+    List items, marked with "- ", never are.
+    """
+    stripped = line.strip()
+    if HEADING_MARKER.match(stripped):
+        return True
+    if stripped.startswith("- "):
+        return False
+    return 0 < len(stripped) <= 100 and len(stripped.split()) <= 12 and stripped[-1] not in '.,;:!?)"'
+
+def split_into_sections(text: str) -> list:
+    """
+    Splits extracted article text into heading-delimited sections. Each section is the heading
+    line followed by its body lines; text before the first heading forms its own section.
+    Consecutive heading-like lines (e.g. a title followed by a subheading) stay together.
+    """
+    sections = []
+    current = []
+    current_has_body = False
+    for line in text.splitlines():
+        if is_heading_line(line) and current_has_body:
+            sections.append("\n".join(current))
+            current, current_has_body = [], False
+        current.append(line)
+        if not is_heading_line(line):
+            current_has_body = True
+    if current:
+        sections.append("\n".join(current))
+    return sections
+
+def _split_oversized(block: str, max_tokens: int, model: str) -> list:
+    # Fall back from lines to sentences to words for a block that is too large on its own
+    for pattern in ("\n", _SENTENCE_END, " "):
+        parts = block.split(pattern) if isinstance(pattern, str) else pattern.split(block)
+        if len(parts) > 1:
+            joiner = "\n" if pattern == "\n" else " "
+            return _pack([part for part in parts if part.strip()], max_tokens, model, joiner)
+    # A single huge token-like run: cut it by characters, shrinking until every piece fits
+    step = max(1, max_tokens * CHARS_PER_TOKEN)
+    while True:
+        pieces = [block[i:i + step] for i in range(0, len(block), step)]
+        if step == 1 or all(count_tokens(piece, model) <= max_tokens for piece in pieces):
+            return pieces
+        step //= 2
+
+def _pack(blocks: list, max_tokens: int, model: str, joiner: str) -> list:
+    chunks = []
+    current = []
+    current_tokens = 0
+    joiner_tokens = count_tokens(joiner, model) # Counted between blocks so joined chunks stay within the limit
+    for block in blocks:
+        block_tokens = count_tokens(block, model)
+        if block_tokens > max_tokens:
+            if current:
+                chunks.append(joiner.join(current))
+                current, current_tokens = [], 0
+            chunks.extend(_split_oversized(block, max_tokens, model))
+            continue
+        if current and current_tokens + joiner_tokens + block_tokens > max_tokens:
+            chunks.append(joiner.join(current))
+            current, current_tokens = [], 0
+        current_tokens += block_tokens + (joiner_tokens if current else 0)
+        current.append(block)
+    if current:
+        chunks.append(joiner.join(current))
+    return chunks
+
+def chunk_text(text: str, max_tokens: int, model: str = "gpt-4o") -> list:
+    """
+    Splits text into chunks of at most `max_tokens`, packing whole sections together and only
+    breaking inside a section (on lines, then sentences) when it is too large by itself.
+    """
+    return _pack(split_into_sections(text), max_tokens, model, "\n")
+
+def group_sections(sections: list, target_tokens: int, model: str = "gpt-4o") -> list:
+    """
+    Packs consecutive sections into groups of roughly `target_tokens` for incremental analysis.
+    Group boundaries are content-defined: a group may only close after a section whose own hash
+    selects it as a boundary (or when the next section would overflow twice the target), so an
+    edit to one section changes only the group it lands in instead of shifting every later group.
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+    for section in sections:
+        section_tokens = count_tokens(section, model)
+        if current and current_tokens + section_tokens > 2 * target_tokens:
+            groups.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(section)
+        current_tokens += section_tokens
+        is_boundary = int(hashlib.sha256(section.encode("utf-8")).hexdigest()[:8], 16) % 4 == 0
+        if current_tokens >= target_tokens or (is_boundary and current_tokens >= target_tokens // 2):
+            groups.append("\n".join(current))
+            current, current_tokens = [], 0
+    if current:
+        groups.append("\n".join(current))
+    return groups
+
+def _suggestion_key(suggestion: str) -> str:
+    return " ".join(suggestion.casefold().split()).rstrip(".!")
+
+def merge_reports(reports: list) -> dict:
+    """
+    Merges per-chunk reports into one report of the same shape: for every criterion the
+    distinct assessments are joined and the suggestions are concatenated in order, dropping
+    duplicates that differ only in case, spacing or trailing punctuation.
+    """
+    merged = {}
+    for report in reports:
+        for criterion, result in report.items():
+            if not isinstance(result, dict):
+                continue
+            target = merged.setdefault(criterion, {"assessment": "", "suggestions": [], "_seen": set()})
+            assessment = (result.get("assessment") or "").strip()
+            if assessment and assessment not in target["assessment"]:
+                target["assessment"] = f"{target['assessment']} {assessment}".strip()
+            for suggestion in result.get("suggestions") or []:
+                key = _suggestion_key(suggestion)
+                if key not in target["_seen"]:
+                    target["_seen"].add(key)
+                    target["suggestions"].append(suggestion)
+    for result in merged.values():
+        del result["_seen"]
+    return merged
@@ -0,0 +1,31 @@
+# moengage-doc-analysis/moengage_doc_analysis/cli.py
+
+import importlib
+import sys
+
+# Subcommand -> module providing `main(argv)`; modules are only imported for the command being run
+COMMANDS = {
+    "scrape": ("scraper", "Fetch articles and extract their text"),
+    "crawl": ("crawler", "Discover articles from sitemaps or category pages and fetch them"),
+    "analyze": ("analysis", "Analyze extracted articles with an LLM"),
+    "reports": ("report_store", "Query stored analysis reports and compare runs"),
+}
+
+def usage() -> str:
+    lines = ["usage: python -m moengage_doc_analysis <command> [options]", "", "commands:"]
+    lines += [f"  {name:<9} {description}" for name, (_, description) in COMMANDS.items()]
+    lines += ["", "Run a command with --help for its options."]
+    return "\n".join(lines)
+
+def main(argv: list = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(usage(), file=sys.stderr if argv and argv[0] not in ("-h", "--help") else sys.stdout)
+        sys.exit(0 if argv and argv[0] in ("-h", "--help") else 2)
+
+    # Modules read their configuration from the environment when imported, so load .env first
+    from dotenv import load_dotenv
+    load_dotenv()
+    module = importlib.import_module(f".{COMMANDS[argv[0]][0]}", __package__)
+    sys.argv[0] = f"{__package__} {argv[0]}" # Shown as the program name in argparse usage
+    module.main(argv[1:])
@@ -0,0 +1,366 @@
+# moengage-doc-analysis/moengage_doc_analysis/crawler.py
+
+import argparse
+import contextlib
+import gzip
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+
+from .http_cache import HttpCache, DEFAULT_CACHE_DIR
+from .jsonl_stream import JsonlWriter
+from .scraper import create_session, fetch_article_content, article_record, DEFAULT_OUTPUT_FILE
+
+# --- Crawl defaults ---
+DEFAULT_FRONTIER_PATH = "crawl_frontier.sqlite3"
+DEFAULT_DELAY_SECONDS = 1.0   # Minimum gap between two requests to the same host
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 5      # A URL failing on this many crawls in a row is given up on
+DEFAULT_RECRAWL_AFTER_SECONDS = 7 * 24 * 60 * 60   # Crawled articles rediscovered after this long are fetched again
+
+ARTICLE_PATH = re.compile(r'/hc/[^/]+/articles/\d+')
+LISTING_PATH = re.compile(r'/hc/[^/]+(?:/?$|/categories/\d+|/sections/\d+)')
+TRACKING_PARAMS = re.compile(r'^(utm_.*|fbclid|gclid|mc_[a-z]+)$')
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form used for frontier dedup: lower-case scheme and host, no default port,
+    fragment or tracking parameters, sorted query, and Zendesk article slugs dropped, so
+    '/articles/123-Old-Title' and '/articles/123-New-Title#faq' are the same article.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r'(/articles/\d+)-[^/]*', r'\1', parts.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not TRACKING_PARAMS.match(key)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+class Frontier:
+    """
+    On-disk crawl frontier (SQLite): remembers every URL ever queued, so rediscovered links
+    are dropped, and hands out queued URLs highest priority first. URLs taken but not finished
+    when a crawl dies are queued again on the next start. URLs whose fetch failed are retried
+    by later crawls (a Frontier opened after the failure), up to `max_attempts` times in a row.
+    Crawled URLs are fetched again when rediscovered more than `recrawl_after_seconds` later,
+    so edits to articles without a sitemap lastmod are picked up too.
+    """
+
+    def __init__(self, path: str = DEFAULT_FRONTIER_PATH, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 recrawl_after_seconds: float = DEFAULT_RECRAWL_AFTER_SECONDS):
+        self.max_attempts = max_attempts
+        self.recrawl_after_seconds = recrawl_after_seconds
+        self._opened_at = time.time()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS frontier (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                priority REAL NOT NULL,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                failed_at REAL,
+                done_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_frontier_queue ON frontier (state, kind, priority);
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(frontier)")}
+        if "attempts" not in columns: # Frontier files from before failed fetches were tracked
+            self._conn.execute("ALTER TABLE frontier ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("ALTER TABLE frontier ADD COLUMN failed_at REAL")
+        if "done_at" not in columns: # Frontier files from before articles were recrawled by age
+            self._conn.execute("ALTER TABLE frontier ADD COLUMN done_at REAL")
+        self._conn.execute("UPDATE frontier SET state = 'queued' WHERE state = 'in_progress'")
+        self._conn.commit()
+
+    def add(self, url: str, kind: str = "article", priority: float = 0.0) -> bool:
+        """
+        Queues `url` unless an equivalent URL was seen before. A rediscovered queued URL keeps
+        the higher of its two priorities; an already crawled one is queued again only if it
+        comes with a newer lastmod priority (which also resets a failed URL's attempt count)
+        or was crawled more than `recrawl_after_seconds` ago, by an earlier crawl.
+        Returns True if the URL is (re)queued.
+        """
+        key = normalize_url(url)
+        stale_before = min(time.time() - self.recrawl_after_seconds, self._opened_at)
+        with self._lock, self._conn:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO frontier (key, url, kind, priority, state) "
+                                        "VALUES (?, ?, ?, ?, 'queued')", (key, url, kind, priority))
+            if cursor.rowcount == 1:
+                return True
+            self._conn.execute("UPDATE frontier SET priority = MAX(priority, ?) WHERE key = ? AND state = 'queued'",
+                               (priority, key))
+            cursor = self._conn.execute(
+                "UPDATE frontier SET priority = MAX(priority, ?), state = 'queued', attempts = 0 "
+                "WHERE key = ? AND ((state IN ('done', 'failed') AND priority < ?) "
+                "OR (state = 'done' AND COALESCE(done_at, 0) < ?))", (priority, key, priority, stale_before))
+            return cursor.rowcount == 1
+
+    def pop(self, kind: str):
+        """
+        Takes the highest-priority queued URL of `kind`, or returns None when there is none.
+        Once nothing is queued, URLs that failed on an earlier crawl are retried.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT key, url FROM frontier WHERE state = 'queued' AND kind = ? ORDER BY priority DESC LIMIT 1",
+                (kind,)).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT key, url FROM frontier WHERE state = 'failed' AND kind = ? AND attempts < ? "
+                    "AND failed_at < ? ORDER BY priority DESC LIMIT 1",
+                    (kind, self.max_attempts, self._opened_at)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE frontier SET state = 'in_progress' WHERE key = ?", (row[0],))
+            return row[1]
+
+    def mark_done(self, url: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE frontier SET state = 'done', attempts = 0, done_at = ? WHERE key = ?",
+                               (time.time(), normalize_url(url)))
+
+    def mark_failed(self, url: str):
+        """
+        Records a failed fetch; the URL is retried by the next crawl (see `pop`).
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE frontier SET state = 'failed', attempts = attempts + 1, failed_at = ? "
+                               "WHERE key = ?", (time.time(), normalize_url(url)))
+
+    def requeue(self, kind: str):
+        """
+        Queues every crawled URL of `kind` again, e.g. listing pages at the start of a new crawl.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE frontier SET state = 'queued' WHERE state = 'done' AND kind = ?", (kind,))
+
+    def queued(self, kind: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM frontier WHERE state = 'queued' AND kind = ?",
+                                      (kind,)).fetchone()[0]
+
+    def failed(self, kind: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM frontier WHERE state = 'failed' AND kind = ?",
+                                      (kind,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class PolitenessScheduler:
+    """
+    Spaces requests to the same host at least `delay_seconds` apart, across all worker threads.
+    Each caller reserves the next free slot for its host and sleeps until it arrives.
+    """
+
+    def __init__(self, delay_seconds: float = DEFAULT_DELAY_SECONDS):
+        self.delay_seconds = delay_seconds
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait_turn(self, url: str):
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay_seconds
+        if slot > now:
+            time.sleep(slot - now)
+
+def _lastmod_priority(lastmod: str) -> float:
+    # Recently updated articles first: the priority is the lastmod timestamp
+    if not lastmod:
+        return 0.0
+    try:
+        parsed = datetime.fromisoformat(lastmod.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return 0.0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def _get(session: requests.Session, scheduler: PolitenessScheduler, url: str):
+    scheduler.wait_turn(url)
+    try:
+        response = session.get(url, timeout=10)
+        response.raise_for_status()
+        return response
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching URL {url}: {e}")
+        return None
+
+def discover_from_sitemap(sitemap_url: str, frontier: Frontier, session: requests.Session,
+                          scheduler: PolitenessScheduler, include: re.Pattern = ARTICLE_PATH) -> int:
+    """
+    Reads a sitemap or sitemap index (optionally gzipped) and queues every article URL with its
+    lastmod as priority. Returns the number of new article URLs.
+    """
+    added = 0
+    pending = [sitemap_url]
+    seen = set()
+    while pending:
+        url = pending.pop()
+        if url in seen:
+            continue
+        seen.add(url)
+        response = _get(session, scheduler, url)
+        if response is None:
+            continue
+        body = response.content
+        if body[:2] == b"\x1f\x8b":
+            body = gzip.decompress(body)
+        try:
+            root = ET.fromstring(body)
+        except ET.ParseError as e:
+            print(f"Error parsing sitemap {url}: {e}")
+            continue
+        for child in root.findall(f"{SITEMAP_NS}sitemap"):
+            location = child.findtext(f"{SITEMAP_NS}loc")
+            if location:
+                pending.append(location.strip())
+        for child in root.findall(f"{SITEMAP_NS}url"):
+            location = (child.findtext(f"{SITEMAP_NS}loc") or "").strip()
+            if location and include.search(urlsplit(location).path):
+                added += frontier.add(location, "article", _lastmod_priority(child.findtext(f"{SITEMAP_NS}lastmod")))
+    return added
+
+def discover_from_listings(frontier: Frontier, session: requests.Session, scheduler: PolitenessScheduler,
+                           include: re.Pattern = ARTICLE_PATH) -> int:
+    """
+    Walks queued category/section (listing) pages on the seed hosts, queueing further listing
+    pages and every linked article. Returns the number of new article URLs.
+    """
+    from bs4 import BeautifulSoup # Deferred so importing the package stays fast
+    added = 0
+    while True:
+        url = frontier.pop("listing")
+        if url is None:
+            return added
+        response = _get(session, scheduler, url)
+        if response is None:
+            frontier.mark_failed(url)
+            continue
+        frontier.mark_done(url)
+        host = urlsplit(url).netloc
+        for link in BeautifulSoup(response.text, 'html.parser').find_all('a', href=True):
+            target = urljoin(url, link['href'])
+            parts = urlsplit(target)
+            if parts.netloc != host or parts.scheme not in ("http", "https"):
+                continue
+            if include.search(parts.path):
+                added += frontier.add(target, "article")
+            elif LISTING_PATH.search(parts.path):
+                frontier.add(target, "listing", priority=-1.0) # Discovery order does not matter much
+
+def crawl(seeds, frontier: Frontier, session: requests.Session = None, cache: HttpCache = None,
+          delay_seconds: float = DEFAULT_DELAY_SECONDS, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+          max_articles: int = None, include: re.Pattern = ARTICLE_PATH):
+    """
+    Seeds the frontier from sitemap.xml files and/or help-center category pages, then fetches
+    queued articles through the regular `fetch_article_content` path, most recently updated
+    first, never hitting one host more often than every `delay_seconds`. Yields the same
+    `article_record` dicts as `scraper.fetch_articles`.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = create_session(max_concurrency, max_concurrency)
+    scheduler = PolitenessScheduler(delay_seconds)
+    try:
+        frontier.requeue("listing") # Listing pages are the only place new articles show up
+        for seed in seeds:
+            if "sitemap" in seed or seed.endswith((".xml", ".xml.gz")):
+                added = discover_from_sitemap(seed, frontier, session, scheduler, include)
+            elif include.search(urlsplit(seed).path):
+                added = int(frontier.add(seed, "article"))
+            else:
+                frontier.add(seed, "listing")
+                added = discover_from_listings(frontier, session, scheduler, include)
+            print(f"Seed {seed}: {added} new articles queued")
+        print(f"Frontier: {frontier.queued('article')} articles queued")
+
+        def fetch(url):
+            scheduler.wait_turn(url)
+            return fetch_article_content(url, session, cache)
+
+        fetched = 0
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            while True:
+                while len(running) < max_concurrency and (max_articles is None or fetched + len(running) < max_articles):
+                    url = frontier.pop("article")
+                    if url is None:
+                        break
+                    running[executor.submit(fetch, url)] = url
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = running.pop(future)
+                    content = future.result()
+                    if content:
+                        frontier.mark_done(url)
+                    else:
+                        frontier.mark_failed(url) # Timeouts and 5xx are transient; retried by the next crawl
+                    fetched += 1
+                    yield article_record(url, content)
+    finally:
+        if owns_session:
+            session.close()
+
+def main(argv: list = None):
+    """
+    Command-line entry point (`python -m moengage_doc_analysis crawl`).
+    """
+    parser = argparse.ArgumentParser(description="Crawl whole help centers from sitemaps or category pages.")
+    parser.add_argument("seeds", nargs="+", help="sitemap.xml URLs and/or help-center home/category/section URLs")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_FILE,
+                        help="Newline-delimited JSON output file, or '-' to stream records to stdout")
+    parser.add_argument("--frontier", default=DEFAULT_FRONTIER_PATH, help="On-disk frontier (resumable)")
+    parser.add_argument("--delay", type=float, default=DEFAULT_DELAY_SECONDS, help="Seconds between requests per host")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--max-articles", type=int, help="Stop after this many articles")
+    parser.add_argument("--include", default=ARTICLE_PATH.pattern, help="Regex an article URL path must match")
+    parser.add_argument("--recrawl-days", type=float, default=DEFAULT_RECRAWL_AFTER_SECONDS / 86400,
+                        help="Fetch crawled articles again once they are this many days old "
+                             "(a 304 from the HTTP cache keeps unchanged ones cheap)")
+    args = parser.parse_args(argv)
+
+    # Appending lets an interrupted crawl resume from the frontier without losing earlier records
+    with JsonlWriter(args.output, append=True) as writer, \
+            contextlib.redirect_stdout(sys.stderr if args.output == "-" else sys.stdout):
+        print("--- Crawler: Discovering and Fetching Help-Center Articles ---")
+        frontier = Frontier(args.frontier, recrawl_after_seconds=args.recrawl_days * 86400)
+        http_cache = HttpCache(os.getenv("SCRAPER_CACHE_DIR", DEFAULT_CACHE_DIR))
+        for record in crawl(args.seeds, frontier, cache=http_cache, delay_seconds=args.delay,
+                            max_concurrency=args.max_concurrency, max_articles=args.max_articles,
+                            include=re.compile(args.include)):
+            print(f"{'Fetched' if record['content'] else 'Failed'}: {record['url']}")
+            writer.write(record)
+        failed = frontier.failed("article")
+        if failed:
+            print(f"{failed} articles failed and will be retried by the next crawl")
+        frontier.close()
+        http_cache.evict()
+        print(f"\n{http_cache.summary()}")
+        print(f"\n--- Crawl complete. {writer.count} records saved to {args.output} ---")
+
+if __name__ == "__main__":
+    main()
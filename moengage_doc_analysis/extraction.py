@@ -0,0 +1,213 @@
+# moengage-doc-analysis/moengage_doc_analysis/extraction.py
+
+import os
+
+# Tags whose content is page chrome rather than article text
+BOILERPLATE_TAGS = ('script', 'style', 'nav', 'footer', 'header', 'aside')
+
+# BeautifulSoup stores strings inside these tags as special string types that get_text() skips
+HIDDEN_TEXT_TAGS = ('template', 'rt', 'rp')
+
+# Elements that flow within a line of text; every other element (paragraphs, list items, table
+# cells, <br>, ...) starts and ends a line of its own
+INLINE_TAGS = frozenset(('a', 'abbr', 'b', 'bdi', 'bdo', 'cite', 'code', 'data', 'del', 'dfn', 'em', 'font', 'i',
+                         'img', 'ins', 'kbd', 'label', 'mark', 'q', 's', 'samp', 'small', 'span', 'strike',
+                         'strong', 'sub', 'sup', 'time', 'tt', 'u', 'var', 'wbr'))
+
+# Markdown-style markers put before the text of headings and list items, so the structure survives
+# extraction (the text metrics count headings and list items from them, and the LLM sees them)
+STRUCTURE_MARKERS = {**{f"h{level}": "#" * level + " " for level in range(1, 7)}, "li": "- "}
+
+# Bumped whenever the extracted text changes shape, so cached text from older extractions is not reused
+EXTRACTION_VERSION = 3
+
+# Parser used by fetch_article_content; "lxml" is much faster but needs the optional lxml package
+DEFAULT_BACKEND = os.getenv("SCRAPER_PARSER", "bs4")
+
+class _LineBuilder:
+    """
+    Assembles the extracted text as both backends walk their trees: text of inline elements
+    continues the current line, block elements end it, and whitespace runs collapse to one
+    space (line breaks inside <pre> are kept). A heading's or list item's first line gets its
+    STRUCTURE_MARKERS prefix.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self._current = []
+        self._marker = ""
+        self._pre_depth = 0
+
+    def text(self, text: str):
+        if not self._pre_depth:
+            self._current.append(text)
+            return
+        first, *rest = text.split("\n")
+        self._current.append(first)
+        for line in rest:
+            self.end_line()
+            self._current.append(line)
+
+    def end_line(self):
+        line = " ".join("".join(self._current).split())
+        self._current = []
+        if line:
+            self.lines.append(self._marker + line)
+            self._marker = ""
+
+    def start(self, tag: str):
+        if tag in INLINE_TAGS:
+            return
+        self.end_line()
+        self._marker += STRUCTURE_MARKERS.get(tag, "")
+        if tag == 'pre':
+            self._pre_depth += 1
+
+    def end(self, tag: str):
+        if tag in INLINE_TAGS:
+            return
+        self.end_line()
+        if tag in STRUCTURE_MARKERS:
+            self._marker = "" # A heading or list item without text
+        elif tag == 'pre':
+            self._pre_depth -= 1
+
+    def result(self) -> str:
+        self.end_line()
+        return "\n".join(self.lines)
+
+def _collect_text_bs4(tag, builder: _LineBuilder):
+    from bs4 import CData, NavigableString, Tag
+    for child in tag.children:
+        if isinstance(child, Tag):
+            if child.name not in BOILERPLATE_TAGS and child.name not in HIDDEN_TEXT_TAGS:
+                builder.start(child.name)
+                _collect_text_bs4(child, builder)
+                builder.end(child.name)
+        elif type(child) in (NavigableString, CData): # Comments, doctypes and the like are not text
+            builder.text(child)
+
+def extract_with_bs4(html: str, url: str) -> str:
+    """
+    Reference extractor: pure-Python BeautifulSoup 'html.parser' tree with a selector cascade.
+    One line per block of text (see `_LineBuilder`), boilerplate subtrees left out.
+    """
+    from bs4 import BeautifulSoup # Deferred so importing the package stays fast
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Prioritize finding common article content tags
+    # Adjust these selectors based on actual MoEngage documentation HTML structure
+    article_content = soup.find('article') or \
+                      soup.find('main') or \
+                      soup.find('div', class_='article-body') or \
+                      soup.find('div', id='main-content') # Common ZenDesk help center ID
+
+    if not article_content:
+        print(f"Warning: No specific article content tag found for {url}. Extracting body text.")
+        # Fallback to body text if article-specific content is not found
+        article_content = soup.body
+    builder = _LineBuilder()
+    _collect_text_bs4(article_content, builder) # Script, style and page chrome are skipped while walking
+    return builder.result()
+
+def _find_content_root_lxml(root):
+    """
+    Applies the article > main > div.article-body > div#main-content cascade in a single
+    document-order walk, stopping as soon as an <article> is seen.
+    """
+    first_main = first_article_body = first_main_content = body = None
+    for element in root.iter():
+        tag = element.tag
+        if tag == 'article':
+            return element, body
+        if tag == 'main':
+            first_main = first_main if first_main is not None else element
+        elif tag == 'div':
+            if first_article_body is None and 'article-body' in element.get('class', '').split():
+                first_article_body = element
+            if first_main_content is None and element.get('id') == 'main-content':
+                first_main_content = element
+        elif tag == 'body' and body is None:
+            body = element
+    for candidate in (first_main, first_article_body, first_main_content):
+        if candidate is not None:
+            return candidate, body
+    return None, body
+
+def _collect_text_lxml(element, builder: _LineBuilder):
+    from lxml import etree
+    # Boilerplate subtrees are skipped while walking, but their tail text still belongs to the parent
+    if element.text:
+        builder.text(element.text)
+    for child in element:
+        tag = child.tag
+        if isinstance(tag, str) and tag not in BOILERPLATE_TAGS and tag not in HIDDEN_TEXT_TAGS:
+            builder.start(tag)
+            _collect_text_lxml(child, builder) # Comments and processing instructions contribute no text
+            builder.end(tag)
+        elif tag is etree.Comment and child.text and child.text.startswith("[CDATA[") and child.text.endswith("]]"):
+            # libxml2's HTML parser turns <![CDATA[x]]> into the comment "[CDATA[x]]"; bs4 keeps it as text
+            builder.text(child.text[len("[CDATA["):-len("]]")])
+        if child.tail:
+            builder.text(child.tail)
+
+def extract_with_lxml(html: str, url: str) -> str:
+    """
+    Fast extractor: libxml2's C parser, a single-pass selector cascade, and the same line
+    assembly as `extract_with_bs4`. Produces the same text for well-formed pages; heavily
+    malformed markup may be repaired differently by the two parsers.
+    """
+    from lxml import etree # Optional dependency, only needed for this backend
+
+    root = etree.fromstring(html.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+    if root is None:
+        raise ValueError("Empty document")
+    content_root, body = _find_content_root_lxml(root)
+    if content_root is None:
+        print(f"Warning: No specific article content tag found for {url}. Extracting body text.")
+        if body is None:
+            raise ValueError("Document has no <body>")
+        content_root = body
+    builder = _LineBuilder()
+    _collect_text_lxml(content_root, builder)
+    return builder.result()
+
+EXTRACTION_BACKENDS = {
+    "bs4": extract_with_bs4,
+    "lxml": extract_with_lxml,
+}
+
+def decode_html(raw: bytes, encoding: str) -> str:
+    """
+    Decodes a response body the same way requests' `Response.text` does, so HTML shipped to
+    another process as bytes parses to the same text as the in-process path.
+    """
+    if encoding is None:
+        from requests.compat import chardet # Same charset detection requests falls back on
+        encoding = chardet.detect(raw)["encoding"] or "utf-8"
+    try:
+        return str(raw, encoding, errors="replace")
+    except LookupError:
+        return str(raw, errors="replace")
+
+def extract_main_text(html: str, url: str, backend: str = DEFAULT_BACKEND) -> str:
+    """
+    Parses an HTML page and extracts the main article text with the chosen backend.
+    Raises on pages that cannot be parsed; `fetch_article_content` handles the error.
+    """
+    try:
+        extractor = EXTRACTION_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown extraction backend '{backend}'. Choose from: {', '.join(EXTRACTION_BACKENDS)}")
+    return extractor(html, url)
+
+def parse_html_bytes(url: str, raw: bytes, encoding: str, backend: str = DEFAULT_BACKEND) -> str:
+    """
+    Parse-stage entry point for worker processes: decodes and extracts one page.
+    Returns "" on failure, like `fetch_article_content`, so one bad page never stops the pool.
+    """
+    try:
+        return extract_main_text(decode_html(raw, encoding), url, backend)
+    except Exception as e:
+        print(f"Error parsing content from {url}: {e}")
+        return ""
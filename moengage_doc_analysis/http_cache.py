@@ -0,0 +1,153 @@
+# moengage-doc-analysis/moengage_doc_analysis/http_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .extraction import EXTRACTION_VERSION
+
+# --- Cache defaults ---
+DEFAULT_CACHE_DIR = ".http_cache"
+DEFAULT_MAX_ENTRIES = 5000                    # Oldest entries are evicted beyond this count
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60   # Entries not revalidated for 30 days are dropped
+
+class HttpCache:
+    """
+    Persistent on-disk cache of conditional-GET validators and extracted article text.
+    Each URL is stored as one small JSON file holding its ETag, Last-Modified header and
+    the text extracted on the last full download, so a 304 response can be answered
+    without downloading or re-parsing the page.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock() # Fetch workers share one cache instance
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _write(self, path: str, entry: dict):
+        # Write to a temp file and rename so a crash never leaves a half-written entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str) -> dict:
+        """
+        Returns the cached entry for `url`, or None if it is missing, unreadable or expired.
+        """
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url or time.time() - entry.get("validated_at", 0) > self.max_age_seconds:
+            return None
+        if entry.get("extraction_version") != EXTRACTION_VERSION:
+            return None # Text extracted in an older shape: download and extract the page again
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """
+        Builds the If-None-Match / If-Modified-Since headers for a cached entry.
+        """
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record_hit(self, url: str, entry: dict) -> str:
+        """
+        Marks a 304 Not Modified response for `url` and returns the cached text.
+        """
+        entry["validated_at"] = time.time()
+        self._write(self._path(url), entry)
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += entry.get("size_bytes", 0)
+        return entry["content"]
+
+    def store(self, url: str, response, content: str):
+        """
+        Records a full download. Only responses carrying a validator are worth caching,
+        since without ETag or Last-Modified the next request cannot be made conditional.
+        """
+        with self._lock:
+            self.misses += 1
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not content or not (etag or last_modified):
+            return
+        entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content": content,
+            "extraction_version": EXTRACTION_VERSION,
+            "size_bytes": len(response.content),
+            "validated_at": time.time(),
+        }
+        self._write(self._path(url), entry)
+
+    def record_error(self):
+        """
+        Marks a request that failed (timeout, connection error, 4xx/5xx), which is neither a hit nor a miss.
+        """
+        with self._lock:
+            self.errors += 1
+
+    def evict(self) -> int:
+        """
+        Removes expired entries, then the least recently validated ones beyond `max_entries`.
+        Returns the number of entries removed.
+        """
+        now = time.time()
+        entries = []
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    validated_at = json.load(f).get("validated_at", 0)
+            except (OSError, ValueError):
+                validated_at = 0
+            if now - validated_at > self.max_age_seconds:
+                os.remove(path)
+                removed += 1
+            else:
+                entries.append((validated_at, path))
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def summary(self) -> str:
+        """
+        One-line hit/miss summary for the end of a crawl. Failed requests are counted
+        separately and left out of the hit ratio.
+        """
+        total = self.hits + self.misses
+        hit_ratio = (self.hits / total * 100) if total else 0.0
+        return (f"HTTP cache: {self.hits} hits (304 Not Modified), {self.misses} misses, "
+                f"{self.errors} failed requests, {hit_ratio:.1f}% hit ratio, "
+                f"~{self.bytes_saved / 1024:.1f} KiB not re-downloaded")
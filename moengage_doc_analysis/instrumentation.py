@@ -0,0 +1,143 @@
+# moengage-doc-analysis/moengage_doc_analysis/instrumentation.py
+
+import contextlib
+import json
+import threading
+import time
+
+# Upper bounds (seconds) of the stage latency histogram buckets
+TIMER_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PROMETHEUS_PREFIX = "moengage_docs"
+
+_DISABLED_TIMER = contextlib.nullcontext()
+
+class RunMetrics:
+    """
+    Per-run stage timers and counters, shared by all threads of a process. Disabled by default:
+    then `timer()` hands back one shared no-op context manager and `add()`/`observe()` return
+    immediately, so instrumented code pays next to nothing.
+    Stages: fetch (time to response headers, which includes DNS/TCP/TLS on a new connection),
+    download (reading the body), parse, prompt_build, llm_wait, json_decode (only with LLM_STREAM=0;
+    streamed answers are parsed inside llm_wait), serialize.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._timers = {}   # stage -> [count, total_seconds, max_seconds, bucket counts]
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def enable(self):
+        self.enabled = True
+        self._started = time.time()
+
+    def observe(self, stage: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            timer = self._timers.get(stage)
+            if timer is None:
+                timer = self._timers[stage] = [0, 0.0, 0.0, [0] * len(TIMER_BUCKETS)]
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+            for position, bound in enumerate(TIMER_BUCKETS):
+                if seconds <= bound:
+                    timer[3][position] += 1
+                    break
+
+    @contextlib.contextmanager
+    def _timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timer(self, stage: str):
+        """
+        Context manager timing one occurrence of `stage`.
+        """
+        return self._timed(stage) if self.enabled else _DISABLED_TIMER
+
+    def add(self, counter: str, amount: float = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def to_json(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self._started,
+                "wall_seconds": round(time.time() - self._started, 3),
+                "stages": {stage: {"count": count, "total_seconds": round(total, 6),
+                                   "mean_seconds": round(total / count, 6) if count else 0.0,
+                                   "max_seconds": round(maximum, 6)}
+                           for stage, (count, total, maximum, _) in sorted(self._timers.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition format, for the node_exporter textfile collector or a pushgateway.
+        """
+        lines = [f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds histogram"]
+        with self._lock:
+            for stage, (count, total, _, buckets) in sorted(self._timers.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(TIMER_BUCKETS, buckets):
+                    cumulative += bucket_count
+                    lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+                lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+                lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds_count{{stage="{stage}"}} {count}')
+            for counter, value in sorted(self._counters.items()):
+                lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{counter}_total counter")
+                lines.append(f"{PROMETHEUS_PREFIX}_{counter}_total {value}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_run_wall_seconds gauge")
+        lines.append(f"{PROMETHEUS_PREFIX}_run_wall_seconds {time.time() - self._started:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """
+        Writes the run's metrics to `path`: Prometheus text for a .prom file, a JSON summary otherwise.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(".prom"):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_json(), f, indent=2)
+
+# The process-wide instance used by scraper.py and analysis.py; enabled by their --metrics option
+metrics = RunMetrics()
+
+def profile_call(func, *args, profiler: str = "cprofile", output: str = None, **kwargs):
+    """
+    Runs `func(*args, **kwargs)` once under cProfile (top functions by cumulative time printed,
+    raw stats saved to `output` if given) or pyinstrument (call tree printed, HTML saved to
+    `output`), and returns its result. Meant for profiling a single article.
+    """
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler # Optional dependency
+        profile = Profiler()
+        profile.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.stop()
+            print(profile.output_text(unicode=True, color=False))
+            if output:
+                with open(output, 'w', encoding='utf-8') as f:
+                    f.write(profile.output_html())
+
+    import cProfile
+    import pstats
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func, *args, **kwargs)
+    finally:
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(25)
+        if output:
+            profile.dump_stats(output)
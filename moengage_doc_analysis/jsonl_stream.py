@@ -0,0 +1,118 @@
+# moengage-doc-analysis/moengage_doc_analysis/jsonl_stream.py
+
+import json
+import os
+import sys
+import time
+
+from .instrumentation import metrics
+
+# --- Streaming defaults ---
+DEFAULT_POLL_INTERVAL_SECONDS = 0.5   # How often a tailing reader checks for new lines
+DEFAULT_IDLE_TIMEOUT_SECONDS = 30.0   # A tailing reader stops after this long without new data
+
+def iter_jsonl(path: str, follow: bool = False, poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+               idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS):
+    """
+    Yields one record per line from a newline-delimited JSON file, holding only one line in memory.
+    Use "-" to read from stdin (e.g. `python scraper.py -o - | python analysis.py -i -`).
+    With `follow=True` the file is tailed while another process is still writing it; a line is
+    only parsed once its trailing newline has been written, and the reader stops after
+    `idle_timeout` seconds without new data.
+    """
+    f = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+    try:
+        pending = ""
+        idle_since = time.monotonic()
+        while True:
+            line = f.readline()
+            if line:
+                pending += line
+                if not pending.endswith("\n"):
+                    continue # The writer has not finished this record yet (or crashed mid-record)
+                record_line, pending = pending.strip(), ""
+                idle_since = time.monotonic()
+                if record_line:
+                    yield json.loads(record_line)
+                continue
+            if not follow or f is sys.stdin or time.monotonic() - idle_since > idle_timeout:
+                break
+            time.sleep(poll_interval)
+        if pending.strip():
+            try:
+                yield json.loads(pending)
+            except ValueError:
+                # A writer that crashed mid-record leaves a truncated last line; skip it
+                print(f"Warning: ignoring incomplete last record in {path}.", file=sys.stderr)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def repair_truncated_tail(path: str):
+    """
+    Cuts a JSONL file back to its last complete line. A process killed mid-write can leave a
+    partial record at the end; appending after it would glue the next record onto the fragment.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        if position == 0:
+            return
+        f.seek(position - 1)
+        if f.read(1) == b"\n":
+            return
+        # Scan backwards for the last newline in fixed-size blocks
+        while position > 0:
+            block_start = max(0, position - 4096)
+            f.seek(block_start)
+            newline_at = f.read(position - block_start).rfind(b"\n")
+            if newline_at != -1:
+                f.truncate(block_start + newline_at + 1)
+                return
+            position = block_start
+        f.truncate(0)
+
+class JsonlWriter:
+    """
+    Writes records as newline-delimited JSON, flushing after every record so downstream
+    readers see each one immediately and a crash loses at most the record being written.
+    Each record goes out in a single O_APPEND write; with `append=True` a truncated last line
+    left by an earlier crash is cut off first, and `durable=True` also fsyncs every record.
+    Use "-" to write to stdout.
+    """
+
+    def __init__(self, path: str, append: bool = False, durable: bool = False):
+        self.path = path
+        self.durable = durable
+        self.count = 0
+        self._fd = None
+        if path != "-":
+            if append:
+                repair_truncated_tail(path)
+            flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (0 if append else os.O_TRUNC)
+            self._fd = os.open(path, flags, 0o644)
+
+    def write(self, record: dict):
+        with metrics.timer("serialize"):
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self._fd is None:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        else:
+            os.write(self._fd, line.encode("utf-8"))
+            if self.durable:
+                os.fsync(self._fd)
+        self.count += 1
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,122 @@
+# moengage-doc-analysis/moengage_doc_analysis/llm_cache.py
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# --- Cache defaults ---
+DEFAULT_CACHE_PATH = "llm_result_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 20000                   # Least recently used reports are evicted beyond this count
+DEFAULT_TTL_SECONDS = 90 * 24 * 60 * 60       # Reports older than 90 days are re-analyzed
+
+def normalize_content(content: str) -> str:
+    """
+    Normalizes article text before hashing so whitespace-only differences still hit the cache.
+    """
+    return "\n".join(" ".join(line.split()) for line in content.strip().splitlines() if line.strip())
+
+def content_hash(content: str) -> str:
+    """
+    Returns the SHA-256 hex digest of the normalized article text.
+    """
+    return hashlib.sha256(normalize_content(content).encode("utf-8")).hexdigest()
+
+class LLMResultCache:
+    """
+    Persistent SQLite cache of LLM analysis reports.
+    Reports are keyed on the normalized content hash, model name, prompt version and
+    temperature, so changing any of them naturally misses the cache.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock() # One connection shared by all analysis workers
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_results (
+                cache_key TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                temperature REAL NOT NULL,
+                report TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_results_last_used ON llm_results (last_used_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(content: str, model: str, prompt_version: str, temperature: float) -> str:
+        return f"{content_hash(content)}:{model}:{prompt_version}:{temperature:g}"
+
+    def get(self, content: str, model: str, prompt_version: str, temperature: float) -> dict:
+        """
+        Returns the cached report, or None on a miss or an expired entry.
+        """
+        key = self.make_key(content, model, prompt_version, temperature)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT report, created_at FROM llm_results WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_results SET last_used_at = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, content: str, model: str, prompt_version: str, temperature: float, report: dict):
+        """
+        Stores a successfully parsed report. Callers must never pass error fallback reports.
+        """
+        key = self.make_key(content, model, prompt_version, temperature)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, content_hash(content), model, prompt_version, temperature,
+                 json.dumps(report, ensure_ascii=False), now, now),
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """
+        Drops expired reports, then the least recently used ones beyond `max_entries`.
+        Returns the number of reports removed.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM llm_results WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            removed = cursor.rowcount
+            cursor = self._conn.execute("""
+                DELETE FROM llm_results WHERE cache_key IN (
+                    SELECT cache_key FROM llm_results ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            removed += cursor.rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def summary(self) -> str:
+        """
+        One-line hit ratio summary for the end of a run.
+        """
+        total = self.hits + self.misses
+        hit_ratio = (self.hits / total * 100) if total else 0.0
+        return f"LLM result cache: {self.hits} hits, {self.misses} misses, {hit_ratio:.1f}% hit ratio"
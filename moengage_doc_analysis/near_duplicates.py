@@ -0,0 +1,185 @@
+# moengage-doc-analysis/moengage_doc_analysis/near_duplicates.py
+
+import hashlib
+import json
+import random
+import sqlite3
+from array import array
+
+from .llm_cache import normalize_content
+
+# --- Index defaults ---
+DEFAULT_INDEX_PATH = "near_duplicate_index.sqlite3"
+DEFAULT_THRESHOLD = 0.85   # Estimated Jaccard similarity above which two articles share one analysis
+DEFAULT_NUM_PERM = 128     # MinHash signature length
+SHINGLE_WORDS = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+
+def shingles(content: str, size: int = SHINGLE_WORDS) -> set:
+    """
+    Overlapping word n-grams of the normalized, lower-cased text.
+    """
+    words = normalize_content(content).lower().split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def choose_bands(num_perm: int, threshold: float) -> tuple:
+    """
+    Picks the LSH (bands, rows) split of the signature whose S-curve midpoint (1/b)^(1/r) is
+    closest to `threshold`, so pairs near the threshold are likely to share a bucket.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+# Representative of members whose cluster representative changed; they are re-clustered when next added
+_UNASSIGNED = ""
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index over scraped articles, stored in SQLite.
+    Every article is assigned a cluster representative: the most similar existing
+    representative above the threshold, or itself. The representative's report is stored
+    here too, so members of its cluster (in this run or later ones) can reuse it.
+    Adding a URL again replaces its signature, so the index updates incrementally.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, threshold: float = DEFAULT_THRESHOLD,
+                 num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        rng = random.Random(seed) # Fixed seed: signatures must stay comparable across runs
+        self._permutations = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                              for _ in range(num_perm)]
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                representative TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_documents_representative ON documents (representative);
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                band INTEGER NOT NULL,
+                bucket TEXT NOT NULL,
+                url TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_lsh_buckets_bucket ON lsh_buckets (band, bucket);
+            CREATE INDEX IF NOT EXISTS idx_lsh_buckets_url ON lsh_buckets (url);
+            CREATE TABLE IF NOT EXISTS representative_reports (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                report TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def signature(self, content: str) -> list:
+        hashes = [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+                  for shingle in shingles(content)]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._permutations]
+
+    def _buckets(self, signature: list):
+        for band in range(self.bands):
+            rows = array('Q', signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            yield band, hashlib.blake2b(rows, digest_size=8).hexdigest()
+
+    @staticmethod
+    def similarity(signature_a: list, signature_b: list) -> float:
+        """
+        Estimated Jaccard similarity: the share of MinHash positions that agree.
+        """
+        return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+    def add(self, url: str, content: str, content_hash: str) -> tuple:
+        """
+        Indexes (or re-indexes) one article and returns `(representative_url, similarity)`.
+        The representative is `url` itself when no existing representative is similar enough.
+        """
+        row = self._conn.execute("SELECT content_hash, representative FROM documents WHERE url = ?", (url,)).fetchone()
+        if row and row[0] == content_hash:
+            representative = row[1]
+            if representative == url:
+                return url, 1.0
+            rep_row = self._conn.execute("SELECT signature FROM documents WHERE url = ?", (representative,)).fetchone()
+            own_row = self._conn.execute("SELECT signature FROM documents WHERE url = ?", (url,)).fetchone()
+            if rep_row:
+                score = self.similarity(array('Q', own_row[0]).tolist(), array('Q', rep_row[0]).tolist())
+                if score >= self.threshold:
+                    return representative, score
+            # The representative drifted away (or is gone): look for a cluster again
+
+        signature = self.signature(content)
+        buckets = list(self._buckets(signature))
+        best_url, best_similarity = url, 1.0
+        best_candidate_similarity = 0.0
+        candidates = set()
+        for band, bucket in buckets:
+            for (candidate,) in self._conn.execute(
+                    "SELECT url FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)):
+                if candidate != url:
+                    candidates.add(candidate)
+        for candidate in candidates:
+            candidate_row = self._conn.execute(
+                "SELECT signature FROM documents WHERE url = ? AND representative = url", (candidate,)).fetchone()
+            if candidate_row is None:
+                continue # Only cluster representatives can absorb new members
+            score = self.similarity(signature, array('Q', candidate_row[0]).tolist())
+            if score >= self.threshold and score > best_candidate_similarity:
+                best_url, best_similarity, best_candidate_similarity = candidate, score, score
+
+        with self._conn:
+            self._conn.execute("DELETE FROM lsh_buckets WHERE url = ?", (url,))
+            if row and row[1] == url and (row[0] != content_hash or best_url != url):
+                # A representative whose content changed: its members must find a cluster again on their next add
+                self._conn.execute("UPDATE documents SET representative = ? WHERE representative = ? AND url != ?",
+                                   (_UNASSIGNED, url, url))
+            if row and row[0] != content_hash:
+                self._conn.execute("DELETE FROM representative_reports WHERE url = ?", (url,))
+            self._conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                               (url, content_hash, array('Q', signature).tobytes(), best_url))
+            self._conn.executemany("INSERT INTO lsh_buckets VALUES (?, ?, ?)",
+                                   [(band, bucket, url) for band, bucket in buckets])
+        return best_url, best_similarity
+
+    def store_report(self, url: str, content_hash: str, report: dict):
+        """
+        Saves a representative's analysis so its cluster members can reuse it.
+        """
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO representative_reports VALUES (?, ?, ?)",
+                               (url, content_hash, json.dumps(report, ensure_ascii=False)))
+
+    def get_report(self, url: str) -> dict:
+        """
+        Returns the stored report of representative `url` if it matches its current content.
+        """
+        row = self._conn.execute("""
+            SELECT r.report FROM representative_reports r JOIN documents d ON d.url = r.url
+            WHERE r.url = ? AND r.content_hash = d.content_hash
+        """, (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def cluster_sizes(self) -> dict:
+        """
+        Maps each representative with at least one near-duplicate to its cluster size.
+        """
+        return dict(self._conn.execute(
+            "SELECT representative, COUNT(*) FROM documents WHERE representative != ? "
+            "GROUP BY representative HAVING COUNT(*) > 1", (_UNASSIGNED,)))
+
+    def close(self):
+        self._conn.close()
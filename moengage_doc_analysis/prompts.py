@@ -0,0 +1,149 @@
+# moengage-doc-analysis/moengage_doc_analysis/prompts.py
+
+import threading
+from textwrap import dedent
+
+from .llm_cache import normalize_content
+from .instrumentation import metrics
+
+# Prompt templates by version. Cached and stored reports are keyed on the version, so add a new
+# entry (and make it LATEST_PROMPT_VERSION) whenever the wording or layout changes.
+PROMPT_TEMPLATES = {}
+
+def register_template(version: str, system: str, user: str):
+    """
+    Adds a template. The article is substituted for the literal `{content}` in `user` (other
+    braces are left alone). Both parts are dedented and stripped once here, so every request carries the
+    same byte-identical static text.
+    """
+    PROMPT_TEMPLATES[version] = {"system": dedent(system).strip(), "user": dedent(user).strip()}
+
+_CRITERIA_AND_SCHEMA = """
+    Analysis Criteria:
+    1. Readability for a Marketer:
+       - Assess the content's readability from the perspective of a non-technical marketer.
+       - Explain why it's readable or not for this persona.
+
+    2. Structure and Flow:
+       - Analyze the article's structure (headings, subheadings, paragraph length, use of lists, etc.).
+       - Does the information flow logically? Is it easy to navigate and find specific information?
+
+    3. Completeness of Information & Examples:
+       - Does the article provide enough detail for a user to understand and implement the feature or concept?
+       - Are there sufficient, clear, and relevant examples? If not, suggest where examples could be added or improved.
+
+    4. Adherence to Style Guidelines (Simplified - based on Microsoft Style Guide principles):
+       - Voice and Tone: Is it customer-focused, clear, and concise?
+       - Clarity and Conciseness: Are there overly complex sentences or jargon that could be simplified?
+       - Action-oriented language: Does it guide the user effectively?
+       - Identify areas that deviate from these principles and suggest specific changes.
+
+    Output Format (JSON):
+    {
+        "readability_for_marketer": {
+            "assessment": "Brief assessment here.",
+            "suggestions": ["Specific suggestion 1", "Specific suggestion 2"]
+        },
+        "structure_and_flow": {
+            "assessment": "Brief assessment here.",
+            "suggestions": ["Specific suggestion 1", "Specific suggestion 2"]
+        },
+        "completeness_and_examples": {
+            "assessment": "Brief assessment here.",
+            "suggestions": ["Specific suggestion 1", "Specific suggestion 2"]
+        },
+        "style_guidelines": {
+            "assessment": "Brief assessment here.",
+            "suggestions": ["Specific suggestion 1", "Specific suggestion 2"]
+        }
+    }
+"""
+
+# v1: the original layout, with the article in the middle of the instructions
+register_template("v1", system="You are a helpful AI assistant for documentation analysis.", user="""
+    You are an AI assistant specialized in improving technical documentation for marketers.
+    Analyze the following documentation article content and provide actionable suggestions for improvement based on the criteria below.
+    The output must be a JSON object with a 'assessment' string and a 'suggestions' list of strings for each criterion.
+    Suggestions should be specific and actionable, e.g., "Sentence X is too long; consider breaking it into two shorter sentences."
+
+    Article Content:
+    ---
+    {content}
+    ---
+""" + _CRITERIA_AND_SCHEMA)
+
+# v2: all static instructions in the system message so providers can serve them from their
+# prompt prefix cache; the article comes last in the user message
+register_template("v2", system="""
+    You are an AI assistant specialized in improving technical documentation for marketers.
+    Analyze the documentation article in the user message and provide actionable suggestions for improvement based on the criteria below.
+    The output must be a JSON object with a 'assessment' string and a 'suggestions' list of strings for each criterion.
+    Suggestions should be specific and actionable, e.g., "Sentence X is too long; consider breaking it into two shorter sentences."
+""" + _CRITERIA_AND_SCHEMA, user="""
+    Article Content:
+    ---
+    {content}
+    ---
+""")
+
+LATEST_PROMPT_VERSION = "v2"
+
+# Appended after the article when re-asking for criteria missing from an earlier answer; the
+# system message and article stay byte-identical, so the re-ask still hits the prefix cache
+ONLY_CRITERIA_INSTRUCTION = "Return only these keys of the output format, nothing else: {criteria}."
+
+def build_messages(content: str, version: str = LATEST_PROMPT_VERSION, only_criteria: list = None) -> list:
+    """
+    Chat messages analyzing `content` with the given template version. The article text is
+    whitespace-normalized (see `llm_cache.normalize_content`), which also shrinks the payload.
+    With `only_criteria`, the model is asked for just those keys of the output format.
+    """
+    template = PROMPT_TEMPLATES[version]
+    content = normalize_content(content)
+    user = template["user"].replace("{content}", content)
+    if only_criteria:
+        user += "\n\n" + ONLY_CRITERIA_INSTRUCTION.replace("{criteria}", ", ".join(only_criteria))
+    return [{"role": "system", "content": template["system"]}, {"role": "user", "content": user}]
+
+class TokenUsage:
+    """
+    Thread-safe totals of the token usage reported by the provider, including prompt tokens
+    served from its prefix cache, to measure what the prompt layout saves per run. Totals also go to
+    the run metrics unless `add_to_metrics` is False (for a second, narrower tally of the same responses).
+    """
+
+    def __init__(self, add_to_metrics: bool = True):
+        self.add_to_metrics = add_to_metrics
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.total_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage):
+        """
+        Adds one response's `usage`, given as the SDK object or the plain dict found in batch output.
+        """
+        if usage is None:
+            return
+        if not isinstance(usage, dict):
+            usage = usage.model_dump()
+        details = usage.get("prompt_tokens_details") or {}
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += usage.get("prompt_tokens") or 0
+            self.cached_tokens += details.get("cached_tokens") or 0
+            self.completion_tokens += usage.get("completion_tokens") or 0
+            self.total_tokens += usage.get("total_tokens") or 0
+        if not self.add_to_metrics:
+            return
+        metrics.add("llm_prompt_tokens", usage.get("prompt_tokens") or 0)
+        metrics.add("llm_cached_prompt_tokens", details.get("cached_tokens") or 0)
+        metrics.add("llm_completion_tokens", usage.get("completion_tokens") or 0)
+
+    def summary(self) -> str:
+        cached_ratio = self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+        return (f"Token usage: {self.requests} responses, {self.prompt_tokens} prompt tokens "
+                f"({self.cached_tokens} cached, {cached_ratio:.1%}), {self.completion_tokens} completion tokens, "
+                f"{self.total_tokens} total")
@@ -0,0 +1,137 @@
+# moengage-doc-analysis/moengage_doc_analysis/rate_limiter.py
+
+import random
+import threading
+import time
+
+from .instrumentation import metrics
+
+# --- Retry defaults ---
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_BACKOFF_CAP_SECONDS = 60.0
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: holds up to `capacity` tokens and refills continuously
+    at `refill_per_second`. `acquire` blocks until enough tokens are available.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    def acquire(self, amount: float = 1.0):
+        # A single request larger than the whole bucket would wait forever; cap it at capacity
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait_seconds = (amount - self._tokens) / self.refill_per_second
+            time.sleep(wait_seconds)
+
+    def adjust(self, amount: float):
+        """
+        Takes `amount` more tokens (or returns them if negative) without waiting. The bucket
+        may go into debt, which later `acquire` calls wait out.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+class RateLimiter:
+    """
+    Enforces both a requests-per-minute and a tokens-per-minute budget.
+    Either budget can be disabled by passing None or 0.
+    """
+
+    def __init__(self, requests_per_minute: float = None, tokens_per_minute: float = None):
+        self.request_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60) if tokens_per_minute else None
+
+    def acquire(self, estimated_tokens: int):
+        if self.request_bucket:
+            self.request_bucket.acquire(1)
+        if self.token_bucket:
+            self.token_bucket.acquire(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int):
+        """
+        Corrects the tokens-per-minute budget once a response reports its `usage.total_tokens`:
+        debits what the estimate given to `acquire` missed, or refunds what it over-charged.
+        """
+        if self.token_bucket and actual_tokens is not None:
+            self.token_bucket.adjust(actual_tokens - min(estimated_tokens, self.token_bucket.capacity))
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Rate limits (429), server errors (5xx), timeouts and dropped connections are worth retrying.
+    """
+    import openai # Deferred: only needed once the client has raised, by which point it is loaded
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+def retry_after_seconds(error: Exception):
+    """
+    Reads the server's Retry-After hint (retry-after-ms or retry-after in seconds), if any.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass # An HTTP-date Retry-After falls back to exponential backoff
+    return None
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF_BASE_SECONDS,
+                  cap: float = DEFAULT_BACKOFF_CAP_SECONDS) -> float:
+    """
+    Exponential backoff with full jitter for the given 0-based retry attempt.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def call_with_retries(make_request, max_retries: int = DEFAULT_MAX_RETRIES,
+                      limiter: RateLimiter = None, estimated_tokens: int = 0):
+    """
+    Calls `make_request()` after taking budget from `limiter`, retrying retryable errors
+    up to `max_retries` times. The server's Retry-After is honored when present, otherwise
+    the wait is exponential backoff with jitter. Non-retryable errors are raised immediately.
+    """
+    attempt = 0
+    while True:
+        if limiter:
+            limiter.acquire(estimated_tokens)
+        metrics.add("llm_requests")
+        try:
+            return make_request()
+        except Exception as e:
+            metrics.add("llm_errors")
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            metrics.add("llm_retries")
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = backoff_delay(attempt)
+            else:
+                delay += random.uniform(0, DEFAULT_BACKOFF_BASE_SECONDS) # Spread out workers woken by the same hint
+            print(f"Retryable LLM error ({e.__class__.__name__}), retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            attempt += 1
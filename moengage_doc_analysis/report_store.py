@@ -0,0 +1,315 @@
+# moengage-doc-analysis/moengage_doc_analysis/report_store.py
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from .jsonl_stream import iter_jsonl
+
+# --- Store defaults ---
+DEFAULT_REPORT_STORE_PATH = "analysis_reports.sqlite3"
+FETCH_BATCH_SIZE = 500 # Rows read per round trip; queries never hold more than this many reports in memory
+
+# Record fields with their own column; everything else except the criteria goes into `extra`
+_COLUMNS = ("url", "content_hash", "analyzed_with")
+
+def new_run_id() -> str:
+    """
+    Sortable run id: start time plus a short random suffix.
+    """
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+def is_criterion(value) -> bool:
+    return isinstance(value, dict) and "assessment" in value
+
+def parse_time(value: str) -> float:
+    """
+    Epoch seconds for an ISO date/time ("2024-05-01", "2024-05-01T12:00") or an age such as "7d" or "12h".
+    """
+    units = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+    if value[-1:] in units and value[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    return datetime.fromisoformat(value).timestamp()
+
+class ReportStore:
+    """
+    Append-only SQLite store of analysis reports across runs. Each report is one row tagged with
+    its run id, and each of its criteria is one row in `criteria` with the suggestion count broken
+    out, so questions like "articles with structure suggestions since last week" are answered from
+    indexes instead of loading every report. Rows are never updated or deleted; the latest report
+    of a URL is simply the one with the highest id.
+    """
+
+    def __init__(self, path: str = DEFAULT_REPORT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL") # Readers (dashboards) do not block the writing run
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                description TEXT
+            );
+            CREATE TABLE IF NOT EXISTS reports (
+                report_id INTEGER PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content_hash TEXT,
+                analyzed_with TEXT,
+                succeeded INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                extra TEXT
+            );
+            CREATE TABLE IF NOT EXISTS criteria (
+                report_id INTEGER NOT NULL,
+                criterion TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                assessment TEXT,
+                suggestion_count INTEGER NOT NULL,
+                suggestions TEXT NOT NULL,
+                PRIMARY KEY (report_id, criterion)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_reports_url ON reports (url, report_id);
+            CREATE INDEX IF NOT EXISTS idx_reports_content_hash ON reports (content_hash);
+            CREATE INDEX IF NOT EXISTS idx_reports_run ON reports (run_id, url);
+            CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at);
+            CREATE INDEX IF NOT EXISTS idx_criteria_criterion ON criteria (criterion, suggestion_count, report_id);
+        """)
+        self._conn.commit()
+
+    def start_run(self, run_id: str = None, description: str = None) -> str:
+        """
+        Registers a run (or re-opens an existing one when resuming) and returns its id.
+        """
+        run_id = run_id or new_run_id()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO runs VALUES (?, ?, ?)", (run_id, time.time(), description))
+        return run_id
+
+    def add(self, record: dict, run_id: str, succeeded: bool = True, created_at: float = None):
+        """
+        Appends one final report record (as written by analysis.py) to `run_id`.
+        """
+        extra = {key: value for key, value in record.items() if key not in _COLUMNS and not is_criterion(value)}
+        criteria = [(criterion, position, value.get("assessment"), len(value.get("suggestions") or []),
+                     json.dumps(value.get("suggestions") or [], ensure_ascii=False, separators=(",", ":")))
+                    for position, (criterion, value) in enumerate(
+                        (key, value) for key, value in record.items() if is_criterion(value))]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO reports (run_id, url, content_hash, analyzed_with, succeeded, created_at, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, record["url"], record.get("content_hash"), record.get("analyzed_with"), int(succeeded),
+                 created_at or time.time(),
+                 json.dumps(extra, ensure_ascii=False, separators=(",", ":")) if extra else None))
+            self._conn.executemany("INSERT INTO criteria VALUES (?, ?, ?, ?, ?, ?)",
+                                   [(cursor.lastrowid, *row) for row in criteria])
+
+    def _iter_rows(self, sql: str, params: list):
+        # The connection is shared by worker threads: hold the lock for the execute and each batch,
+        # but not between batches, so a slow consumer does not block writers
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+            if not rows:
+                return
+            yield rows
+
+    def _records(self, sql: str, params: list):
+        for rows in self._iter_rows(sql, params):
+            placeholders = ",".join("?" * len(rows))
+            criteria = {}
+            with self._lock:
+                for report_id, criterion, assessment, suggestions in self._conn.execute(
+                        f"SELECT report_id, criterion, assessment, suggestions FROM criteria "
+                        f"WHERE report_id IN ({placeholders}) ORDER BY report_id, position", [row[0] for row in rows]):
+                    criteria.setdefault(report_id, {})[criterion] = {"assessment": assessment,
+                                                                     "suggestions": json.loads(suggestions)}
+            for report_id, run_id, url, hash_value, model, succeeded, created_at, extra in rows:
+                record = {"url": url, "content_hash": hash_value, "analyzed_with": model}
+                record.update(json.loads(extra) if extra else {})
+                record.update(criteria.get(report_id, {}))
+                record.update({"run_id": run_id, "succeeded": bool(succeeded), "stored_at": created_at})
+                yield record
+
+    def query(self, url: str = None, content_hash: str = None, run_id: str = None, criterion: str = None,
+              with_suggestions: bool = False, since: float = None, until: float = None,
+              latest: bool = False, include_failed: bool = False, limit: int = None):
+        """
+        Yields stored report records matching every given filter, oldest first, reading them in
+        batches of FETCH_BATCH_SIZE. `criterion` and `with_suggestions` keep reports that have that
+        criterion (any criterion if not given) with at least one suggestion; `latest` keeps only
+        each URL's most recent matching report; `since`/`until` are epoch seconds.
+        """
+        conditions, params = [], []
+        for column, value in (("url", url), ("content_hash", content_hash), ("run_id", run_id)):
+            if value is not None:
+                conditions.append(f"r.{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("r.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("r.created_at < ?")
+            params.append(until)
+        if not include_failed:
+            conditions.append("r.succeeded = 1")
+        if criterion is not None or with_suggestions:
+            criterion_conditions = ["c.report_id = r.report_id"]
+            if criterion is not None:
+                criterion_conditions.append("c.criterion = ?")
+                params.append(criterion)
+            if with_suggestions:
+                criterion_conditions.append("c.suggestion_count > 0")
+            conditions.append(f"EXISTS (SELECT 1 FROM criteria c WHERE {' AND '.join(criterion_conditions)})")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT r.report_id FROM reports r {where}"
+        if latest:
+            sql = f"SELECT MAX(r.report_id) FROM reports r {where} GROUP BY r.url"
+        sql = (f"SELECT report_id, run_id, url, content_hash, analyzed_with, succeeded, created_at, extra "
+               f"FROM reports WHERE report_id IN ({sql}) ORDER BY report_id")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        yield from self._records(sql, params)
+
+    def runs(self) -> list:
+        """
+        Every run with its report counts, oldest first.
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT runs.run_id, runs.started_at, runs.description, COUNT(reports.report_id),
+                       COALESCE(SUM(reports.succeeded), 0)
+                FROM runs LEFT JOIN reports ON reports.run_id = runs.run_id
+                GROUP BY runs.run_id ORDER BY runs.started_at
+            """).fetchall()
+        return [{"run_id": run_id, "started_at": started_at, "description": description,
+                 "reports": count, "succeeded": succeeded}
+                for run_id, started_at, description, count, succeeded in rows]
+
+    def _run_summaries(self, run_id: str):
+        # Latest report per URL in the run, with suggestion counts per criterion, in URL order
+        sql = """
+            SELECT r.url, r.content_hash, r.succeeded,
+                   (SELECT json_group_object(c.criterion, c.suggestion_count) FROM criteria c
+                    WHERE c.report_id = r.report_id)
+            FROM reports r
+            WHERE r.report_id IN (SELECT MAX(report_id) FROM reports WHERE run_id = ? GROUP BY url)
+            ORDER BY r.url
+        """
+        for rows in self._iter_rows(sql, [run_id]):
+            for url, hash_value, succeeded, counts in rows:
+                yield url, {"content_hash": hash_value, "succeeded": bool(succeeded),
+                            "suggestions": json.loads(counts) if counts else {}}
+
+    def diff(self, old_run_id: str, new_run_id: str):
+        """
+        Yields one entry per URL that differs between two runs: added, removed, content changed,
+        or the same content with different success or suggestion counts. Both runs are streamed in
+        URL order and merged, so memory stays constant however many articles they cover.
+        """
+        old_iter, new_iter = self._run_summaries(old_run_id), self._run_summaries(new_run_id)
+        old, new = next(old_iter, None), next(new_iter, None)
+        while old or new:
+            if new is None or (old is not None and old[0] < new[0]):
+                yield {"url": old[0], "change": "removed", "old": old[1]}
+                old = next(old_iter, None)
+            elif old is None or new[0] < old[0]:
+                yield {"url": new[0], "change": "added", "new": new[1]}
+                new = next(new_iter, None)
+            else:
+                if old[1]["content_hash"] != new[1]["content_hash"]:
+                    yield {"url": old[0], "change": "content_changed", "old": old[1], "new": new[1]}
+                elif old[1] != new[1]:
+                    yield {"url": old[0], "change": "report_changed", "old": old[1], "new": new[1]}
+                old, new = next(old_iter, None), next(new_iter, None)
+
+    def import_reports(self, path: str, run_id: str = None) -> tuple:
+        """
+        Loads an existing reports file (.jsonl, or a legacy .json list) into the store as one run.
+        Returns `(run_id, number of reports)`.
+        """
+        from .analysis import is_fallback_report # Deferred: only needed for backfills
+
+        run_id = self.start_run(run_id, f"imported from {os.path.basename(path)}")
+        if path.endswith(".json"):
+            with open(path, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+        else:
+            records = iter_jsonl(path)
+        created_at = os.path.getmtime(path)
+        count = 0
+        for record in records:
+            self.add(record, run_id, "error" not in record and not is_fallback_report(record), created_at)
+            count += 1
+        return run_id, count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def main(argv: list = None):
+    """
+    Command-line entry point (`python -m moengage_doc_analysis reports`).
+    """
+    parser = argparse.ArgumentParser(description="Query the analysis report store.")
+    parser.add_argument("--store", default=os.getenv("REPORT_STORE_PATH", DEFAULT_REPORT_STORE_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("runs", help="List runs with their report counts")
+    query_parser = commands.add_parser("query", help="Print matching reports as JSON lines")
+    query_parser.add_argument("--url")
+    query_parser.add_argument("--content-hash")
+    query_parser.add_argument("--run-id")
+    query_parser.add_argument("--criterion", help="e.g. structure_and_flow")
+    query_parser.add_argument("--with-suggestions", action="store_true",
+                              help="Only reports with suggestions (for --criterion, if given)")
+    query_parser.add_argument("--since", help="ISO date/time or an age such as 7d, 12h")
+    query_parser.add_argument("--until", help="ISO date/time or an age such as 7d, 12h")
+    query_parser.add_argument("--latest", action="store_true", help="Only the most recent matching report per URL")
+    query_parser.add_argument("--include-failed", action="store_true", help="Also return failed analyses")
+    query_parser.add_argument("--limit", type=int)
+    query_parser.add_argument("--count", action="store_true", help="Print only the number of matching reports")
+    diff_parser = commands.add_parser("diff", help="Print per-URL differences between two runs as JSON lines")
+    diff_parser.add_argument("old_run_id")
+    diff_parser.add_argument("new_run_id")
+    import_parser = commands.add_parser("import", help="Load an existing reports file (.jsonl or .json) as a run")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--run-id")
+    args = parser.parse_args(argv)
+
+    store = ReportStore(args.store)
+    if args.command == "runs":
+        for run in store.runs():
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started_at"]))
+            print(f"{run['run_id']}  {started}  {run['succeeded']}/{run['reports']} succeeded"
+                  f"{'  ' + run['description'] if run['description'] else ''}")
+    elif args.command == "query":
+        records = store.query(url=args.url, content_hash=args.content_hash, run_id=args.run_id,
+                              criterion=args.criterion, with_suggestions=args.with_suggestions,
+                              since=parse_time(args.since) if args.since else None,
+                              until=parse_time(args.until) if args.until else None,
+                              latest=args.latest, include_failed=args.include_failed, limit=args.limit)
+        if args.count:
+            print(sum(1 for _ in records))
+        else:
+            for record in records:
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    elif args.command == "diff":
+        for entry in store.diff(args.old_run_id, args.new_run_id):
+            sys.stdout.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    else:
+        run_id, count = store.import_reports(args.path, args.run_id)
+        print(f"Imported {count} reports from {args.path} as run {run_id}")
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# moengage-doc-analysis/moengage_doc_analysis/routing.py
+
+import json
+import threading
+from collections import Counter
+
+from .chunking import count_tokens
+from .instrumentation import metrics
+from .prompts import TokenUsage
+
+CRITERIA = ("readability_for_marketer", "structure_and_flow", "completeness_and_examples", "style_guidelines")
+
+# --- Escalation thresholds ---
+# Articles over any of these limits skip the cheap tier and go straight to the large model
+DEFAULT_ROUTING_THRESHOLDS = {
+    "max_cheap_tokens": 2500,        # Long articles need more context handling than small models do well
+    "max_cheap_grade": 14.0,         # Flesch-Kincaid grade; dense technical text
+    "max_cheap_sections": 15,        # Headings; many sections mean more structure to assess
+    "min_cheap_suggestions": 1,      # A cheap answer with fewer suggestions in total is escalated
+}
+
+# USD per million tokens; LLM_PRICES_FILE (JSON in the same shape) adds or overrides models
+DEFAULT_PRICES = {
+    "gpt-4o": {"prompt": 2.50, "cached_prompt": 1.25, "completion": 10.00},
+    "gpt-4o-mini": {"prompt": 0.15, "cached_prompt": 0.075, "completion": 0.60},
+}
+
+def validate_criterion(criterion: str, value) -> list:
+    """
+    Schema problems of one criterion: it must be an object with a non-empty `assessment`
+    string and a `suggestions` list of strings. An empty list means it is valid.
+    """
+    if not isinstance(value, dict):
+        return [f"{criterion} missing"]
+    problems = []
+    if not isinstance(value.get("assessment"), str) or not value["assessment"].strip():
+        problems.append(f"{criterion}.assessment missing")
+    suggestions = value.get("suggestions")
+    if not isinstance(suggestions, list) or not all(isinstance(item, str) for item in suggestions):
+        problems.append(f"{criterion}.suggestions is not a list of strings")
+    return problems
+
+def validate_report(report: dict) -> list:
+    """
+    Schema problems of an LLM report (see `validate_criterion`). An empty list means the report is valid.
+    """
+    if not isinstance(report, dict):
+        return ["report is not a JSON object"]
+    return [problem for criterion in CRITERIA for problem in validate_criterion(criterion, report.get(criterion))]
+
+def suggestion_count(report: dict) -> int:
+    return sum(len(report[criterion].get("suggestions") or []) for criterion in CRITERIA
+               if isinstance(report.get(criterion), dict))
+
+def direct_route_reason(content: str, text_metrics: dict, llm_model_name: str, thresholds: dict = None) -> str:
+    """
+    Why `content` should skip the cheap tier ("size" or "complexity"), or None if the cheap model may try it.
+    `text_metrics` come from text_metrics.compute_text_metrics.
+    """
+    thresholds = {**DEFAULT_ROUTING_THRESHOLDS, **(thresholds or {})}
+    if count_tokens(content, llm_model_name) > thresholds["max_cheap_tokens"]:
+        return "size"
+    if (text_metrics["flesch_kincaid_grade"] > thresholds["max_cheap_grade"]
+            or text_metrics["heading_count"] > thresholds["max_cheap_sections"]):
+        return "complexity"
+    return None
+
+def load_prices(path: str = None) -> dict:
+    prices = {model: dict(price) for model, price in DEFAULT_PRICES.items()}
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            prices.update(json.load(f))
+    return prices
+
+class TierStats:
+    """
+    Thread-safe per-tier accounting for tiered routing: articles answered, latency, token usage
+    and estimated cost per tier, plus how often and why articles went to the large model.
+    Used to tune DEFAULT_ROUTING_THRESHOLDS against real runs.
+    """
+
+    def __init__(self, prices: dict = None):
+        self.prices = prices if prices is not None else load_prices()
+        self.usage = {}       # tier -> TokenUsage
+        self.latencies = {}   # tier -> [seconds]
+        self.models = {}      # tier -> model
+        self.cheap_attempts = 0
+        self.escalations = Counter()   # reason -> count, for answers from the cheap tier that were rejected
+        self.direct = Counter()        # reason -> count, for articles sent straight to the large tier
+        self._lock = threading.Lock()
+
+    def tier_usage(self, tier: str, llm_model_name: str) -> TokenUsage:
+        """
+        The TokenUsage collecting `tier`'s responses (pass it as `usage` to the analysis call).
+        """
+        with self._lock:
+            self.models[tier] = llm_model_name
+            return self.usage.setdefault(tier, TokenUsage(add_to_metrics=False))
+
+    def record_call(self, tier: str, seconds: float):
+        with self._lock:
+            self.latencies.setdefault(tier, []).append(seconds)
+            if tier == "cheap":
+                self.cheap_attempts += 1
+        metrics.observe(f"llm_tier_{tier}", seconds)
+
+    def record_escalation(self, reason: str):
+        with self._lock:
+            self.escalations[reason] += 1
+        metrics.add(f"route_escalations_{reason}")
+
+    def record_direct(self, reason: str):
+        with self._lock:
+            self.direct[reason] += 1
+        metrics.add(f"route_direct_{reason}")
+
+    def cost(self, tier: str) -> float:
+        usage, price = self.usage.get(tier), self.prices.get(self.models.get(tier))
+        if usage is None or price is None:
+            return 0.0
+        uncached = usage.prompt_tokens - usage.cached_tokens
+        return (uncached * price["prompt"] + usage.cached_tokens * price["cached_prompt"]
+                + usage.completion_tokens * price["completion"]) / 1_000_000
+
+    def to_json(self) -> dict:
+        with self._lock:
+            tiers = {}
+            for tier, latencies in self.latencies.items():
+                ordered = sorted(latencies)
+                usage = self.usage.get(tier)
+                tiers[tier] = {
+                    "model": self.models.get(tier),
+                    "calls": len(ordered),
+                    "p50_seconds": round(ordered[len(ordered) // 2], 3),
+                    "p95_seconds": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+                    "mean_seconds": round(sum(ordered) / len(ordered), 3),
+                    "prompt_tokens": usage.prompt_tokens if usage else 0,
+                    "completion_tokens": usage.completion_tokens if usage else 0,
+                }
+            escalated = sum(self.escalations.values())
+            summary = {
+                "tiers": tiers,
+                "cheap_attempts": self.cheap_attempts,
+                "escalations": dict(self.escalations),
+                "escalation_rate": round(escalated / self.cheap_attempts, 3) if self.cheap_attempts else 0.0,
+                "direct_to_large": dict(self.direct),
+            }
+        for tier, entry in summary["tiers"].items():
+            entry["cost_usd"] = round(self.cost(tier), 6)
+        return summary
+
+    def summary(self) -> str:
+        data = self.to_json()
+        lines = [f"Tiered routing: {data['cheap_attempts']} articles tried on the cheap tier, "
+                 f"{sum(data['escalations'].values())} escalated ({data['escalation_rate']:.1%}: "
+                 f"{', '.join(f'{reason} {count}' for reason, count in data['escalations'].items()) or 'none'}), "
+                 f"{sum(data['direct_to_large'].values())} sent straight to the large tier"]
+        for tier, entry in data["tiers"].items():
+            lines.append(f"  {tier} ({entry['model']}): {entry['calls']} calls, p50 {entry['p50_seconds']:.2f} s, "
+                         f"p95 {entry['p95_seconds']:.2f} s, {entry['prompt_tokens']} prompt + "
+                         f"{entry['completion_tokens']} completion tokens, ${entry['cost_usd']:.4f}")
+        return "\n".join(lines)
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f, indent=2)
@@ -0,0 +1,50 @@
+# moengage-doc-analysis/moengage_doc_analysis/run_journal.py
+
+import os
+
+from .jsonl_stream import iter_jsonl, JsonlWriter
+from .llm_cache import content_hash
+
+# --- Journal defaults ---
+DEFAULT_JOURNAL_FILE = "analysis_run_journal.jsonl"
+
+class RunJournal:
+    """
+    Append-only record of which URLs an analysis run has finished, and for which content.
+    A restarted run skips articles whose last entry succeeded with the same content hash,
+    and retries articles that failed or whose content changed since.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_FILE):
+        self.path = path
+        self.skipped = 0
+        self._entries = {}
+        if os.path.exists(path):
+            for entry in iter_jsonl(path):
+                self._entries[entry["url"]] = entry # Later entries supersede earlier ones
+        self._writer = JsonlWriter(path, append=True, durable=True)
+
+    def is_done(self, url: str, content: str) -> bool:
+        entry = self._entries.get(url)
+        return bool(content) and entry is not None and entry["status"] == "ok" \
+            and entry["content_hash"] == content_hash(content)
+
+    def pending(self, articles):
+        """
+        Yields only the articles that still need analysis, counting the ones skipped.
+        Articles without scraped content are always yielded, since their hash is unknown until fetched.
+        """
+        for article_data in articles:
+            if self.is_done(article_data["url"], article_data.get("content")):
+                self.skipped += 1
+                print(f"Skipping {article_data['url']}: already analyzed with unchanged content.")
+                continue
+            yield article_data
+
+    def record(self, url: str, content_hash_value: str, succeeded: bool):
+        entry = {"url": url, "content_hash": content_hash_value, "status": "ok" if succeeded else "failed"}
+        self._writer.write(entry)
+        self._entries[url] = entry
+
+    def close(self):
+        self._writer.close()
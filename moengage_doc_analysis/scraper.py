@@ -0,0 +1,333 @@
+# moengage-doc-analysis/moengage_doc_analysis/scraper.py
+
+import argparse
+import contextlib
+import multiprocessing
+import requests
+from requests.adapters import HTTPAdapter
+import os
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
+from .extraction import extract_main_text, parse_html_bytes, DEFAULT_BACKEND
+from .http_cache import HttpCache, DEFAULT_CACHE_DIR
+from .jsonl_stream import JsonlWriter
+from .instrumentation import metrics, profile_call
+
+# --- Batch fetching defaults ---
+DEFAULT_MAX_CONCURRENCY = 8 # Total number of articles being fetched at once
+DEFAULT_PER_HOST_LIMIT = 2  # Keep it polite: at most this many open requests per help center
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 1 # Processes in the parse stage of fetch_articles_pipelined
+DEFAULT_PARSE_QUEUE_SIZE = 32 # Downloaded pages allowed to wait for a parse worker
+
+# One JSON record per line, so both stages can stream instead of holding the whole crawl in memory
+DEFAULT_OUTPUT_FILE = "extracted_articles.jsonl"
+
+def create_session(max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                   per_host_limit: int = DEFAULT_PER_HOST_LIMIT) -> requests.Session:
+    """
+    Creates a requests Session backed by a keep-alive connection pool.
+    Reusing the session across articles avoids a fresh TCP+TLS handshake per URL.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max(per_host_limit, 1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def download_article(url: str, session: requests.Session = None, cache: HttpCache = None):
+    """
+    Network half of `fetch_article_content`. Returns a `(content, response)` pair:
+    `(cached_text, None)` when the cache answered with a 304, `(None, response)` for a fresh
+    page that still needs parsing, and `("", None)` when the request failed.
+    """
+    try:
+        http = session or requests
+        cached_entry = cache.get(url) if cache else None
+        start = time.perf_counter()
+        response = http.get(url, headers=HttpCache.conditional_headers(cached_entry), timeout=10) # Added timeout for robustness
+        if metrics.enabled:
+            # `elapsed` stops at the response headers, so it covers DNS/TCP/TLS setup and server time
+            headers_seconds = response.elapsed.total_seconds()
+            metrics.observe("fetch", headers_seconds)
+            metrics.observe("download", max(0.0, time.perf_counter() - start - headers_seconds))
+            metrics.add("http_requests")
+            metrics.add("bytes_fetched", len(response.content))
+        if cached_entry and response.status_code == 304:
+            # Unchanged since the last crawl: reuse the stored text and skip parsing entirely
+            metrics.add("http_cache_hits")
+            return cache.record_hit(url, cached_entry), None
+        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
+        return None, response
+
+    except requests.exceptions.Timeout:
+        print(f"Error fetching URL {url}: Request timed out.")
+        metrics.add("http_errors")
+        if cache:
+            cache.record_error()
+        return "", None
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching URL {url}: {e}")
+        metrics.add("http_errors")
+        if cache:
+            cache.record_error()
+        return "", None
+
+def fetch_article_content(url: str, session: requests.Session = None, cache: HttpCache = None,
+                          backend: str = DEFAULT_BACKEND) -> str:
+    """
+    Fetches and parses the main content from a given URL.
+    This function tries to extract the most relevant text content.
+    Pass a shared `session` to reuse pooled connections across calls, and an `HttpCache`
+    to revalidate previously seen pages with a conditional GET instead of re-downloading them.
+    `backend` selects the HTML parser (see extraction.EXTRACTION_BACKENDS).
+    """
+    content, response = download_article(url, session, cache)
+    if response is None:
+        return content
+    try:
+        with metrics.timer("parse"):
+            text = extract_main_text(response.text, url, backend)
+    except Exception as e:
+        print(f"Error parsing content from {url}: {e}")
+        text = "" # Still a full download: counted as a miss, but nothing is cached
+    if cache:
+        cache.store(url, response, text)
+    return text
+
+def article_record(url: str, content: str) -> dict:
+    """
+    Builds the per-article record written to the extraction output file.
+    """
+    if content:
+        return {"url": url, "content": content}
+    return {"url": url, "content": None, "error": "Content extraction failed"}
+
+def _run_per_host(urls, task, max_concurrency: int, per_host_limit: int):
+    """
+    Runs `task(url)` on a thread pool with at most `max_concurrency` calls in flight overall and
+    at most `per_host_limit` per host, yielding `(url, result)` pairs as they complete.
+    New URLs are only started while the caller is consuming results, which gives backpressure.
+    """
+    max_concurrency = max(1, max_concurrency)
+    per_host_limit = max(1, per_host_limit)
+
+    # Queue URLs per host so one slow help center cannot starve the others
+    pending_by_host = defaultdict(deque)
+    for url in urls:
+        pending_by_host[urlsplit(url).netloc].append(url)
+    in_flight_by_host = defaultdict(int)
+    running = {}
+
+    def submit_ready(executor):
+        # Round-robin over hosts that still have queued URLs and spare per-host capacity
+        progressed = True
+        while progressed and len(running) < max_concurrency:
+            progressed = False
+            for host, host_queue in list(pending_by_host.items()):
+                if len(running) >= max_concurrency:
+                    break
+                if not host_queue or in_flight_by_host[host] >= per_host_limit:
+                    continue
+                url = host_queue.popleft()
+                in_flight_by_host[host] += 1
+                running[executor.submit(task, url)] = (host, url)
+                progressed = True
+                if not host_queue:
+                    del pending_by_host[host]
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        submit_ready(executor)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                host, url = running.pop(future)
+                in_flight_by_host[host] -= 1
+                yield url, future.result()
+            submit_ready(executor)
+
+def fetch_articles(urls, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                   per_host_limit: int = DEFAULT_PER_HOST_LIMIT, session: requests.Session = None,
+                   cache: HttpCache = None, backend: str = DEFAULT_BACKEND):
+    """
+    Fetches many articles concurrently over a shared keep-alive connection pool.
+    At most `max_concurrency` requests are in flight overall and at most `per_host_limit`
+    per host. Yields one `article_record` dict per URL as soon as it finishes, so the
+    order of results follows completion rather than the input order.
+    An optional `HttpCache` is shared by all workers for conditional re-fetches.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = create_session(max_concurrency, per_host_limit)
+    try:
+        for url, content in _run_per_host(urls, lambda url: fetch_article_content(url, session, cache, backend),
+                                          max_concurrency, per_host_limit):
+            yield article_record(url, content)
+    finally:
+        if owns_session:
+            session.close()
+
+_END_OF_DOWNLOADS = object()
+
+def _parse_timed(url: str, raw: bytes, encoding: str, backend: str) -> tuple:
+    # Runs in a parse worker process, whose metrics are not shared: report the time with the text
+    start = time.perf_counter()
+    return parse_html_bytes(url, raw, encoding, backend), time.perf_counter() - start
+
+def _parse_worker_context():
+    # Parse workers start on demand while the download thread is running; a plain fork would copy
+    # locks it holds (connection pool, queue) into the child, so workers come from a clean process
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def fetch_articles_pipelined(urls, parse_workers: int = DEFAULT_PARSE_WORKERS,
+                             max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                             per_host_limit: int = DEFAULT_PER_HOST_LIMIT, queue_size: int = DEFAULT_PARSE_QUEUE_SIZE,
+                             session: requests.Session = None, cache: HttpCache = None,
+                             backend: str = DEFAULT_BACKEND):
+    """
+    Like `fetch_articles`, but with network I/O and HTML parsing in separate stages.
+    Download threads hand raw HTML bytes to a pool of `parse_workers` processes, so parsing
+    uses every core instead of contending for the GIL. Both hand-offs are bounded by
+    `queue_size`: when parsing falls behind, downloads pause rather than piling up in memory.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = create_session(max_concurrency, per_host_limit)
+    queue_size = max(1, queue_size)
+    raw_pages = queue.Queue(maxsize=queue_size)
+    stop_downloading = threading.Event()
+
+    def download_stage():
+        try:
+            for url, result in _run_per_host(urls, lambda url: download_article(url, session, cache),
+                                             max_concurrency, per_host_limit):
+                if stop_downloading.is_set():
+                    break
+                raw_pages.put((url, result)) # Blocks while the parse stage is saturated
+        except Exception as e:
+            raw_pages.put((None, e))
+        finally:
+            raw_pages.put(_END_OF_DOWNLOADS)
+
+    downloader = threading.Thread(target=download_stage, name="download-stage", daemon=True)
+    downloader.start()
+    parsing = {}
+    downloads_finished = False
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, parse_workers), mp_context=_parse_worker_context()) as parse_pool:
+            while not downloads_finished or parsing:
+                # Move downloaded pages into the parse pool while it has spare capacity
+                while not downloads_finished and len(parsing) < queue_size:
+                    try:
+                        item = raw_pages.get(block=not parsing, timeout=None if not parsing else 0.05)
+                    except queue.Empty:
+                        break
+                    if item is _END_OF_DOWNLOADS:
+                        downloads_finished = True
+                        break
+                    url, result = item
+                    if url is None:
+                        raise result # The download stage itself failed
+                    content, response = result
+                    if response is None:
+                        yield article_record(url, content) # Cache hit or failed download: nothing to parse
+                        continue
+                    future = parse_pool.submit(_parse_timed, url, response.content, response.encoding, backend)
+                    parsing[future] = (url, response)
+                if parsing:
+                    done, _ = wait(parsing, timeout=None if downloads_finished else 0.05,
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        url, response = parsing.pop(future)
+                        text, parse_seconds = future.result()
+                        metrics.observe("parse", parse_seconds)
+                        if cache:
+                            cache.store(url, response, text)
+                        yield article_record(url, text)
+    finally:
+        stop_downloading.set()
+        while downloader.is_alive():
+            # Drain so a download thread blocked on a full queue can see the stop flag
+            try:
+                raw_pages.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        if owns_session:
+            session.close()
+
+def main(argv: list = None):
+    """
+    Command-line entry point (`python -m moengage_doc_analysis scrape`).
+    """
+    parser = argparse.ArgumentParser(description="Fetch MoEngage documentation articles and extract their text.")
+    parser.add_argument("urls", nargs="*", help="Article URLs to scrape (defaults to the built-in list)")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_FILE,
+                        help="Newline-delimited JSON output file, or '-' to stream records to stdout")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Write per-stage timers and counters at the end (.prom for Prometheus text, else JSON)")
+    parser.add_argument("--profile", metavar="URL", help="Profile fetching this one article and exit")
+    parser.add_argument("--profiler", choices=("cprofile", "pyinstrument"), default="cprofile")
+    parser.add_argument("--profile-output", help="cProfile stats file or pyinstrument HTML file to save")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        content = profile_call(fetch_article_content, args.profile, profiler=args.profiler, output=args.profile_output)
+        print(f"Extracted {len(content)} characters from {args.profile}")
+        return
+    if args.metrics:
+        metrics.enable()
+
+    # When streaming records to stdout, progress messages go to stderr so the pipe stays clean
+    with JsonlWriter(args.output) as writer, \
+            contextlib.redirect_stdout(sys.stderr if args.output == "-" else sys.stdout):
+        print("--- Scraper Script: Fetching and Extracting Article Content ---")
+
+        # List of MoEngage documentation URLs to scrape
+        urls_to_scrape = args.urls or [
+            "https://partners.moengage.com/hc/en-us/articles/9643917325460-Create-creatives",
+            "https://help.moengage.com/hc/en-us/articles/28194279371668-How-to-Analyze-OTT-Content-Performance",
+            # Add more URLs here as needed for broader testing
+        ]
+
+        # Concurrency can be tuned per run without editing the script
+        max_concurrency = int(os.getenv("SCRAPER_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        per_host_limit = int(os.getenv("SCRAPER_PER_HOST_LIMIT", DEFAULT_PER_HOST_LIMIT))
+        # With parse workers, HTML is parsed in separate processes instead of the download threads
+        parse_workers = int(os.getenv("SCRAPER_PARSE_WORKERS", "0"))
+
+        # Responses are revalidated with ETag / Last-Modified so unchanged pages are not re-downloaded
+        http_cache = HttpCache(os.getenv("SCRAPER_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+        print(f"\nFetching {len(urls_to_scrape)} articles (max {max_concurrency} concurrent, {per_host_limit} per host)")
+        if parse_workers > 0:
+            print(f"Parsing in {parse_workers} worker processes")
+            records = fetch_articles_pipelined(urls_to_scrape, parse_workers=parse_workers, max_concurrency=max_concurrency,
+                                               per_host_limit=per_host_limit, cache=http_cache)
+        else:
+            records = fetch_articles(urls_to_scrape, max_concurrency=max_concurrency, per_host_limit=per_host_limit,
+                                     cache=http_cache)
+        for record in records:
+            url, content = record["url"], record["content"]
+            if content:
+                print(f"\nSuccessfully extracted content from {url} (first 200 chars): \n{content[:200]}...")
+            else:
+                print(f"\nFailed to extract content for: {url}")
+            # Each record is written and flushed immediately, so the analyzer can consume it right away
+            writer.write(record)
+
+        http_cache.evict()
+        print(f"\n{http_cache.summary()}")
+        print(f"\n--- Extraction complete. {writer.count} records saved to {args.output} ---")
+
+    if args.metrics:
+        metrics.write(args.metrics)
+        print(f"Run metrics written to {args.metrics}", file=sys.stderr if args.output == "-" else sys.stdout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# moengage-doc-analysis/moengage_doc_analysis/section_store.py
+
+import json
+import sqlite3
+import threading
+import time
+
+# --- Store defaults ---
+DEFAULT_STORE_PATH = "section_store.sqlite3"
+DEFAULT_MAX_ENTRIES = 20000                   # Least recently used section reports are evicted beyond this count
+DEFAULT_TTL_SECONDS = 90 * 24 * 60 * 60       # Section reports older than 90 days are re-analyzed
+
+class SectionStore:
+    """
+    Persistent per-article section hashes and per-section analysis results, stored in SQLite.
+    On a re-run only sections whose hash is not stored yet need to go to the LLM; every other
+    section's result is read back and merged into the article report.
+    Reports expire after `ttl_seconds`, and `evict` also drops the least recently used ones
+    beyond `max_entries` and those of sections no article consists of any more.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sections_reused = 0
+        self.sections_analyzed = 0
+        self.tokens_reused = 0
+        self._lock = threading.Lock() # Shared by the analysis worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS article_sections (
+                url TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                section_hash TEXT NOT NULL,
+                PRIMARY KEY (url, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_article_sections_hash ON article_sections (section_hash);
+            CREATE TABLE IF NOT EXISTS section_reports (
+                section_key TEXT PRIMARY KEY,
+                report TEXT NOT NULL,
+                section_hash TEXT NOT NULL DEFAULT '',
+                created_at REAL NOT NULL DEFAULT 0,
+                last_used_at REAL NOT NULL DEFAULT 0
+            );
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(section_reports)")}
+        if "section_hash" not in columns: # Stores from before section reports were evicted
+            self._conn.execute("ALTER TABLE section_reports ADD COLUMN section_hash TEXT NOT NULL DEFAULT ''")
+            self._conn.execute("ALTER TABLE section_reports ADD COLUMN created_at REAL NOT NULL DEFAULT 0")
+            self._conn.execute("ALTER TABLE section_reports ADD COLUMN last_used_at REAL NOT NULL DEFAULT 0")
+            now = time.time()
+            self._conn.execute("UPDATE section_reports SET created_at = ?, last_used_at = ?, "
+                               "section_hash = substr(section_key, 1, instr(section_key, ':') - 1)", (now, now))
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_section_reports_last_used ON section_reports (last_used_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(section_hash: str, model: str, prompt_version: str) -> str:
+        return f"{section_hash}:{model}:{prompt_version}"
+
+    def previous_hashes(self, url: str) -> list:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT section_hash FROM article_sections WHERE url = ? ORDER BY position", (url,))]
+
+    def get_report(self, section_hash: str, model: str, prompt_version: str) -> dict:
+        """
+        Returns the stored report, or None if there is none or it has expired.
+        """
+        key = self._key(section_hash, model, prompt_version)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT report, created_at FROM section_reports WHERE section_key = ?",
+                                     (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                return None
+            self._conn.execute("UPDATE section_reports SET last_used_at = ? WHERE section_key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put_report(self, section_hash: str, model: str, prompt_version: str, report: dict):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO section_reports VALUES (?, ?, ?, ?, ?)",
+                               (self._key(section_hash, model, prompt_version), json.dumps(report, ensure_ascii=False),
+                                section_hash, now, now))
+            self._conn.commit()
+
+    def replace_sections(self, url: str, section_hashes: list):
+        """
+        Records the article's current section layout once all of its sections have a report.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM article_sections WHERE url = ?", (url,))
+            self._conn.executemany("INSERT INTO article_sections VALUES (?, ?, ?)",
+                                   [(url, position, section_hash) for position, section_hash in enumerate(section_hashes)])
+
+    def evict(self) -> int:
+        """
+        Drops expired reports, reports of sections that no article's current layout references
+        (superseded by an edit), then the least recently used ones beyond `max_entries`.
+        Call it once no analysis is in flight. Returns the number of reports removed.
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM section_reports WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            removed = cursor.rowcount
+            cursor = self._conn.execute(
+                "DELETE FROM section_reports WHERE section_hash NOT IN (SELECT section_hash FROM article_sections)"
+            )
+            removed += cursor.rowcount
+            cursor = self._conn.execute("""
+                DELETE FROM section_reports WHERE section_key IN (
+                    SELECT section_key FROM section_reports ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            removed += cursor.rowcount
+        return removed
+
+    def record_usage(self, reused: int, analyzed: int, tokens_reused: int):
+        with self._lock:
+            self.sections_reused += reused
+            self.sections_analyzed += analyzed
+            self.tokens_reused += tokens_reused
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def summary(self) -> str:
+        total = self.sections_reused + self.sections_analyzed
+        return (f"Section store: {self.sections_analyzed} of {total} sections sent to the LLM, "
+                f"{self.sections_reused} reused (~{self.tokens_reused} content tokens not re-sent)")
@@ -0,0 +1,186 @@
+# moengage-doc-analysis/moengage_doc_analysis/structured_output.py
+
+import json
+import re
+
+from .routing import CRITERIA, validate_criterion
+
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_STRING_CONTROL_CHARACTERS = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+def repair_json_text(text: str) -> str:
+    """
+    Fixes defects models commonly put in JSON output: Markdown code fences and prose around
+    the object, trailing commas, raw newlines or tabs inside strings, and Python literals
+    (True/False/None). Truncated output is not completed here; the incomplete member is
+    simply dropped by `ReportParser`.
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1:
+        return text
+    text = text[start:end + 1] if end > start else text[start:]
+    out = []
+    in_string = escape = False
+    position = 0
+    while position < len(text):
+        char = text[position]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            elif char in _STRING_CONTROL_CHARACTERS:
+                char = _STRING_CONTROL_CHARACTERS[char]
+            elif char < " ":
+                char = f"\\u{ord(char):04x}"
+            out.append(char)
+        elif char == '"':
+            in_string = True
+            out.append(char)
+        elif char in "}]":
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            out.append(char)
+        else:
+            literal = next((word for word in _PYTHON_LITERALS if text.startswith(word, position)), None)
+            if literal and not text[position - 1:position].isalnum():
+                out.append(_PYTHON_LITERALS[literal])
+                position += len(literal)
+                continue
+            out.append(char)
+        position += 1
+    return "".join(out)
+
+def criterion_name(key: str) -> str:
+    """
+    Maps a key such as "Structure and Flow" or "completeness_of_information" to one of CRITERIA,
+    or returns None.
+    """
+    normalized = re.sub(r"[^a-z]+", "_", key.lower()).strip("_")
+    if normalized in CRITERIA:
+        return normalized
+    first_word = normalized.split("_", 1)[0]
+    return next((criterion for criterion in CRITERIA if criterion.split("_", 1)[0] == first_word), None)
+
+def repair_criterion(value):
+    """
+    Coerces near-misses into the criterion schema: a single suggestion given as a string, or
+    suggestions given as one-field objects, become a list of strings.
+    """
+    if not isinstance(value, dict):
+        return value
+    value = dict(value)
+    suggestions = value.get("suggestions")
+    if isinstance(suggestions, str):
+        value["suggestions"] = [suggestions] if suggestions.strip() else []
+    elif isinstance(suggestions, list):
+        value["suggestions"] = [next(iter(item.values())) if isinstance(item, dict) and len(item) == 1 else item
+                                for item in suggestions]
+    return value
+
+class ReportParser:
+    """
+    Incremental parser for the report JSON object, fed text as it streams in. It tracks
+    string and nesting state character by character, and each top-level member is parsed
+    (repaired if needed) and validated as soon as its value is closed. Valid criteria
+    accumulate in `criteria`; a member cut off by truncated output never completes and is
+    therefore missing rather than fatal. `problems` lists what was rejected, and `repaired`
+    counts members that only parsed after `repair_json_text`.
+    """
+
+    def __init__(self):
+        self.criteria = {}
+        self.problems = []
+        self.repaired = 0
+        self._chunks = []
+        self._member = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._finished = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, text: str) -> list:
+        """
+        Consumes the next piece of output and returns the names of criteria it completed.
+        """
+        self._chunks.append(text)
+        completed = []
+        for char in text:
+            if self._finished:
+                break # Prose or a code fence after the object
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1 # Anything before the opening brace is ignored
+                continue
+            if self._in_string:
+                self._member.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+            if self._depth == 0 or (self._depth == 1 and char == ","):
+                completed.extend(self._complete_member())
+                self._finished = self._depth == 0
+                continue
+            self._member.append(char)
+        return completed
+
+    def _complete_member(self) -> list:
+        member, self._member = "".join(self._member).strip(), []
+        if not member:
+            return [] # Trailing comma or empty object
+        try:
+            parsed = json.loads("{" + member + "}")
+        except ValueError:
+            try:
+                parsed = json.loads(repair_json_text("{" + member + "}"))
+                self.repaired += 1
+            except ValueError as e:
+                self.problems.append(f"unparseable member {member[:60]!r}: {e}")
+                return []
+        return self._accept(parsed)
+
+    def _accept(self, members: dict) -> list:
+        completed = []
+        for key, value in members.items():
+            criterion = criterion_name(key)
+            if criterion is None:
+                if isinstance(value, dict):
+                    completed.extend(self._accept(value)) # Criteria wrapped in an outer key such as "report"
+                continue
+            value = repair_criterion(value)
+            problems = validate_criterion(criterion, value)
+            if problems:
+                self.problems.extend(problems)
+                continue
+            self.criteria[criterion] = {"assessment": value["assessment"], "suggestions": value["suggestions"]}
+            completed.append(criterion)
+        return completed
+
+    def missing(self, criteria=CRITERIA) -> list:
+        return [criterion for criterion in criteria if criterion not in self.criteria]
+
+def parse_report_text(text: str) -> ReportParser:
+    """
+    Parses a complete (non-streamed) answer; see `ReportParser` for the result.
+    """
+    parser = ReportParser()
+    parser.feed(text)
+    return parser
@@ -0,0 +1,190 @@
+# moengage-doc-analysis/moengage_doc_analysis/text_metrics.py
+
+import functools
+import json
+import re
+import statistics
+
+from .chunking import is_heading_line, HEADING_MARKER
+
+# --- Pre-analysis thresholds ---
+# An article passing every threshold is considered clean enough to skip the LLM or use a cheaper prompt
+DEFAULT_THRESHOLDS = {
+    "min_flesch_reading_ease": 50.0,   # 60-70 is plain English; help docs with product terms score lower
+    "max_avg_sentence_words": 20.0,
+    "max_long_sentence_ratio": 0.15,   # Share of sentences over LONG_SENTENCE_WORDS
+    "max_passive_ratio": 0.10,         # Share of sentences with a passive construction
+    "max_avg_paragraph_words": 60.0,
+    "min_heading_density": 0.02,       # Headings per line of text
+}
+LONG_SENTENCE_WORDS = 25
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'(])')
+_WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?|\d+(?:[.,]\d+)*")
+_VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+_LIST_MARKER = re.compile(r'^\s*(?:[-*•●]|\d{1,2}[.)]|[a-z][.)]|step\s+\d+\b)', re.IGNORECASE)
+# "is/was/been/... + past participle", optionally with one adverb in between
+_PASSIVE = re.compile(
+    r"\b(?:am|is|are|was|were|be|been|being|get|gets|got|gotten)\s+(?:\w+ly\s+)?"
+    r"(?:\w+ed|built|chosen|done|drawn|given|known|made|seen|sent|set|shown|taken|written|found|kept|left|put|run|read|held|sold|told|paid|brought|bought|caught|taught|thought|meant|begun|broken|driven|eaten|forgotten|hidden|spoken|stolen|understood)\b",
+    re.IGNORECASE,
+)
+
+@functools.lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """
+    Vowel-group syllable estimate (with a silent trailing 'e'), cached per word because the
+    same product vocabulary repeats across the whole corpus.
+    """
+    word = word.lower()
+    if word.isdigit():
+        return 1
+    syllables = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and syllables > 1:
+        syllables -= 1
+    return max(1, syllables)
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return float(sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))])
+
+def compute_text_metrics(content: str) -> dict:
+    """
+    Deterministic readability and structure metrics for one extracted article.
+    Headings and list items are counted from the "#" and "-" markers extraction puts on them
+    (extraction.STRUCTURE_MARKERS); other short lines without sentence punctuation, such as
+    table cells and labels, are left out of the paragraph statistics.
+    """
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    heading_lines = [line for line in lines if HEADING_MARKER.match(line)]
+    list_lines = [line for line in lines if _LIST_MARKER.match(line)]
+    paragraphs = [line for line in lines if not is_heading_line(line) and not _LIST_MARKER.match(line)]
+
+    sentences = [sentence for paragraph in paragraphs for sentence in _SENTENCE_SPLIT.split(paragraph)]
+    sentence_lengths = sorted(len(_WORD.findall(sentence)) for sentence in sentences)
+    sentence_lengths = [length for length in sentence_lengths if length]
+    words = _WORD.findall(" ".join(paragraphs))
+    word_count = len(words)
+    sentence_count = len(sentence_lengths)
+    syllable_count = sum(count_syllables(word) for word in words)
+    passive_sentences = sum(1 for sentence in sentences if _PASSIVE.search(sentence))
+    paragraph_lengths = [len(_WORD.findall(paragraph)) for paragraph in paragraphs]
+
+    words_per_sentence = word_count / sentence_count if sentence_count else 0.0
+    syllables_per_word = syllable_count / word_count if word_count else 0.0
+    return {
+        "word_count": word_count,
+        "sentence_count": sentence_count,
+        "avg_sentence_words": round(words_per_sentence, 2),
+        "median_sentence_words": float(statistics.median(sentence_lengths)) if sentence_lengths else 0.0,
+        "p90_sentence_words": _percentile(sentence_lengths, 0.9),
+        "max_sentence_words": sentence_lengths[-1] if sentence_lengths else 0,
+        "long_sentence_ratio": round(sum(1 for length in sentence_lengths if length > LONG_SENTENCE_WORDS)
+                                     / sentence_count, 3) if sentence_count else 0.0,
+        "flesch_reading_ease": round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2)
+                               if word_count else 0.0,
+        "flesch_kincaid_grade": round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 2)
+                                if word_count else 0.0,
+        "passive_voice_count": passive_sentences,
+        "passive_ratio": round(passive_sentences / sentence_count, 3) if sentence_count else 0.0,
+        "heading_count": len(heading_lines),
+        "heading_density": round(len(heading_lines) / len(lines), 3) if lines else 0.0,
+        "list_item_count": len(list_lines),
+        "list_density": round(len(list_lines) / len(lines), 3) if lines else 0.0,
+        "paragraph_count": len(paragraphs),
+        "avg_paragraph_words": round(statistics.fmean(paragraph_lengths), 2) if paragraph_lengths else 0.0,
+        "max_paragraph_words": max(paragraph_lengths, default=0),
+    }
+
+CORPUS_METRICS = ("flesch_reading_ease", "avg_sentence_words", "passive_ratio", "avg_paragraph_words")
+
+class CorpusMetrics:
+    """
+    Running corpus-level distributions (p10/p50/p90) of the main metrics, so a run can report how
+    its articles compare with each other. Only the few summarized values per article are kept.
+    """
+
+    def __init__(self):
+        self.article_count = 0
+        self._values = {name: [] for name in CORPUS_METRICS}
+
+    def add(self, metrics: dict):
+        self.article_count += 1
+        for name in CORPUS_METRICS:
+            self._values[name].append(metrics[name])
+
+    def summary(self) -> dict:
+        summary = {"article_count": self.article_count}
+        for name in CORPUS_METRICS:
+            values = sorted(self._values[name])
+            summary[name] = {"p10": _percentile(values, 0.1), "p50": _percentile(values, 0.5),
+                             "p90": _percentile(values, 0.9)}
+        return summary
+
+    def summary_text(self) -> str:
+        summary = self.summary()
+        lines = [f"Corpus metrics over {summary['article_count']} articles (p10 / p50 / p90):"]
+        lines += [f"  {name}: {summary[name]['p10']} / {summary[name]['p50']} / {summary[name]['p90']}"
+                  for name in CORPUS_METRICS]
+        return "\n".join(lines)
+
+def _attach_metrics(record: dict, corpus: CorpusMetrics = None) -> dict:
+    if record.get("content"):
+        record["metrics"] = compute_text_metrics(record["content"])
+        if corpus is not None:
+            corpus.add(record["metrics"])
+    return record
+
+def compute_corpus_metrics(records: list) -> dict:
+    """
+    Computes metrics for a whole batch of article records in one pass, attaching them to each
+    record as `record["metrics"]`, and returns corpus-level distributions for comparison.
+    Records without content are left untouched.
+    """
+    corpus = CorpusMetrics()
+    for record in records:
+        _attach_metrics(record, corpus)
+    return corpus.summary()
+
+def iter_with_metrics(records, corpus: CorpusMetrics = None):
+    """
+    Attaches metrics to each record and yields it right away, so a followed file or a pipe
+    keeps flowing one article at a time. The corpus distributions are accumulated in `corpus`
+    as records pass through, when one is given.
+    """
+    for record in records:
+        yield _attach_metrics(record, corpus)
+
+def load_thresholds(path: str) -> dict:
+    """
+    Reads a JSON file overriding DEFAULT_THRESHOLDS. Unknown keys are rejected: a mistyped name
+    would otherwise be ignored, and articles could skip the LLM on a check that never ran.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        thresholds = json.load(f)
+    if not isinstance(thresholds, dict):
+        raise ValueError(f"{path} must contain a JSON object of thresholds")
+    unknown = sorted(set(thresholds) - set(DEFAULT_THRESHOLDS))
+    if unknown:
+        raise ValueError(f"Unknown thresholds in {path}: {', '.join(unknown)}. "
+                         f"Valid names: {', '.join(DEFAULT_THRESHOLDS)}")
+    for name, limit in thresholds.items():
+        if isinstance(limit, bool) or not isinstance(limit, (int, float)):
+            raise ValueError(f"Threshold {name} in {path} must be a number, got {limit!r}")
+    return thresholds
+
+def failed_thresholds(metrics: dict, thresholds: dict = None) -> list:
+    """
+    Returns the names of the thresholds an article misses; an empty list means it passes.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    failed = []
+    for name, limit in thresholds.items():
+        kind, metric = name.split("_", 1)
+        value = metrics.get(metric)
+        if value is None:
+            continue
+        if (kind == "min" and value < limit) or (kind == "max" and value > limit):
+            failed.append(name)
+    return failed
@@ -0,0 +1,7 @@
+# moengage-doc-analysis/tests/conftest.py
+
+import os
+import sys
+
+# The benchmark helpers (page server, synthetic corpus) are plain scripts, not a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
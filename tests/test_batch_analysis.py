@@ -0,0 +1,143 @@
+# moengage-doc-analysis/tests/test_batch_analysis.py
+
+import json
+import re
+
+import pytest
+from openai import OpenAI
+
+from corpus import synthetic_page
+from fake_llm import FakeLLMServer
+
+from moengage_doc_analysis import analysis
+from moengage_doc_analysis.batch_client import InlineBatchClient, load_batch_state, state_path
+from moengage_doc_analysis.llm_cache import LLMResultCache, content_hash
+from moengage_doc_analysis.routing import CRITERIA
+
+class DroppingLLMServer(FakeLLMServer):
+    """
+    Leaves the last criterion out of every full answer; re-asks for some criteria are answered normally.
+    """
+
+    def complete(self, request: dict) -> tuple:
+        status, payload, headers = super().complete(request)
+        message = payload["choices"][0]["message"] if status == 200 else None
+        report = json.loads(message["content"]) if message else {}
+        if len(report) == len(CRITERIA):
+            message["content"] = json.dumps({key: report[key] for key in CRITERIA[:-1]})
+        return status, payload, headers
+
+class EchoLLMServer(FakeLLMServer):
+    """
+    Answers with the paragraph markers (art<i>-p<k>) of the text it was sent as every criterion's suggestions.
+    """
+
+    def complete(self, request: dict) -> tuple:
+        status, payload, headers = super().complete(request)
+        markers = re.findall(r"\bart\d+-p\d+\b", request["messages"][-1]["content"])
+        report = json.loads(payload["choices"][0]["message"]["content"])
+        for value in report.values():
+            value["suggestions"] = markers
+        payload["choices"][0]["message"]["content"] = json.dumps(report)
+        return status, payload, headers
+
+class ReversedBatchClient(InlineBatchClient):
+    """
+    Returns the batch output lines in reverse order, as a provider may return them in any order.
+    """
+
+    def results(self, batch_id: str):
+        return list(super().results(batch_id))[::-1]
+
+class InterruptedBatchClient(InlineBatchClient):
+    """
+    Submits like InlineBatchClient, then dies on the first status check like a killed run.
+    """
+
+    def status(self, batch_id: str) -> str:
+        raise KeyboardInterrupt
+
+def make_articles(count: int = 3) -> list:
+    return [{"url": f"https://help.example.com/hc/en-us/articles/{1001 + index}", "content": synthetic_page(index)}
+            for index in range(count)]
+
+def run_batch(server, articles, batch_file, client_class=InlineBatchClient, **options) -> list:
+    llm_client = OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+    return list(analysis.analyze_articles_in_batch(articles, client_class(llm_client), "gpt-4o-mini",
+                                                   str(batch_file), poll_interval=0, **options))
+
+def marked_article(index: int, paragraphs: int) -> dict:
+    content = "\n".join(f"Paragraph art{index}-p{k} explains one step of the campaign setup in a few words."
+                        for k in range(paragraphs))
+    return {"url": f"https://help.example.com/hc/en-us/articles/{1001 + index}", "content": content}
+
+@pytest.fixture
+def batch_file(tmp_path):
+    return tmp_path / "batch.jsonl"
+
+def test_interrupted_batch_saves_hashes_only_and_resumes_without_resubmitting(batch_file):
+    articles = make_articles()
+    with FakeLLMServer() as server:
+        with pytest.raises(KeyboardInterrupt):
+            run_batch(server, articles, batch_file, InterruptedBatchClient)
+        state = load_batch_state(str(batch_file))
+        assert [set(entry) for entry in state["articles"]] == [{"url", "content_hash", "custom_ids"}] * 3
+        assert synthetic_page(0)[:200] not in open(state_path(str(batch_file)), encoding="utf-8").read()
+
+        reports = run_batch(server, articles, batch_file)
+        assert server.stats["requests"] == 3 # The saved batch's answers were used, nothing was sent again
+    assert [report["url"] for report in reports] == [article["url"] for article in articles]
+    assert [report["content_hash"] for report in reports] == [content_hash(article["content"]) for article in articles]
+    assert all(not analysis.is_fallback_report(report) for report in reports)
+    assert load_batch_state(str(batch_file)) is None
+
+def test_resumed_batch_drops_answers_for_changed_content(batch_file):
+    articles = make_articles()
+    with FakeLLMServer() as server:
+        with pytest.raises(KeyboardInterrupt):
+            run_batch(server, articles, batch_file, InterruptedBatchClient)
+        articles[1] = {**articles[1], "content": articles[1]["content"] + "\nA new closing paragraph."}
+        reports = run_batch(server, articles, batch_file)
+    assert reports[0] == {"url": articles[1]["url"], "error": "Content changed since the batch was submitted."}
+    assert sorted(report["url"] for report in reports[1:]) == [articles[0]["url"], articles[2]["url"]]
+
+def test_missing_criteria_are_reasked_in_a_follow_up_batch(batch_file, monkeypatch):
+    monkeypatch.setattr(analysis, "LLM_REASK_ATTEMPTS", 1)
+    articles = make_articles()
+    with DroppingLLMServer() as server:
+        reports = run_batch(server, articles, batch_file)
+        assert server.stats["requests"] == 6 # One full request and one re-ask per article
+    for report in reports:
+        assert not analysis.is_fallback_report(report)
+        assert report["style_guidelines"]["assessment"] == "Fake assessment of style guidelines."
+    reask_lines = [json.loads(line) for line in open(batch_file, encoding="utf-8")]
+    assert all("Return only these keys" in line["body"]["messages"][-1]["content"] for line in reask_lines)
+
+def test_criteria_still_missing_after_reasks_fail_the_article(batch_file, monkeypatch):
+    monkeypatch.setattr(analysis, "LLM_REASK_ATTEMPTS", 0)
+    with DroppingLLMServer() as server:
+        reports = run_batch(server, make_articles(1), batch_file)
+    assert analysis.is_fallback_report(reports[0])
+    assert reports[0]["readability_for_marketer"]["assessment"].startswith("Fake assessment")
+
+def test_batch_answers_are_mapped_back_to_their_articles_in_any_order(batch_file, tmp_path):
+    articles = [marked_article(0, 2), marked_article(1, 12), marked_article(2, 2)]
+    cached = {name: {"assessment": "From the cache.", "suggestions": []} for name in CRITERIA}
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"))
+    cache.put(articles[2]["content"], "gpt-4o-mini", analysis.PROMPT_VERSION, analysis.LLM_TEMPERATURE, cached)
+    with EchoLLMServer() as server:
+        reports = run_batch(server, articles, batch_file, ReversedBatchClient, cache=cache, max_content_tokens=60)
+        requests = server.stats["requests"]
+    lines = [json.loads(line) for line in open(batch_file, encoding="utf-8")]
+    assert requests == len(lines) > 2 # The long article was sent as several chunks; the cached one not at all
+
+    assert reports[0] == {"url": articles[2]["url"], "content_hash": content_hash(articles[2]["content"]),
+                          "analyzed_with": "gpt-4o-mini", **cached}
+    by_url = {report["url"]: report for report in reports[1:]}
+    for index, paragraphs in ((0, 2), (1, 12)):
+        report = by_url[articles[index]["url"]]
+        # Chunk answers are merged in article order, whatever order the output lines came in
+        assert report["structure_and_flow"]["suggestions"] == [f"art{index}-p{k}" for k in range(paragraphs)]
+        assert cache.get(articles[index]["content"], "gpt-4o-mini", analysis.PROMPT_VERSION,
+                         analysis.LLM_TEMPERATURE) is not None
+    cache.close()
@@ -0,0 +1,55 @@
+# moengage-doc-analysis/tests/test_chunking.py
+
+import pytest
+
+from moengage_doc_analysis import chunking
+from moengage_doc_analysis.chunking import chunk_text, count_tokens, group_sections, split_into_sections
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Token counts must not depend on whether tiktoken happens to be installed
+    monkeypatch.setattr(chunking, "_get_encoder", lambda model: None)
+
+def section(title: str, sentences: int) -> str:
+    return title + "\n" + " ".join(f"{title} sentence number {i} explains a step." for i in range(sentences))
+
+def test_split_into_sections_keeps_consecutive_headings_together():
+    text = "Intro paragraph ends here.\nTitle\nSubtitle\nBody one.\nNext heading\nBody two."
+    assert split_into_sections(text) == ["Intro paragraph ends here.", "Title\nSubtitle\nBody one.",
+                                         "Next heading\nBody two."]
+
+def test_chunk_text_packs_whole_sections_up_to_limit():
+    sections = [section(f"Heading {i}", 3) for i in range(6)]
+    limit = count_tokens(sections[0]) * 2 + 1
+    chunks = chunk_text("\n".join(sections), limit)
+    assert chunks == ["\n".join(sections[i:i + 2]) for i in range(0, 6, 2)]
+
+def test_chunk_text_splits_oversized_section_on_sentences():
+    big = section("Long heading", 40)
+    chunks = chunk_text(big, 60)
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 60 for chunk in chunks)
+    assert " ".join(chunks).split() == big.split()
+
+def test_chunk_text_cuts_unbroken_run_by_characters():
+    chunks = chunk_text("x" * 1000, 50)
+    assert "".join(chunks) == "x" * 1000
+    assert all(count_tokens(chunk) <= 50 for chunk in chunks)
+
+def test_group_sections_respects_twice_the_target():
+    sections = [section(f"Heading {i}", 4) for i in range(30)]
+    target = count_tokens(sections[0]) * 3
+    groups = group_sections(sections, target)
+    assert "\n".join(groups) == "\n".join(sections)
+    assert all(count_tokens(group) <= 2 * target for group in groups)
+
+def test_group_sections_edit_only_changes_its_own_group():
+    sections = [section(f"Heading {i}", 4) for i in range(40)]
+    target = count_tokens(sections[0]) * 3
+    before = group_sections(sections, target)
+    edited = list(sections)
+    edited[20] = edited[20].replace("explains", "describes", 1)
+    after = group_sections(edited, target)
+    changed = [group for group in after if group not in before]
+    assert len(changed) <= 2 and any("describes" in group for group in changed)
+    assert sum(group not in after for group in before) == len(changed)
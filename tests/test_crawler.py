@@ -0,0 +1,111 @@
+# moengage-doc-analysis/tests/test_crawler.py
+
+import pytest
+
+from corpus import synthetic_page
+from page_server import PageServer
+
+from moengage_doc_analysis.crawler import Frontier, crawl, normalize_url
+from moengage_doc_analysis.http_cache import HttpCache
+
+ARTICLE_IDS = [str(1001 + index) for index in range(7)]
+
+@pytest.fixture
+def site():
+    with PageServer([(article_id, synthetic_page(index)) for index, article_id in enumerate(ARTICLE_IDS)]) as server:
+        yield server
+
+def crawled_ids(records) -> list:
+    return [record["url"].split("/articles/")[1].split("-")[0].split("?")[0] for record in records]
+
+def run_crawl(seed: str, frontier_path, **options) -> list:
+    frontier = Frontier(str(frontier_path))
+    try:
+        return list(crawl([seed], frontier, delay_seconds=0, max_concurrency=1, **options))
+    finally:
+        frontier.close()
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Help.Example.com:443/hc/en-us/articles/123-Old-Title?utm_source=x&b=2&a=1#faq") \
+        == "https://help.example.com/hc/en-us/articles/123?a=1&b=2"
+    assert normalize_url("http://example.com:8080/hc/en-us/sections/5/") == "http://example.com:8080/hc/en-us/sections/5"
+    assert normalize_url("https://example.com/hc/en-us/articles/123-New-Title") \
+        == normalize_url("https://example.com/hc/en-us/articles/123")
+
+def test_frontier_drops_rediscovered_urls(tmp_path):
+    frontier = Frontier(str(tmp_path / "frontier.sqlite3"))
+    assert frontier.add("https://example.com/hc/en-us/articles/1-Title")
+    assert not frontier.add("https://example.com/hc/en-us/articles/1-Renamed?utm_medium=email#top")
+    assert frontier.queued("article") == 1
+    assert frontier.pop("article") == "https://example.com/hc/en-us/articles/1-Title"
+    assert frontier.pop("article") is None
+    frontier.close()
+
+def test_discovers_sitemap_index_in_lastmod_order(site, tmp_path):
+    lastmods = {f"/hc/en-us/articles/{article_id}": f"2024-01-{10 + index:02d}"
+                for index, article_id in enumerate(ARTICLE_IDS)}
+    site.serve_help_center(lastmods)
+    records = run_crawl(f"{site.base_url}/sitemap.xml", tmp_path / "frontier.sqlite3")
+    assert crawled_ids(records) == list(reversed(ARTICLE_IDS)) # Most recently updated first
+    assert all(record["content"] for record in records)
+
+def test_discovers_listings_once_per_article(site, tmp_path):
+    home = site.serve_help_center(articles_per_section=2)
+    records = run_crawl(home, tmp_path / "frontier.sqlite3")
+    assert sorted(crawled_ids(records)) == ARTICLE_IDS # Slug, tracking and fragment variants are deduplicated
+    assert all(record["content"] for record in records)
+
+def test_resumes_after_interruption(site, tmp_path):
+    site.serve_help_center()
+    frontier_path = tmp_path / "frontier.sqlite3"
+    frontier = Frontier(str(frontier_path))
+    records = crawl([f"{site.base_url}/sitemap.xml"], frontier, delay_seconds=0, max_concurrency=1)
+    first = [next(records) for _ in range(3)]
+    records.close() # The crawl dies part-way through
+    frontier.close()
+
+    rest = run_crawl(f"{site.base_url}/sitemap.xml", frontier_path)
+    assert sorted(crawled_ids(first) + crawled_ids(rest)) == ARTICLE_IDS
+    assert not set(crawled_ids(first)) & set(crawled_ids(rest))
+
+def test_requeues_only_articles_with_newer_lastmod(site, tmp_path):
+    lastmods = {f"/hc/en-us/articles/{article_id}": "2024-01-01" for article_id in ARTICLE_IDS}
+    site.serve_help_center(lastmods)
+    frontier_path = tmp_path / "frontier.sqlite3"
+    assert len(run_crawl(f"{site.base_url}/sitemap.xml", frontier_path)) == len(ARTICLE_IDS)
+    assert run_crawl(f"{site.base_url}/sitemap.xml", frontier_path) == []
+
+    lastmods[f"/hc/en-us/articles/{ARTICLE_IDS[2]}"] = "2024-02-01"
+    site.serve_help_center(lastmods)
+    assert crawled_ids(run_crawl(f"{site.base_url}/sitemap.xml", frontier_path)) == [ARTICLE_IDS[2]]
+
+def test_failed_fetch_is_retried_by_next_crawl(site, tmp_path):
+    site.serve_help_center()
+    failing = f"/hc/en-us/articles/{ARTICLE_IDS[0]}"
+    site.failing_paths.add(failing)
+    frontier_path = tmp_path / "frontier.sqlite3"
+    records = run_crawl(f"{site.base_url}/sitemap.xml", frontier_path)
+    assert [bool(record["content"]) for record in records if failing in record["url"]] == [False]
+
+    site.failing_paths.clear()
+    retried = run_crawl(f"{site.base_url}/sitemap.xml", frontier_path)
+    assert crawled_ids(retried) == [ARTICLE_IDS[0]]
+    assert retried[0]["content"]
+
+def test_listing_articles_are_recrawled_once_stale(site, tmp_path):
+    home = site.serve_help_center()
+    frontier_path = str(tmp_path / "frontier.sqlite3")
+    cache = HttpCache(str(tmp_path / "http_cache"))
+
+    def crawl_once(recrawl_after_seconds: float) -> list:
+        frontier = Frontier(frontier_path, recrawl_after_seconds=recrawl_after_seconds)
+        try:
+            return list(crawl([home], frontier, cache=cache, delay_seconds=0, max_concurrency=1))
+        finally:
+            frontier.close()
+
+    assert len(crawl_once(3600)) == len(ARTICLE_IDS)
+    assert crawl_once(3600) == [] # Crawled too recently: listings find nothing to fetch
+    recrawled = crawl_once(0)
+    assert sorted(crawled_ids(recrawled)) == ARTICLE_IDS # Each article once, despite several listings
+    assert cache.hits == len(ARTICLE_IDS) # Unchanged pages were revalidated with a 304
@@ -0,0 +1,16 @@
+# moengage-doc-analysis/tests/test_entry_points.py
+
+import importlib
+
+import pytest
+
+@pytest.mark.parametrize("shim, names", [
+    ("scraper", ["fetch_article_content", "fetch_articles", "fetch_articles_pipelined", "article_record"]),
+    ("crawler", ["normalize_url", "Frontier", "crawl", "discover_from_sitemap"]),
+    ("analysis", ["analyze_content_with_llm", "analyze_article", "fallback_report", "get_llm_client", "LLM_MODEL"]),
+])
+def test_top_level_scripts_reexport_the_package_api(shim, names):
+    module = importlib.import_module(shim)
+    package_module = importlib.import_module(f"moengage_doc_analysis.{shim}")
+    for name in names:
+        assert getattr(module, name) is getattr(package_module, name)
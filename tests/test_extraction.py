@@ -0,0 +1,21 @@
+# moengage-doc-analysis/tests/test_extraction.py
+
+import pytest
+
+from bench_extraction import EDGE_CASE_PAGES, check_equivalence
+from corpus import synthetic_page
+
+from moengage_doc_analysis.extraction import extract_main_text
+
+@pytest.fixture(autouse=True)
+def lxml():
+    pytest.importorskip("lxml")
+
+def test_lxml_matches_bs4_on_synthetic_pages_and_edge_cases():
+    pages = [(f"synthetic-{index}", synthetic_page(index)) for index in range(10)] + EDGE_CASE_PAGES
+    assert check_equivalence(pages, "bs4", "lxml") == []
+
+@pytest.mark.parametrize("backend", ["bs4", "lxml"])
+def test_cdata_sections_are_kept_as_text(backend):
+    html = "<html><body><article><p>A</p><![CDATA[x]]><p>B</p><p>C<![CDATA[y]]>D</p></article></body></html>"
+    assert extract_main_text(html, "https://example.com/article", backend) == "A\nx\nB\nCyD"
@@ -0,0 +1,38 @@
+# moengage-doc-analysis/tests/test_jsonl_stream.py
+
+from moengage_doc_analysis.jsonl_stream import JsonlWriter, iter_jsonl, repair_truncated_tail
+
+def test_repair_truncated_tail_cuts_partial_record(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"a": 1}\n{"b": 2}\n{"c": ', encoding="utf-8")
+    repair_truncated_tail(str(path))
+    assert path.read_text(encoding="utf-8") == '{"a": 1}\n{"b": 2}\n'
+
+def test_repair_truncated_tail_scans_back_across_blocks(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"a": 1}\n{"b": "' + "x" * 10000, encoding="utf-8")
+    repair_truncated_tail(str(path))
+    assert path.read_text(encoding="utf-8") == '{"a": 1}\n'
+
+def test_repair_truncated_tail_empties_file_without_complete_line(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"a": ', encoding="utf-8")
+    repair_truncated_tail(str(path))
+    assert path.read_text(encoding="utf-8") == ""
+
+def test_repair_truncated_tail_leaves_complete_file_alone(tmp_path):
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"a": 1}\n', encoding="utf-8")
+    repair_truncated_tail(str(path))
+    repair_truncated_tail(str(tmp_path / "missing.jsonl"))
+    assert path.read_text(encoding="utf-8") == '{"a": 1}\n'
+
+def test_appending_writer_does_not_glue_onto_crashed_record(tmp_path):
+    path = tmp_path / "records.jsonl"
+    with JsonlWriter(str(path)) as writer:
+        writer.write({"n": 1})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"n": 2, "text": "cut o')
+    with JsonlWriter(str(path), append=True) as writer:
+        writer.write({"n": 3})
+    assert list(iter_jsonl(str(path))) == [{"n": 1}, {"n": 3}]
@@ -0,0 +1,98 @@
+# moengage-doc-analysis/tests/test_llm_cache.py
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from moengage_doc_analysis import analysis, llm_cache
+from moengage_doc_analysis.llm_cache import LLMResultCache
+from moengage_doc_analysis.routing import CRITERIA
+
+REPORT = {name: {"assessment": f"{name} ok.", "suggestions": ["Add an example."]} for name in CRITERIA}
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        self.now += 1 # Every call is a distinct instant, so last-used order is unambiguous
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"))
+    yield cache
+    cache.close()
+
+def test_key_ignores_whitespace_only_differences(cache):
+    cache.put("Step one.\n\n  Step   two. ", "gpt-4o", "v2", 0.2, REPORT)
+    assert cache.get("  Step one.\nStep two.", "gpt-4o", "v2", 0.2) == REPORT
+    assert cache.get("Step one.\nStep three.", "gpt-4o", "v2", 0.2) is None
+
+def test_key_includes_model_prompt_version_and_temperature(cache):
+    cache.put("Text.", "gpt-4o", "v2", 0.2, REPORT)
+    assert cache.get("Text.", "gpt-4o-mini", "v2", 0.2) is None
+    assert cache.get("Text.", "gpt-4o", "v1", 0.2) is None
+    assert cache.get("Text.", "gpt-4o", "v2", 0.7) is None
+    assert cache.get("Text.", "gpt-4o", "v2", 0.20) == REPORT
+    assert (cache.hits, cache.misses) == (1, 3)
+
+def test_expired_report_misses_and_is_evicted(tmp_path, clock):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=100)
+    cache.put("Old text.", "gpt-4o", "v2", 0.2, REPORT)
+    clock.now += 50
+    cache.put("New text.", "gpt-4o", "v2", 0.2, REPORT)
+    clock.now += 60
+    assert cache.get("Old text.", "gpt-4o", "v2", 0.2) is None
+    assert cache.evict() == 1
+    assert cache.get("New text.", "gpt-4o", "v2", 0.2) == REPORT
+    cache.close()
+
+def test_evict_drops_least_recently_used_beyond_max_entries(tmp_path, clock):
+    cache = LLMResultCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    for text in ("First.", "Second.", "Third."):
+        cache.put(text, "gpt-4o", "v2", 0.2, REPORT)
+    assert cache.get("First.", "gpt-4o", "v2", 0.2) == REPORT # Now used more recently than "Second."
+    assert cache.evict() == 1
+    assert cache.get("Second.", "gpt-4o", "v2", 0.2) is None
+    assert cache.get("First.", "gpt-4o", "v2", 0.2) == REPORT
+    assert cache.get("Third.", "gpt-4o", "v2", 0.2) == REPORT
+    cache.close()
+
+class FailingCompletions:
+    def __init__(self, answers: list):
+        self.answers = list(answers)
+
+    def create(self, **request):
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=answer))])
+
+@pytest.mark.parametrize("answers", [
+    [RuntimeError("connection reset")],                                   # Error fallback
+    ["not json", "still not json"],                                       # Nothing parseable, even after a re-ask
+    [json.dumps({name: REPORT[name] for name in CRITERIA[:2]}), "{}"],    # Partial report with placeholders
+])
+def test_fallback_reports_are_never_cached(cache, monkeypatch, answers):
+    monkeypatch.setattr(analysis, "LLM_STREAM", False)
+    monkeypatch.setattr(analysis, "LLM_REASK_ATTEMPTS", 1)
+    llm_client = SimpleNamespace(chat=SimpleNamespace(completions=FailingCompletions(answers)))
+    report = analysis.analyze_content_with_llm("Some article text.", llm_client, "gpt-4o-mini", cache=cache)
+    assert analysis.is_fallback_report(report)
+    assert cache.get("Some article text.", "gpt-4o-mini", analysis.PROMPT_VERSION, analysis.LLM_TEMPERATURE) is None
+
+def test_complete_report_is_cached_and_reused(cache, monkeypatch):
+    monkeypatch.setattr(analysis, "LLM_STREAM", False)
+    completions = FailingCompletions([json.dumps(REPORT)])
+    llm_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    for _ in range(2): # The second call would fail if it reached the client
+        assert analysis.analyze_content_with_llm("Some article text.", llm_client, "gpt-4o-mini", cache=cache) == REPORT
+    assert (cache.hits, cache.misses) == (1, 1)
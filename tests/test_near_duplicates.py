@@ -0,0 +1,38 @@
+# moengage-doc-analysis/tests/test_near_duplicates.py
+
+import random
+
+from moengage_doc_analysis.llm_cache import content_hash
+from moengage_doc_analysis.near_duplicates import NearDuplicateIndex
+
+def article(seed: int, words: int = 400) -> str:
+    rng = random.Random(seed)
+    return " ".join(f"word{rng.randrange(5000)}" for _ in range(words))
+
+def add(index: NearDuplicateIndex, url: str, content: str) -> tuple:
+    return index.add(url, content, content_hash(content))
+
+def test_near_duplicate_joins_representative(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite3"))
+    original = article(1)
+    assert add(index, "a", original) == ("a", 1.0)
+    representative, similarity = add(index, "b", original + " one extra sentence")
+    assert representative == "a" and similarity >= index.threshold
+    assert add(index, "c", article(2))[0] == "c"
+    assert index.cluster_sizes() == {"a": 2}
+
+def test_members_leave_a_representative_whose_content_drifted(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / "index.sqlite3"))
+    original = article(1)
+    add(index, "a", original)
+    add(index, "b", original + " one extra sentence")
+    report = {"url": "a", "readability_for_marketer": {"assessment": "ok", "suggestions": []}}
+    index.store_report("a", content_hash(original), report)
+
+    # The representative is rewritten but stays its own representative
+    assert add(index, "a", article(3)) == ("a", 1.0)
+    assert index.get_report("a") is None
+    # Its former member, unchanged, must not be pointed at the rewritten representative
+    representative, similarity = add(index, "b", original + " one extra sentence")
+    assert representative == "b" and similarity == 1.0
+    assert index.cluster_sizes() == {}
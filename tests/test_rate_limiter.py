@@ -0,0 +1,122 @@
+# moengage-doc-analysis/tests/test_rate_limiter.py
+
+from types import SimpleNamespace
+
+import openai
+import pytest
+from openai import OpenAI
+
+from fake_llm import FakeLLMServer
+
+from moengage_doc_analysis import rate_limiter
+from moengage_doc_analysis.rate_limiter import RateLimiter, call_with_retries
+
+class FakeTime:
+    """
+    Stands in for the `time` module inside rate_limiter: sleeping advances the clock instantly.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class FlakyLLMServer(FakeLLMServer):
+    """
+    Answers the first `failures` requests with a 429 (and its Retry-After), then succeeds.
+    """
+
+    def __init__(self, failures: int, **options):
+        super().__init__(**options)
+        self.failures = failures
+
+    def complete(self, request: dict) -> tuple:
+        self.error_rate = 1.0 if self.stats["requests"] < self.failures else 0.0
+        return super().complete(request)
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake_time = FakeTime()
+    monkeypatch.setattr(rate_limiter, "time", fake_time)
+    # Jitter at its upper bound, so waits are deterministic and show the largest possible delay
+    monkeypatch.setattr(rate_limiter, "random", SimpleNamespace(uniform=lambda low, high: high))
+    return fake_time
+
+def chat_request(server):
+    llm_client = OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+    return lambda: llm_client.chat.completions.create(model="gpt-4o-mini",
+                                                      messages=[{"role": "user", "content": "Hi"}])
+
+def test_settle_debits_underestimate_and_refunds_overestimate():
+    limiter = RateLimiter(tokens_per_minute=6000)
+    bucket = limiter.token_bucket
+
+    limiter.acquire(1000)
+    limiter.settle(1000, 3000)
+    assert 2990 <= bucket._tokens <= 3010
+
+    limiter.acquire(1000)
+    limiter.settle(1000, 200)
+    assert 2790 <= bucket._tokens <= 2810
+
+def test_settle_can_put_bucket_into_debt():
+    limiter = RateLimiter(tokens_per_minute=600)
+    limiter.acquire(100)
+    limiter.settle(100, 1000)
+    assert limiter.token_bucket._tokens < 0
+
+def test_settle_without_token_budget_is_a_no_op():
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.acquire(100)
+    limiter.settle(100, 5000)
+    assert limiter.token_bucket is None
+
+def test_retry_after_is_honored_before_retrying(fake_time):
+    with FlakyLLMServer(2, retry_after_seconds=2.5) as server:
+        response = call_with_retries(chat_request(server), max_retries=3)
+        assert server.stats["requests"] == 3
+    assert response.choices[0].message.content
+    assert fake_time.sleeps == [3.5, 3.5] # Retry-After plus at most one backoff base of jitter
+
+def test_retries_stop_after_max_retries(fake_time):
+    with FlakyLLMServer(10, retry_after_seconds=0.5) as server:
+        with pytest.raises(openai.RateLimitError):
+            call_with_retries(chat_request(server), max_retries=2)
+        assert server.stats["requests"] == 3
+
+def test_non_retryable_error_is_raised_immediately(fake_time):
+    calls = []
+    with FakeLLMServer() as server:
+        llm_client = OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+        def make_request():
+            calls.append(1)
+            return llm_client.embeddings.create(model="text-embedding-3-small", input="Hi") # Answered with a 404
+        with pytest.raises(openai.NotFoundError):
+            call_with_retries(make_request, max_retries=5)
+    assert len(calls) == 1 and fake_time.sleeps == []
+
+def test_backoff_without_retry_after_is_exponential_and_capped(fake_time):
+    llm_client = OpenAI(base_url="http://127.0.0.1:9/v1", api_key="test", max_retries=0) # Nothing listens here
+    with pytest.raises(openai.APIConnectionError):
+        call_with_retries(lambda: llm_client.models.list(), max_retries=8)
+    assert fake_time.sleeps == [1, 2, 4, 8, 16, 32, 60, 60]
+
+def test_retries_spend_request_budget_and_wait_for_refill(fake_time):
+    limiter = RateLimiter(requests_per_minute=2) # Two requests at once, then one every 30 seconds
+    with FlakyLLMServer(2, retry_after_seconds=0.1) as server:
+        call_with_retries(chat_request(server), max_retries=3, limiter=limiter)
+        assert server.stats["requests"] == 3
+    # Both retries slept 1.1 s; the third request then waited for the bucket to refill one request
+    assert fake_time.now == pytest.approx(30.0, abs=1e-6)
+
+def test_retries_spend_token_budget_and_wait_for_refill(fake_time):
+    limiter = RateLimiter(tokens_per_minute=600) # 600 tokens at once, then 10 per second
+    with FlakyLLMServer(1, retry_after_seconds=0.1) as server:
+        call_with_retries(chat_request(server), max_retries=3, limiter=limiter, estimated_tokens=400)
+    assert fake_time.now == pytest.approx(20.0, abs=1e-6) # 200 tokens left, 200 more after 20 s
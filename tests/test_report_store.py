@@ -0,0 +1,79 @@
+# moengage-doc-analysis/tests/test_report_store.py
+
+import json
+
+import pytest
+
+from moengage_doc_analysis.report_store import ReportStore, main
+from moengage_doc_analysis.routing import CRITERIA
+
+def report(url: str, content_hash: str = "h1", structure_suggestions: int = 0, **extra) -> dict:
+    record = {"url": url, "content_hash": content_hash, "analyzed_with": "gpt-4o", **extra}
+    for name in CRITERIA:
+        count = structure_suggestions if name == "structure_and_flow" else 0
+        record[name] = {"assessment": f"{name} assessed.", "suggestions": [f"Tip {i}." for i in range(count)]}
+    return record
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "reports.sqlite3")
+
+@pytest.fixture
+def store(store_path):
+    store = ReportStore(store_path)
+    store.start_run("run-1")
+    store.add(report("a", structure_suggestions=2, metrics={"word_count": 120}), "run-1", created_at=1000)
+    store.add(report("b"), "run-1", created_at=1000)
+    store.add(report("c"), "run-1", succeeded=False, created_at=1000)
+    store.start_run("run-2")
+    store.add(report("a", "h2"), "run-2", created_at=2000)
+    store.add(report("c", structure_suggestions=1), "run-2", created_at=2000)
+    store.add(report("d"), "run-2", created_at=2000)
+    yield store
+    store.close()
+
+def urls(records) -> list:
+    return [(record["url"], record["run_id"]) for record in records]
+
+def test_stored_record_round_trips(store):
+    record = next(store.query(url="a"))
+    assert (record.pop("run_id"), record.pop("succeeded"), record.pop("stored_at")) == ("run-1", True, 1000)
+    assert record == report("a", structure_suggestions=2, metrics={"word_count": 120})
+
+def test_query_filters_combine(store):
+    assert urls(store.query(run_id="run-1")) == [("a", "run-1"), ("b", "run-1")] # Failed analyses are left out
+    assert urls(store.query(run_id="run-1", include_failed=True)) == [("a", "run-1"), ("b", "run-1"), ("c", "run-1")]
+    assert urls(store.query(content_hash="h2")) == [("a", "run-2")]
+    assert urls(store.query(criterion="structure_and_flow", with_suggestions=True)) == [("a", "run-1"), ("c", "run-2")]
+    assert urls(store.query(criterion="style_guidelines", with_suggestions=True)) == []
+    assert urls(store.query(since=1500)) == [("a", "run-2"), ("c", "run-2"), ("d", "run-2")]
+    assert urls(store.query(until=1500, url="b")) == [("b", "run-1")]
+    assert urls(store.query(limit=2)) == [("a", "run-1"), ("b", "run-1")]
+
+def test_latest_keeps_each_urls_most_recent_matching_report(store):
+    assert urls(store.query(latest=True)) == [("b", "run-1"), ("a", "run-2"), ("c", "run-2"), ("d", "run-2")]
+    # Filters apply before picking the latest: "a" had structure suggestions only in run-1
+    assert urls(store.query(latest=True, criterion="structure_and_flow", with_suggestions=True)) == \
+        [("a", "run-1"), ("c", "run-2")]
+
+def test_cli_query_latest_prints_json_lines(store, store_path, capsys):
+    main(["--store", store_path, "query", "--latest", "--url", "a"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["content_hash"] for line in lines] == ["h2"]
+    main(["--store", store_path, "query", "--latest", "--count"])
+    assert capsys.readouterr().out.strip() == "4"
+
+def test_diff_reports_added_removed_and_changed(store):
+    entries = {entry["url"]: entry for entry in store.diff("run-1", "run-2")}
+    assert {url: entry["change"] for url, entry in entries.items()} == {
+        "a": "content_changed", "b": "removed", "c": "report_changed", "d": "added"}
+    assert entries["c"]["old"]["succeeded"] is False and entries["c"]["new"]["suggestions"]["structure_and_flow"] == 1
+    assert entries["d"]["new"]["content_hash"] == "h1"
+
+def test_diff_of_identical_runs_is_empty(store):
+    store.start_run("run-3")
+    for url in ("a", "c", "d"):
+        record = next(store.query(url=url, run_id="run-2"))
+        store.add({key: value for key, value in record.items() if key not in ("run_id", "succeeded", "stored_at")},
+                  "run-3")
+    assert list(store.diff("run-2", "run-3")) == []
@@ -0,0 +1,99 @@
+# moengage-doc-analysis/tests/test_routing.py
+
+import json
+
+import pytest
+from openai import OpenAI
+
+from fake_llm import FakeLLMServer
+
+from moengage_doc_analysis import analysis
+from moengage_doc_analysis.routing import CRITERIA, TierStats, direct_route_reason
+from moengage_doc_analysis.text_metrics import compute_text_metrics
+
+SIMPLE_TEXT = "Open the dashboard. Click Create Campaign. Pick a segment. Save the campaign."
+DENSE_TEXT = ("Configuration of heterogeneous multichannel orchestration necessitates comprehensive "
+              "understanding of asynchronous personalization infrastructure and its interdependencies. ") * 3
+
+class TieredLLMServer(FakeLLMServer):
+    """
+    Answers the cheap model with `cheap_answer` (if set) and every other model normally; `models`
+    lists the model of each request.
+    """
+
+    def __init__(self, cheap_answer: str = None, **options):
+        super().__init__(**options)
+        self.cheap_answer = cheap_answer
+        self.models = []
+
+    def complete(self, request: dict) -> tuple:
+        status, payload, headers = super().complete(request)
+        self.models.append(request["model"])
+        if request["model"] == "cheap-model" and self.cheap_answer is not None:
+            payload["choices"][0]["message"]["content"] = self.cheap_answer
+        return status, payload, headers
+
+def route(server, content: str = SIMPLE_TEXT, **thresholds) -> tuple:
+    tier_stats = TierStats()
+    final_report = analysis.analyze_article({"url": "https://help.example.com/hc/en-us/articles/1", "content": content},
+                                            OpenAI(base_url=server.base_url, api_key="test", max_retries=0),
+                                            "large-model", tier_stats=tier_stats, routing_thresholds=thresholds)
+    return final_report, tier_stats
+
+@pytest.fixture(autouse=True)
+def cheap_model(monkeypatch):
+    monkeypatch.setattr(analysis, "LLM_CHEAP_MODEL", "cheap-model")
+    monkeypatch.setattr(analysis, "LLM_REASK_ATTEMPTS", 1)
+
+def test_direct_route_reason_checks_size_then_complexity():
+    simple, dense = compute_text_metrics(SIMPLE_TEXT), compute_text_metrics(DENSE_TEXT)
+    assert direct_route_reason(SIMPLE_TEXT, simple, "gpt-4o-mini") is None
+    assert direct_route_reason(SIMPLE_TEXT, simple, "gpt-4o-mini", {"max_cheap_tokens": 5}) == "size"
+    assert direct_route_reason(DENSE_TEXT, dense, "gpt-4o-mini") == "complexity"
+    assert direct_route_reason(DENSE_TEXT, dense, "gpt-4o-mini", {"max_cheap_grade": 99}) is None
+    many_headings = {**simple, "heading_count": 16}
+    assert direct_route_reason(SIMPLE_TEXT, many_headings, "gpt-4o-mini") == "complexity"
+    assert direct_route_reason(SIMPLE_TEXT, many_headings, "gpt-4o-mini", {"max_cheap_sections": 16}) is None
+
+def test_good_cheap_answer_is_kept():
+    with TieredLLMServer() as server:
+        final_report, tier_stats = route(server)
+    assert server.models == ["cheap-model"]
+    assert final_report["analyzed_with"] == "cheap-model" and "escalation_reason" not in final_report
+    assert tier_stats.cheap_attempts == 1 and not tier_stats.escalations
+
+@pytest.mark.parametrize("cheap_answer, reason", [
+    ("I cannot help with that.", "error"),
+    (json.dumps({name: {"assessment": "Looks fine.", "suggestions": []} for name in CRITERIA}), "empty_suggestions"),
+])
+def test_rejected_cheap_answer_escalates_with_reason(cheap_answer, reason):
+    with TieredLLMServer(cheap_answer) as server:
+        final_report, tier_stats = route(server)
+    assert server.models[-1] == "large-model" and "cheap-model" in server.models
+    assert final_report["analyzed_with"] == "large-model"
+    assert final_report["escalation_reason"] == reason
+    assert not analysis.is_fallback_report(final_report)
+    assert tier_stats.escalations == {reason: 1} and tier_stats.to_json()["escalation_rate"] == 1.0
+
+def test_cheap_answer_failing_schema_validation_escalates(monkeypatch):
+    invalid = {name: {"assessment": "Fine.", "suggestions": "Add an example."} for name in CRITERIA}
+    answers = {"cheap-model": invalid}
+    monkeypatch.setattr(analysis, "analyze_content_with_llm",
+                        lambda content, llm_client, llm_model_name, **options:
+                        answers.get(llm_model_name, {name: {"assessment": "Good.", "suggestions": ["Tip."]}
+                                                     for name in CRITERIA}))
+    report, model, reason = analysis.analyze_content_tiered(SIMPLE_TEXT, None, "cheap-model", "large-model",
+                                                            TierStats())
+    assert (model, reason) == ("large-model", "schema")
+    assert report["style_guidelines"]["suggestions"] == ["Tip."]
+
+@pytest.mark.parametrize("content, thresholds, reason", [
+    (SIMPLE_TEXT, {"max_cheap_tokens": 5}, "size"),
+    (DENSE_TEXT, {}, "complexity"),
+])
+def test_articles_over_thresholds_go_straight_to_the_large_model(content, thresholds, reason):
+    with TieredLLMServer() as server:
+        final_report, tier_stats = route(server, content, **thresholds)
+    assert server.models == ["large-model"]
+    assert final_report["escalation_reason"] == reason
+    assert tier_stats.cheap_attempts == 0 and tier_stats.direct == {reason: 1}
@@ -0,0 +1,31 @@
+# moengage-doc-analysis/tests/test_run_journal.py
+
+from moengage_doc_analysis.llm_cache import content_hash
+from moengage_doc_analysis.run_journal import RunJournal
+
+def test_run_journal_pending_skips_only_unchanged_successes(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = RunJournal(path)
+    journal.record("done", content_hash("same"), succeeded=True)
+    journal.record("changed", content_hash("old"), succeeded=True)
+    journal.record("failed", content_hash("same"), succeeded=False)
+    journal.close()
+
+    journal = RunJournal(path) # Entries are read back from disk
+    articles = [{"url": "done", "content": "same"}, {"url": "changed", "content": "new"},
+                {"url": "failed", "content": "same"}, {"url": "new", "content": "same"},
+                {"url": "done", "content": None}]
+    pending = [(article["url"], article["content"]) for article in journal.pending(articles)]
+    journal.close()
+    assert pending == [("changed", "new"), ("failed", "same"), ("new", "same"), ("done", None)]
+    assert journal.skipped == 1
+
+def test_run_journal_later_entry_supersedes_earlier(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = RunJournal(path)
+    journal.record("a", content_hash("text"), succeeded=False)
+    journal.record("a", content_hash("text"), succeeded=True)
+    journal.close()
+    journal = RunJournal(path)
+    assert list(journal.pending([{"url": "a", "content": "text"}])) == []
+    journal.close()
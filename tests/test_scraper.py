@@ -0,0 +1,54 @@
+# moengage-doc-analysis/tests/test_scraper.py
+
+from corpus import synthetic_page
+from page_server import PageServer
+
+from moengage_doc_analysis.http_cache import HttpCache
+from moengage_doc_analysis.scraper import fetch_article_content, fetch_articles, fetch_articles_pipelined
+
+def peak_overlap(spans) -> int:
+    events = sorted([(start, 1) for start, _ in spans] + [(end, -1) for _, end in spans])
+    peak = current = 0
+    for _, change in events: # An end sorts before a start at the same instant
+        current += change
+        peak = max(peak, current)
+    return peak
+
+def test_http_cache_counts_hits_misses_and_failed_requests(tmp_path):
+    cache = HttpCache(str(tmp_path / "http_cache"))
+    with PageServer([("1", synthetic_page(0)), ("2", synthetic_page(1))]) as server:
+        first, second = server.urls
+        assert fetch_article_content(first, cache=cache)
+        assert fetch_article_content(first, cache=cache) # Revalidated with a 304
+        server.failing_paths.add("/hc/en-us/articles/2")
+        assert fetch_article_content(second, cache=cache) == ""
+    assert (cache.hits, cache.misses, cache.errors) == (1, 1, 1)
+    assert "1 failed requests, 50.0% hit ratio" in cache.summary()
+
+def test_pipelined_fetch_with_zero_queue_size_matches_sequential(tmp_path):
+    with PageServer([(str(index), synthetic_page(index)) for index in range(6)]) as server:
+        sequential = {url: fetch_article_content(url) for url in server.urls}
+        pipelined = list(fetch_articles_pipelined(server.urls, parse_workers=2, queue_size=0))
+    assert {record["url"]: record["content"] for record in pipelined} == sequential
+
+def test_fetch_articles_caps_requests_per_host_and_overall():
+    pages = [(str(index), synthetic_page(index)) for index in range(6)]
+    with PageServer(pages, latency_seconds=0.05) as first, PageServer(pages, latency_seconds=0.05) as second:
+        records = list(fetch_articles(first.urls + second.urls, max_concurrency=3, per_host_limit=2))
+        spans = (first.request_spans, second.request_spans)
+    assert len(records) == 12
+    assert [peak_overlap(host_spans) for host_spans in spans] == [2, 2] # Each host is kept at its limit
+    assert peak_overlap(spans[0] + spans[1]) == 3
+
+def test_fetch_articles_records_match_sequential_fetch_in_any_order():
+    with PageServer([(str(index), synthetic_page(index)) for index in range(8)]) as server:
+        server.failing_paths.add("/hc/en-us/articles/3")
+        sequential = {url: fetch_article_content(url) for url in server.urls}
+        records = list(fetch_articles(server.urls, max_concurrency=4, per_host_limit=4))
+    assert sorted(record["url"] for record in records) == sorted(server.urls)
+    for record in records:
+        if sequential[record["url"]]:
+            assert record == {"url": record["url"], "content": sequential[record["url"]]}
+        else:
+            assert record == {"url": record["url"], "content": None, "error": "Content extraction failed"}
+    assert sum("error" in record for record in records) == 1
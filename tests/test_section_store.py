@@ -0,0 +1,49 @@
+# moengage-doc-analysis/tests/test_section_store.py
+
+import sqlite3
+import time
+
+from moengage_doc_analysis.section_store import SectionStore
+
+REPORT = {"structure_and_flow": {"assessment": "Fine.", "suggestions": []}}
+
+def test_evict_drops_reports_no_article_references(tmp_path):
+    store = SectionStore(str(tmp_path / "store.sqlite3"))
+    for group_hash in ("a", "b", "c"):
+        store.put_report(group_hash, "gpt-4o", "v1", REPORT)
+    store.replace_sections("https://example.com/1", ["a", "b"])
+    store.replace_sections("https://example.com/1", ["a", "c"]) # Section "b" was edited into "c"
+    assert store.evict() == 1
+    assert store.get_report("b", "gpt-4o", "v1") is None
+    assert store.get_report("a", "gpt-4o", "v1") == REPORT and store.get_report("c", "gpt-4o", "v1") == REPORT
+    store.close()
+
+def test_evict_applies_ttl_and_lru_limit(tmp_path):
+    store = SectionStore(str(tmp_path / "store.sqlite3"), max_entries=2, ttl_seconds=60)
+    for group_hash in ("a", "b", "c", "d"):
+        store.put_report(group_hash, "gpt-4o", "v1", REPORT)
+    store.replace_sections("https://example.com/1", ["a", "b", "c", "d"])
+    store._conn.execute("UPDATE section_reports SET created_at = ? WHERE section_hash = 'a'", (time.time() - 120,))
+    store._conn.execute("UPDATE section_reports SET last_used_at = 0 WHERE section_hash = 'b'")
+    store._conn.commit()
+    assert store.get_report("a", "gpt-4o", "v1") is None # Expired even before eviction
+    assert store.evict() == 2
+    assert [store.get_report(h, "gpt-4o", "v1") is not None for h in "abcd"] == [False, False, True, True]
+    store.close()
+
+def test_store_from_before_eviction_is_migrated(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE article_sections (url TEXT NOT NULL, position INTEGER NOT NULL, section_hash TEXT NOT NULL,
+                                       PRIMARY KEY (url, position));
+        CREATE TABLE section_reports (section_key TEXT PRIMARY KEY, report TEXT NOT NULL);
+        INSERT INTO article_sections VALUES ('https://example.com/1', 0, 'a');
+        INSERT INTO section_reports VALUES ('a:gpt-4o:v1', '{}'), ('b:gpt-4o:v1', '{}');
+    """)
+    conn.close()
+    store = SectionStore(path)
+    assert store.get_report("a", "gpt-4o", "v1") == {}
+    assert store.evict() == 1
+    assert store.get_report("b", "gpt-4o", "v1") is None
+    store.close()
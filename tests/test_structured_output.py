@@ -0,0 +1,116 @@
+# moengage-doc-analysis/tests/test_structured_output.py
+
+import json
+from types import SimpleNamespace
+
+from moengage_doc_analysis import analysis
+from moengage_doc_analysis.routing import CRITERIA
+from moengage_doc_analysis.structured_output import ReportParser, parse_report_text, repair_json_text
+
+def criterion(assessment: str = "Clear.", suggestions=("Add an example.",)) -> dict:
+    return {"assessment": assessment, "suggestions": list(suggestions)}
+
+def full_report() -> dict:
+    return {name: criterion(f"{name} ok.") for name in CRITERIA}
+
+def test_repair_json_text_strips_fences_and_prose():
+    text = "Here is the report:\n```json\n{\"a\": 1}\n```\nHope this helps."
+    assert json.loads(repair_json_text(text)) == {"a": 1}
+
+def test_repair_json_text_drops_trailing_commas():
+    assert json.loads(repair_json_text('{"a": [1, 2,], "b": {"c": 3,},}')) == {"a": [1, 2], "b": {"c": 3}}
+
+def test_repair_json_text_escapes_raw_newlines_in_strings():
+    assert json.loads(repair_json_text('{"a": "line one\nline\ttwo"}')) == {"a": "line one\nline\ttwo"}
+
+def test_repair_json_text_converts_python_literals():
+    assert json.loads(repair_json_text('{"a": True, "b": None, "c": "True"}')) == {"a": True, "b": None, "c": "True"}
+
+def test_parser_accepts_fenced_answer_fed_in_pieces():
+    text = "```json\n" + json.dumps(full_report(), indent=2) + "\n```"
+    parser = ReportParser()
+    completed = []
+    for start in range(0, len(text), 7):
+        completed.extend(parser.feed(text[start:start + 7]))
+    assert completed == list(CRITERIA)
+    assert parser.missing() == [] and parser.problems == []
+
+def test_parser_repairs_member_with_trailing_comma_and_raw_newline():
+    report = full_report()
+    del report["structure_and_flow"]
+    broken = '"structure_and_flow": {"assessment": "structure\nand flow ok.", "suggestions": ["Add headings.",],}'
+    parser = parse_report_text(json.dumps(report)[:-1] + ", " + broken + "}")
+    assert parser.missing() == []
+    assert parser.criteria["structure_and_flow"]["assessment"] == "structure\nand flow ok."
+    assert parser.repaired >= 1
+
+def test_parser_keeps_complete_members_of_truncated_answer():
+    text = json.dumps(full_report())
+    cut = text.index('"completeness_and_examples"') + len('"completeness_and_examples": {"assessment": "compl')
+    parser = parse_report_text(text[:cut])
+    assert list(parser.criteria) == ["readability_for_marketer", "structure_and_flow"]
+    assert parser.missing() == ["completeness_and_examples", "style_guidelines"]
+
+def test_parser_unwraps_outer_key_and_normalizes_names():
+    text = json.dumps({"report": {"Readability for Marketer": criterion(), "Structure and Flow": criterion(),
+                                  "completeness_of_information": criterion(), "style": criterion()}})
+    parser = parse_report_text(text)
+    assert parser.missing() == []
+
+def test_parser_rejects_invalid_criterion_and_reports_it_missing():
+    report = full_report()
+    report["style_guidelines"] = {"assessment": "", "suggestions": "Use active voice."}
+    parser = parse_report_text(json.dumps(report))
+    assert parser.missing() == ["style_guidelines"]
+    assert parser.problems == ["style_guidelines.assessment missing"]
+
+def test_parser_coerces_single_suggestion_string_to_list():
+    report = full_report()
+    report["structure_and_flow"] = {"assessment": "Fine.", "suggestions": "Add headings."}
+    parser = parse_report_text(json.dumps(report))
+    assert parser.criteria["structure_and_flow"]["suggestions"] == ["Add headings."]
+
+class FakeCompletions:
+    """
+    Stands in for `llm_client.chat.completions`, answering each request with the next canned text.
+    """
+
+    def __init__(self, answers: list):
+        self.answers = list(answers)
+        self.requests = []
+
+    def create(self, **request):
+        self.requests.append(request)
+        message = SimpleNamespace(content=self.answers.pop(0))
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=message)])
+
+def analyze(monkeypatch, answers: list) -> tuple:
+    monkeypatch.setattr(analysis, "LLM_STREAM", False)
+    monkeypatch.setattr(analysis, "LLM_REASK_ATTEMPTS", 1)
+    completions = FakeCompletions(answers)
+    llm_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    report = analysis.analyze_content_with_llm("Some article text.", llm_client, "gpt-4o-mini")
+    return report, completions.requests
+
+def test_only_missing_criteria_are_reasked(monkeypatch):
+    report = full_report()
+    first = {name: report[name] for name in ("readability_for_marketer", "style_guidelines")}
+    second = {name: report[name] for name in ("structure_and_flow", "completeness_and_examples")}
+    result, requests = analyze(monkeypatch, [json.dumps(first), json.dumps(second)])
+    assert result == report
+    assert len(requests) == 2
+    reask_prompt = requests[1]["messages"][-1]["content"]
+    assert "structure_and_flow, completeness_and_examples" in reask_prompt
+    assert "readability_for_marketer" not in reask_prompt.split("Return only these keys")[-1]
+
+def test_complete_answer_is_not_reasked(monkeypatch):
+    result, requests = analyze(monkeypatch, [json.dumps(full_report())])
+    assert result == full_report() and len(requests) == 1
+
+def test_criteria_still_missing_after_reask_get_placeholders(monkeypatch):
+    report = full_report()
+    first = {name: report[name] for name in CRITERIA[:3]}
+    result, requests = analyze(monkeypatch, [json.dumps(first), "not json at all"])
+    assert len(requests) == 2
+    assert {name: result[name] for name in CRITERIA[:3]} == first
+    assert result["style_guidelines"]["assessment"] in analysis.FALLBACK_MESSAGES
@@ -0,0 +1,84 @@
+# moengage-doc-analysis/tests/test_text_metrics.py
+
+import json
+import re
+
+import pytest
+
+from corpus import synthetic_page
+
+from moengage_doc_analysis.chunking import split_into_sections
+from moengage_doc_analysis.extraction import EXTRACTION_BACKENDS, extract_main_text
+from moengage_doc_analysis.text_metrics import CorpusMetrics, compute_text_metrics, iter_with_metrics, load_thresholds
+
+PAGE = """<html><body><main><article>
+<header><h1>Site title</h1></header>
+<h2>Create a <a href="/campaigns">push campaign</a></h2>
+<p>Open the <strong>Campaigns</strong> page and click <a href="/new">Create</a> to start. It takes a minute.</p>
+<h3>Before you begin</h3>
+<ol><li>Install the <code>SDK</code> first.</li><li>Enable <em>push</em> permissions.</li><li>Pick a segment.</li></ol>
+<h2>Schedule it?</h2>
+<p>Choose <b>Send now</b> or a later time.</p>
+<ul><li><a href="/docs">Delivery settings</a></li></ul>
+</article></main></body></html>"""
+
+def extract(html: str, backend: str) -> str:
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+    return extract_main_text(html, "https://example.com/article", backend)
+
+@pytest.mark.parametrize("backend", list(EXTRACTION_BACKENDS))
+def test_structure_counted_from_html_not_inline_fragments(backend):
+    metrics = compute_text_metrics(extract(PAGE, backend))
+    assert metrics["heading_count"] == 3 # The <h1> sits in the boilerplate <header>
+    assert metrics["list_item_count"] == 4
+    assert metrics["paragraph_count"] == 2 # Inline link and bold text stays within its paragraph
+    assert metrics["sentence_count"] == 3 and metrics["word_count"] == 20
+
+@pytest.mark.parametrize("backend", list(EXTRACTION_BACKENDS))
+def test_synthetic_help_center_pages(backend):
+    for index in range(7):
+        html = synthetic_page(index)
+        metrics = compute_text_metrics(extract(html, backend))
+        article = html.split("<div class=\"article-body\">", 1)[1]
+        assert metrics["heading_count"] == len(re.findall(r"<h2", article))
+        assert metrics["list_item_count"] == len(re.findall(r"<li>", article.split("<aside", 1)[0]))
+        assert metrics["heading_density"] < 0.1 and metrics["avg_sentence_words"] > 8
+
+@pytest.mark.parametrize("backend", list(EXTRACTION_BACKENDS))
+def test_inline_markup_stays_on_its_line(backend):
+    lines = extract(PAGE, backend).splitlines()
+    assert "Open the Campaigns page and click Create to start. It takes a minute." in lines
+    assert "- Install the SDK first." in lines and "- Delivery settings" in lines
+
+def test_marked_headings_split_sections_even_with_sentence_punctuation():
+    text = extract(PAGE, "bs4")
+    sections = split_into_sections(text)
+    assert [section.splitlines()[0] for section in sections] == ["## Create a push campaign",
+                                                                 "### Before you begin", "## Schedule it?"]
+
+def test_iter_with_metrics_yields_each_record_before_reading_the_next():
+    read = []
+
+    def records():
+        for index in range(3):
+            read.append(index)
+            yield {"url": str(index), "content": f"## Heading\nSentence number {index} is here."}
+
+    corpus = CorpusMetrics()
+    stream = iter_with_metrics(records(), corpus=corpus)
+    first = next(stream)
+    assert read == [0] and first["metrics"]["heading_count"] == 1 and corpus.article_count == 1
+    assert [record["url"] for record in stream] == ["1", "2"]
+    assert corpus.article_count == 3
+
+def test_load_thresholds_rejects_unknown_and_non_numeric_keys(tmp_path):
+    path = tmp_path / "thresholds.json"
+    path.write_text(json.dumps({"max_avg_sentence_words": 18, "min_heading_densty": 0.05}), encoding="utf-8")
+    with pytest.raises(ValueError, match="min_heading_densty"):
+        load_thresholds(str(path))
+    path.write_text(json.dumps({"max_avg_sentence_words": "18"}), encoding="utf-8")
+    with pytest.raises(ValueError, match="must be a number"):
+        load_thresholds(str(path))
+    path.write_text(json.dumps({"max_avg_sentence_words": 18}), encoding="utf-8")
+    assert load_thresholds(str(path)) == {"max_avg_sentence_words": 18}